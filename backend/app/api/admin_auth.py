@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.core.jwt_utils import create_access_token
 from app.models.admin import Admin
 from app.schemas.admin import AdminLoginRequest, AdminTokenResponse, AdminCreateRequest, AdminResponse
-from app.config import settings
+from app.config import get_settings
 from app.core.db import get_db
 router = APIRouter(prefix="/api/v1/admin", tags=["Admin Auth"])
 
@@ -34,6 +34,7 @@ def admin_login(payload: AdminLoginRequest, db: Session = Depends(get_db)):
     if not admin or admin.password_hash != _hash(payload.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    settings = get_settings()
     token = create_access_token(
         data={
             "admin_id": admin.id,
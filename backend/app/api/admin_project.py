@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
+from app.core.project_cache import invalidate_project
+from app.services.project_purge import deletion_status, request_project_deletion
 from app.core.admin_auth import get_current_admin
 from app.models.project import Project
-from app.schemas.project import ProjectResponse, ProjectUpdateRequest
-from app.models.log_category import LogCategory
+from app.schemas.project import ProjectDeletionResponse, ProjectResponse, ProjectUpdateRequest
 
 router = APIRouter(prefix="/api/v1/admin/projects", tags=["Admin Projects"])
 
@@ -50,6 +51,7 @@ def update_project(
         setattr(project, field, value)
 
     db.commit()
+    invalidate_project(project_id)
     db.refresh(project)
     return project
 
@@ -62,6 +64,7 @@ def allow_project(project_id: int, db: Session = Depends(get_db), admin=Depends(
         raise HTTPException(status_code=404, detail="Project not found")
     project.isAllowed = True
     db.commit()
+    invalidate_project(project_id)
     return {"status": "allowed", "project_id": project_id}
 
 
@@ -72,19 +75,34 @@ def disallow_project(project_id: int, db: Session = Depends(get_db), admin=Depen
         raise HTTPException(status_code=404, detail="Project not found")
     project.isAllowed = False
     db.commit()
+    invalidate_project(project_id)
     return {"status": "disallowed", "project_id": project_id}
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{project_id}",
+    response_model=ProjectDeletionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def delete_project(project_id: int, db: Session = Depends(get_db), admin=Depends(get_current_admin)):
+    """
+    Marks the project as deleting: ingest and dashboard access are refused
+    right away, and ``python -m app.workers.project_purger`` removes its
+    logs in batches, then the project.
+    """
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # delete categories
-    db.query(LogCategory).filter(
-        LogCategory.project_id == project_id
-    ).delete(synchronize_session=False)
+    request_project_deletion(db, project)
+    return deletion_status(db, project)
 
-    # delete project
-    db.delete(project)
-    db.commit()
+
+@router.get("/{project_id}/deletion", response_model=ProjectDeletionResponse)
+def get_project_deletion(project_id: int, db: Session = Depends(get_db), admin=Depends(get_current_admin)):
+    """
+    Purge progress of a deleting project; 404 once it is gone.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return deletion_status(db, project)
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.dashboard_auth import get_current_project_from_jwt
+from app.core.db import get_db
+from app.core.project_cache import ProjectSnapshot
+from app.models.alert import Alert
+from app.models.alert_rule import AlertRule
+from app.schemas.alert import (
+    AlertResponse,
+    AlertRuleCreateRequest,
+    AlertRuleResponse,
+    AlertRuleUpdateRequest,
+)
+from app.services.alerting import invalidate_project_rules
+
+router = APIRouter(prefix="/api/v1/alerts", tags=["Alerts"])
+
+
+def _get_rule_or_404(db: Session, project_id: int, rule_id: int) -> AlertRule:
+    rule = (
+        db.query(AlertRule)
+        .filter(AlertRule.id == rule_id, AlertRule.project_id == project_id)
+        .first()
+    )
+    if not rule:
+        raise HTTPException(status_code=404, detail="Alert rule not found")
+    return rule
+
+
+@router.get("/rules", response_model=list[AlertRuleResponse])
+def list_rules(
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    return (
+        db.query(AlertRule)
+        .filter(AlertRule.project_id == project.id)
+        .order_by(AlertRule.id)
+        .all()
+    )
+
+
+@router.post("/rules", response_model=AlertRuleResponse, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    payload: AlertRuleCreateRequest,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    data = payload.model_dump(exclude={"sinks"})
+    if payload.level:
+        data["level"] = payload.level.upper()
+
+    rule = AlertRule(
+        project_id=project.id,
+        sinks=[sink.as_config() for sink in payload.sinks] if payload.sinks else None,
+        **data,
+    )
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    invalidate_project_rules(project.id)
+    return rule
+
+
+@router.put("/rules/{rule_id}", response_model=AlertRuleResponse)
+def update_rule(
+    rule_id: int,
+    payload: AlertRuleUpdateRequest,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    rule = _get_rule_or_404(db, project.id, rule_id)
+
+    for field, value in payload.model_dump(exclude_unset=True, exclude={"sinks"}).items():
+        setattr(rule, field, value.upper() if field == "level" and value else value)
+    if "sinks" in payload.model_fields_set:
+        rule.sinks = [sink.as_config() for sink in payload.sinks] if payload.sinks else None
+
+    db.commit()
+    db.refresh(rule)
+    invalidate_project_rules(project.id)
+    return rule
+
+
+@router.delete("/rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rule(
+    rule_id: int,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    rule = _get_rule_or_404(db, project.id, rule_id)
+    db.query(Alert).filter(Alert.rule_id == rule.id).delete(synchronize_session=False)
+    db.delete(rule)
+    db.commit()
+    invalidate_project_rules(project.id)
+    return
+
+
+@router.get("", response_model=list[AlertResponse])
+def list_alerts(
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+    rule_id: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    query = db.query(Alert).filter(Alert.project_id == project.id)
+    if rule_id is not None:
+        query = query.filter(Alert.rule_id == rule_id)
+    return query.order_by(Alert.id.desc()).limit(limit).offset(offset).all()
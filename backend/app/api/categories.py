@@ -0,0 +1,281 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.dashboard_auth import get_current_project_from_jwt
+from app.core.db import get_db
+from app.core.project_cache import ProjectSnapshot
+from app.models.log_category import LogCategory
+from app.models.log_entry import LogEntry
+from app.models.recategorize_job import RecategorizeJob
+from app.schemas.category import (
+    CategoryCreateRequest,
+    CategoryResponse,
+    CategoryUpdateRequest,
+    RecategorizeJobResponse,
+    RecategorizeRequest,
+)
+from app.services.category_cache import invalidate_project_categories
+from app.services.category_seeder import seed_system_categories
+from app.services.recategorizer import (
+    ACTIVE_STATUSES,
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    active_job,
+    create_job,
+    job_progress,
+)
+
+router = APIRouter(prefix="/api/v1/categories", tags=["Categories"])
+
+_CATEGORY_IN_USE = "Category still has logs; clear its keywords and recategorize them first"
+
+
+def _get_category_or_404(db: Session, project_id: int, category_id: int) -> LogCategory:
+    category = (
+        db.query(LogCategory)
+        .filter(LogCategory.id == category_id, LogCategory.project_id == project_id)
+        .first()
+    )
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return category
+
+
+def _check_name_available(db: Session, project_id: int, name: str) -> None:
+    exists = (
+        db.query(LogCategory.id)
+        .filter(
+            LogCategory.project_id == project_id,
+            func.lower(LogCategory.name) == name.lower(),
+        )
+        .first()
+    )
+    if exists:
+        raise HTTPException(status_code=400, detail="Category already exists")
+
+
+def _get_job_or_404(db: Session, project_id: int, job_id: int) -> RecategorizeJob:
+    job = (
+        db.query(RecategorizeJob)
+        .filter(RecategorizeJob.id == job_id, RecategorizeJob.project_id == project_id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Recategorize job not found")
+    return job
+
+
+def _job_response(job: RecategorizeJob) -> RecategorizeJobResponse:
+    response = RecategorizeJobResponse.model_validate(job, from_attributes=True)
+    response.progress = job_progress(job)
+    return response
+
+
+# ---- Recategorization jobs ----
+
+@router.post(
+    "/recategorize",
+    response_model=RecategorizeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def start_recategorize(
+    payload: RecategorizeRequest,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    """
+    Re-evaluates the project's logs in a time range against the current
+    category rules, in the background (``python -m app.workers.recategorizer``).
+    """
+    if active_job(db, project.id):
+        raise HTTPException(status_code=409, detail="A recategorization is already running for this project")
+    job = create_job(db, project.id, from_ts=payload.from_ts, to_ts=payload.to_ts)
+    return _job_response(job)
+
+
+@router.get("/recategorize", response_model=list[RecategorizeJobResponse])
+def list_recategorize_jobs(
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+):
+    jobs = (
+        db.query(RecategorizeJob)
+        .filter(RecategorizeJob.project_id == project.id)
+        .order_by(RecategorizeJob.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_job_response(job) for job in jobs]
+
+
+@router.get("/recategorize/{job_id}", response_model=RecategorizeJobResponse)
+def get_recategorize_job(
+    job_id: int,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    return _job_response(_get_job_or_404(db, project.id, job_id))
+
+
+@router.post("/recategorize/{job_id}/cancel", response_model=RecategorizeJobResponse)
+def cancel_recategorize_job(
+    job_id: int,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    job = _get_job_or_404(db, project.id, job_id)
+    if job.status not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    # Waits for a chunk in progress; the worker skips cancelled jobs.
+    db.query(RecategorizeJob).filter(
+        RecategorizeJob.id == job.id,
+        RecategorizeJob.status.in_(ACTIVE_STATUSES),
+    ).update({RecategorizeJob.status: JOB_CANCELLED}, synchronize_session=False)
+    db.commit()
+    db.refresh(job)
+    return _job_response(job)
+
+
+@router.post("/recategorize/{job_id}/resume", response_model=RecategorizeJobResponse)
+def resume_recategorize_job(
+    job_id: int,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    """
+    Continues a failed or cancelled job from its last committed chunk.
+    """
+    job = _get_job_or_404(db, project.id, job_id)
+    if job.status not in (JOB_FAILED, JOB_CANCELLED):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if active_job(db, project.id):
+        raise HTTPException(status_code=409, detail="A recategorization is already running for this project")
+
+    job.status = JOB_RUNNING if job.started_at else JOB_PENDING
+    job.last_error = None
+    db.commit()
+    db.refresh(job)
+    return _job_response(job)
+
+
+# ---- Categories ----
+
+@router.get("", response_model=list[CategoryResponse])
+def list_categories(
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    seed_system_categories(db, project.id)
+    return (
+        db.query(LogCategory)
+        .filter(LogCategory.project_id == project.id)
+        .order_by(LogCategory.id)
+        .all()
+    )
+
+
+@router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+def create_category(
+    payload: CategoryCreateRequest,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    """
+    Applies to logs ingested from now on; start a recategorization to
+    apply it to stored logs.
+    """
+    seed_system_categories(db, project.id)
+    _check_name_available(db, project.id, payload.name)
+
+    category = LogCategory(project_id=project.id, is_system=False, **payload.model_dump())
+    db.add(category)
+    db.commit()
+    db.refresh(category)
+    invalidate_project_categories(project.id)
+    return category
+
+
+@router.get("/{category_id}", response_model=CategoryResponse)
+def get_category(
+    category_id: int,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    return _get_category_or_404(db, project.id, category_id)
+
+
+@router.put("/{category_id}", response_model=CategoryResponse)
+def update_category(
+    category_id: int,
+    payload: CategoryUpdateRequest,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    category = _get_category_or_404(db, project.id, category_id)
+    data = payload.model_dump(exclude_unset=True)
+
+    name = data.get("name")
+    if name is not None and name != category.name:
+        if category.is_system:
+            raise HTTPException(status_code=400, detail="System categories cannot be renamed")
+        if name.lower() != category.name.lower():
+            _check_name_available(db, project.id, name)
+    elif "name" in data:
+        del data["name"]
+
+    for field, value in data.items():
+        setattr(category, field, value)
+
+    db.commit()
+    db.refresh(category)
+    invalidate_project_categories(project.id)
+    return category
+
+
+@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_category(
+    category_id: int,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+):
+    """
+    Only categories without logs can be deleted: set its keywords to ``[]``
+    and recategorize its logs first.
+    """
+    # Locked until the delete commits: logs being written into the
+    # category meanwhile wait for it, and then fail instead of being lost.
+    category = (
+        db.query(LogCategory)
+        .filter(LogCategory.id == category_id, LogCategory.project_id == project.id)
+        .with_for_update()
+        .first()
+    )
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    if category.is_system:
+        raise HTTPException(status_code=400, detail="System categories cannot be deleted")
+
+    in_use = (
+        db.query(LogEntry.id)
+        .filter(LogEntry.project_id == project.id, LogEntry.category_id == category.id)
+        .first()
+    )
+    if in_use:
+        raise HTTPException(status_code=409, detail=_CATEGORY_IN_USE)
+
+    try:
+        db.delete(category)
+        db.commit()
+    except IntegrityError:
+        # The foreign key restricts deletes of categories that have logs.
+        db.rollback()
+        raise HTTPException(status_code=409, detail=_CATEGORY_IN_USE)
+
+    invalidate_project_categories(project.id)
+    return
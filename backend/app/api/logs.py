@@ -1,61 +1,220 @@
-from fastapi import APIRouter, Depends, status, Query, HTTPException
+from fastapi import APIRouter, Depends, status, Query, Header, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy import or_, cast, String
+from sqlalchemy.exc import IntegrityError
 
 from app.core.auth import get_current_project
+from app.core.project_cache import ProjectSnapshot
+from app.core.severity import SEVERITIES, SeverityRange, parse_level_filter
 from app.core.db import get_db
 from app.core.dashboard_auth import get_current_project_from_jwt
-from app.schemas.ingest import LogIngestRequest
+from app.config import get_settings
 from app.models.log_entry import LogEntry
-from app.models.project import Project
 from app.models.log_category import LogCategory
-from app.services.log_processor import process_logs
-from app.services.log_writer import resolve_category_ids, bulk_insert_logs
-from app.services.category_seeder import seed_system_categories
+from app.services.ingest_encodings import (
+    MEDIA_TYPES,
+    IngestEncodingUnavailable,
+    parse_ingest_body,
+)
+from app.services.ingest_idempotency import (
+    cache_batch_result,
+    cached_batch_result,
+    seen_batch,
+)
+from app.services.ingest_parser import (
+    BATCH_ID_MAX_LENGTH,
+    IngestBatch,
+    IngestValidationError,
+    ingest_request_schema,
+)
+from app.services.ingest_pipeline import ingest_batch
+from app.services.ingest_queue import enqueue_batch
+from app.services.ingest_spool import spool_batch
+from app.services.log_dictionary import name_ids
+from app.services.log_query import apply_dashboard_filters
+from app.services.dashboard_planner import run_dashboard_query, run_sliced_query
+from app.services.recent_logs import recent_page
+from app.services.meta_filters import MetaFilter, parse_meta_filters
+from app.services.log_serializer import (
+    DEFAULT_FIELDS,
+    LIST_FIELDS,
+    SERVICE_NAME,
+    parse_fields,
+    log_columns,
+    row_to_item,
+    rows_to_items,
+    dumps,
+    json_response,
+)
+from app.services.log_dimensions import get_facets
+from app.services.dashboard_cache import (
+    bump_logs_version,
+    cache_key,
+    cached_page,
+    etag_matches,
+    invalidate_project_logs,
+)
+from app.services.log_exporter import (
+    EXPORT_FORMATS,
+    EXPORT_COMPRESSIONS,
+    ExportFormatUnavailable,
+    ensure_format_available,
+    stream_export,
+    export_filename,
+    export_media_type,
+)
 
 
 router = APIRouter(prefix="/api/v1/logs", tags=["Logs"])
 
-@router.post("", status_code=status.HTTP_202_ACCEPTED)
+
+def _parse_fields_or_400(fields: Optional[str], default: tuple = DEFAULT_FIELDS) -> tuple:
+    try:
+        return parse_fields(fields, default)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _parse_meta_filters_or_400(request: Request) -> List[MetaFilter]:
+    try:
+        return parse_meta_filters(request.query_params.multi_items())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _parse_level_filter_or_400(request: Request) -> Optional[SeverityRange]:
+    try:
+        return parse_level_filter(request.query_params.multi_items())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+async def _ingest_batch_body(request: Request) -> IngestBatch:
+    try:
+        return parse_ingest_body(await request.body(), request.headers.get("content-type"))
+    except IngestEncodingUnavailable as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc))
+    except IngestValidationError as exc:
+        raise RequestValidationError(exc.errors)
+
+
+@router.post(
+    "",
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                MEDIA_TYPES["json"]: {"schema": ingest_request_schema()},
+                MEDIA_TYPES["msgpack"]: {"schema": ingest_request_schema()},
+                MEDIA_TYPES["protobuf"]: {
+                    "schema": {
+                        "type": "string",
+                        "format": "binary",
+                        "description": "bcube.logs.v1.LogIngestRequest (app/schemas/log_ingest.proto)",
+                    },
+                },
+            },
+        },
+    },
+)
 def ingest_logs(
-    payload: LogIngestRequest,
-    project: Project = Depends(get_current_project),
+    # Authenticate before reading the body.
+    project: ProjectSnapshot = Depends(get_current_project),
+    batch: IngestBatch = Depends(_ingest_batch_body),
     db: Session = Depends(get_db),
+    x_batch_id: Optional[str] = Header(None, max_length=BATCH_ID_MAX_LENGTH),
 ):
-    seed_system_categories(db, project.id)
-
-    categories = (
-        db.query(LogCategory)
-        .filter(LogCategory.project_id == project.id)
-        .all()
-    )
-
-    processed_logs = process_logs(
-        payload=payload,
-        project=project,
-        user_categories=categories,
-    )
-
-    if not processed_logs:
-        return {"message": "No logs to insert", "count": 0}
+    ingest_mode = get_settings().ingest_mode
+    batch_id = x_batch_id or batch.batch_id
+
+    if batch_id is not None:
+        if ingest_mode == "spool":
+            previous = cached_batch_result(project.id, batch_id)
+        else:
+            previous = seen_batch(db, project.id, batch_id)
+        if previous is not None:
+            return _duplicate_batch_response(batch_id, previous)
+
+    if ingest_mode == "spool":
+        count = spool_batch(project, batch)
+        if batch_id is not None:
+            cache_batch_result(project.id, batch_id, {"count": count})
+        return json_response(
+            {"message": f"Spooled {count} logs", "count": count},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
 
-    project_id = processed_logs[0]["project_id"]
+    rejected: List[dict] = []
+    try:
+        if ingest_mode == "queue":
+            job = enqueue_batch(db, project, batch, batch_id=batch_id)
+        else:
+            inserted_count = ingest_batch(db, project, batch, rejected=rejected, batch_id=batch_id)
+    except IntegrityError:
+        # A concurrent attempt of the same batch committed first.
+        db.rollback()
+        previous = seen_batch(db, project.id, batch_id) if batch_id is not None else None
+        if previous is None:
+            raise
+        return _duplicate_batch_response(batch_id, previous)
+
+    if ingest_mode == "queue":
+        return json_response(
+            {
+                "message": f"Queued {job.log_count} logs",
+                "count": job.log_count,
+                "job_id": job.id,
+            },
+            status_code=status.HTTP_202_ACCEPTED,
+        )
 
-    resolve_category_ids(db, project.id, processed_logs)
+    if rejected and not inserted_count:
+        oversized = all(item["reason"] == "meta_too_large" for item in rejected)
+        raise HTTPException(
+            status_code=(
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                if oversized
+                else status.HTTP_422_UNPROCESSABLE_ENTITY
+            ),
+            detail=rejected,
+        )
 
-    inserted_count = bulk_insert_logs(db, project_id, processed_logs)
+    if not inserted_count:
+        return json_response(
+            {"message": "No logs to insert", "count": 0},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
 
-    return {
+    body = {
         "message": f"Successfully ingested {inserted_count} logs",
         "count": inserted_count,
     }
+    if rejected:
+        body["rejected"] = rejected
+    return json_response(body, status_code=status.HTTP_202_ACCEPTED)
+
+
+def _duplicate_batch_response(batch_id: str, previous: dict) -> Response:
+    return json_response(
+        {
+            **previous,
+            "message": f"Batch {batch_id} was already accepted",
+            "duplicate": True,
+        },
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
 
 @router.get("/dashboard")
 def get_logs_dashboard(
-    project: Project = Depends(get_current_project_from_jwt),
+    request: Request,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
     db: Session = Depends(get_db),
 
     level: Optional[str] = None,
@@ -69,71 +228,159 @@ def get_logs_dashboard(
 
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, examples=["id,timestamp,level,message"]),
+    if_none_match: Optional[str] = Header(None),
 ):
-    query = (
-        db.query(LogEntry)
-        .filter(LogEntry.project_id == project.id)
+    """
+    ``level`` matches one level; ``level>=WARN``, ``level<INFO``, ... match
+    severity ranges. Besides the named filters, accepts meta filters as
+    extra query parameters: ``meta.user_id=123``, ``meta.status>=500``, ...
+
+    Compressed meta (see ``meta_compress_min_bytes``) is searched through
+    its 200-character preview only, and matched by meta filters only on
+    promoted keys.
+
+    Pages are cached until the project's logs change. A log whose insert
+    commits after one with a higher id can be missing from a cached page
+    for up to ``DASHBOARD_CACHE_TTL_SECONDS``.
+    """
+    selected = _parse_fields_or_400(fields, LIST_FIELDS)
+    severity = _parse_level_filter_or_400(request)
+    meta_filters = _parse_meta_filters_or_400(request)
+    promoted_keys = tuple(project.promoted_meta_keys or ())
+
+    key = cache_key(
+        project.id,
+        severity=severity,
+        category=category,
+        service=service,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        search=search,
+        limit=limit,
+        offset=offset,
+        fields=selected,
+        meta=tuple(meta_filters),
     )
 
-    if level:
-        query = query.filter(LogEntry.level == level.upper())
-
-    if service:
-        query = query.filter(LogEntry.service == service)
+    def compute_page() -> Tuple[bytes, str]:
+        result = recent_page(
+            db,
+            project.id,
+            fields=selected,
+            limit=limit,
+            offset=offset,
+            level=severity,
+            service=service,
+            category=category,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            search=search,
+            meta_filters=meta_filters,
+        ) or run_dashboard_query(
+            db,
+            project.id,
+            columns=log_columns(selected),
+            apply_filters=lambda query: apply_dashboard_filters(
+                query,
+                project_id=project.id,
+                level=severity,
+                category=category,
+                service=service,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                search=search,
+                meta_filters=meta_filters,
+                promoted_keys=promoted_keys,
+            ),
+            limit=limit,
+            offset=offset,
+            level=severity,
+            service=service,
+            category=category,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            search=search,
+            meta_filters=meta_filters,
+        )
 
-    if from_ts:
-        query = query.filter(LogEntry.timestamp >= from_ts)
+        body = dumps({
+            "total": result.total,
+            "total_estimated": result.total_estimated,
+            "limit": limit,
+            "offset": offset,
+            "items": rows_to_items(selected, result.rows),
+        })
+        return body, result.plan
+
+    page = cached_page(db, project.id, key, compute_page)
+
+    # ``no-cache``: browsers keep the page but revalidate it every time.
+    headers = {
+        "ETag": page.etag,
+        "Cache-Control": "private, no-cache",
+        "X-Query-Plan": page.plan or "",
+    }
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    if to_ts:
-        query = query.filter(LogEntry.timestamp <= to_ts)
+    return Response(content=page.body, media_type="application/json", headers=headers)
 
-    if category:
-        query = (
-            query.join(LogCategory)
-            .filter(LogCategory.name == category)
-        )
+@router.get("/export")
+def export_logs(
+    request: Request,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
 
-    if search:
-        term = f"%{search}%"
-        query = query.filter(
-            or_(
-                LogEntry.message.ilike(term),
-                cast(LogEntry.meta, String).ilike(term),
-            )
-        )
+    level: Optional[str] = None,
+    category: Optional[str] = None,
+    service: Optional[str] = None,
 
-    total = query.count()
+    from_ts: Optional[datetime] = Query(None, alias="from"),
+    to_ts: Optional[datetime] = Query(None, alias="to"),
 
-    logs = (
-        query
-        .order_by(LogEntry.timestamp.desc())
-        .limit(limit)
-        .offset(offset)
-        .all()
-    )
+    search: Optional[str] = None,
 
-    return {
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-        "items": [
-            {
-                "id": log.id,
-                "timestamp": log.timestamp,
-                "level": log.level,
-                "service": log.service,
-                "environment": log.environment,
-                "message": log.message,
-                "category_id": log.category_id,
-                "meta": log.meta,
-            }
-            for log in logs
-        ],
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    compression: str = Query("none", pattern=f"^({'|'.join(EXPORT_COMPRESSIONS)})$"),
+):
+    """
+    Streams every log matching the dashboard filters, oldest first.
+    Rows are read through a server-side cursor, so memory stays constant
+    no matter how many rows are exported.
+    """
+    try:
+        ensure_format_available(format)
+    except ExportFormatUnavailable as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    severity = _parse_level_filter_or_400(request)
+    meta_filters = _parse_meta_filters_or_400(request)
+
+    filters = {
+        "project_id": project.id,
+        "level": severity,
+        "category": category,
+        "service": service,
+        "from_ts": from_ts,
+        "to_ts": to_ts,
+        "search": search,
+        "meta_filters": meta_filters,
+        "promoted_keys": tuple(project.promoted_meta_keys or ()),
     }
 
+    return StreamingResponse(
+        stream_export(filters, fmt=format, compression=compression),
+        media_type=export_media_type(format, compression),
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{export_filename(format, compression)}"'
+            ),
+        },
+    )
+
 @router.get("/categories")
 def get_log_categories(
-    project: Project = Depends(get_current_project_from_jwt),
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
     db: Session = Depends(get_db),
 ):
     categories = (
@@ -153,34 +400,125 @@ def get_log_categories(
         ]
     }
 
+@router.get("/facets")
+def get_log_facets(
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+    from_ts: Optional[datetime] = Query(None, alias="from"),
+    to_ts: Optional[datetime] = Query(None, alias="to"),
+):
+    facets = get_facets(db, project.id, from_ts=from_ts, to_ts=to_ts)
+
+    return json_response({
+        "services": facets["service"],
+        "environments": facets["environment"],
+        "levels": facets["level"],
+        "categories": facets["category"],
+    })
+
+@router.get("/trace/{correlation_id}")
+def get_trace(
+    correlation_id: str,
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=1, le=5000),
+    fields: Optional[str] = Query(None, examples=["id,timestamp,service,level,message"]),
+):
+    """
+    All logs sharing a trace / request id, across services, oldest first.
+    A single lookup on the ``(project_id, correlation_id)`` index.
+    """
+    selected = _parse_fields_or_400(fields, LIST_FIELDS)
+
+    # Timestamp and service lead every row for the timeline summary,
+    # whatever fields were selected.
+    rows = (
+        db.query(LogEntry.timestamp, SERVICE_NAME, *log_columns(selected))
+        .filter(
+            LogEntry.project_id == project.id,
+            LogEntry.correlation_id == correlation_id,
+        )
+        .order_by(LogEntry.timestamp, LogEntry.id)
+        .limit(limit)
+        .all()
+    )
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="No logs for this correlation id")
+
+    first_ts, last_ts = rows[0][0], rows[-1][0]
+    services = list(dict.fromkeys(row[1] for row in rows if row[1]))
+
+    return json_response({
+        "correlation_id": correlation_id,
+        "count": len(rows),
+        "truncated": len(rows) == limit,
+        "services": services,
+        "started_at": first_ts,
+        "ended_at": last_ts,
+        "duration_ms": round((last_ts - first_ts).total_seconds() * 1000, 3),
+        "items": rows_to_items(selected, (row[2:] for row in rows)),
+    })
+
 @router.get("/search")
 def search_logs(
     q: str = Query(..., min_length=1),
-    project: Project = Depends(get_current_project_from_jwt),
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
     db: Session = Depends(get_db),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, examples=["id,timestamp,level,message"]),
 ):
+    """
+    Matches ``q`` against id, message, service, environment, level and
+    meta. Compressed meta is matched through its 200-character preview only.
+    """
+    selected = _parse_fields_or_400(fields, LIST_FIELDS)
     term = f"%{q}%"
-
-    query = (
-        db.query(LogEntry)
-        .filter(LogEntry.project_id == project.id)
-        .filter(
-            or_(
-                cast(LogEntry.id, String).ilike(term),
-                LogEntry.message.ilike(term),
-                LogEntry.service.ilike(term),
-                LogEntry.environment.ilike(term),
-                LogEntry.level.ilike(term),
-                cast(LogEntry.meta, String).ilike(term),
+    # Level names are few and fixed: match them here rather than per row.
+    severities = [
+        value for name, value in SEVERITIES.items()
+        if q.lower() in name.lower()
+    ]
+
+    service_ids = name_ids(db, "service", project.id, term)
+    environment_ids = name_ids(db, "environment", project.id, term)
+
+    def apply_search(query):
+        return (
+            query
+            .filter(LogEntry.project_id == project.id)
+            .filter(
+                or_(
+                    cast(LogEntry.id, String).ilike(term),
+                    LogEntry.message.ilike(term),
+                    LogEntry.service_id.in_(service_ids),
+                    LogEntry.environment_id.in_(environment_ids),
+                    LogEntry.severity.in_(severities),
+                    cast(LogEntry.meta, String).ilike(term),
+                    LogEntry.meta_preview.ilike(term),
+                )
             )
         )
-    )
+
+    columns = log_columns(selected)
+    # Large projects: parallel time slices, newest first.
+    result = run_sliced_query(db, project.id, columns, apply_search, limit, offset)
+    if result is not None:
+        return json_response(
+            {
+                "total": result.total,
+                "total_estimated": result.total_estimated,
+                "items": rows_to_items(selected, result.rows),
+            },
+            headers={"X-Query-Plan": result.plan},
+        )
+
+    query = apply_search(db.query(*columns))
 
     total = query.count()
 
-    logs = (
+    rows = (
         query
         .order_by(LogEntry.timestamp.desc())
         .limit(limit)
@@ -188,28 +526,17 @@ def search_logs(
         .all()
     )
 
-    return {
+    return json_response({
         "total": total,
-        "items": [
-            {
-                "id": log.id,
-                "timestamp": log.timestamp,
-                "level": log.level,
-                "service": log.service,
-                "environment": log.environment,
-                "message": log.message,
-                "category_id": log.category_id,
-                "meta": log.meta,
-            }
-            for log in logs
-        ],
-    }
+        "total_estimated": False,
+        "items": rows_to_items(selected, rows),
+    })
 
 
 @router.delete("/bulk/by-timezone", status_code=status.HTTP_204_NO_CONTENT)
 def delete_logs_by_timezone(
     timezone_offset: str = Query(..., examples=["+05:30"]),
-    project: Project = Depends(get_current_project_from_jwt),
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
     db: Session = Depends(get_db),
 ):
     (
@@ -220,18 +547,23 @@ def delete_logs_by_timezone(
         )
         .delete(synchronize_session=False)
     )
+    bump_logs_version(db, project.id)
 
     db.commit()
+    invalidate_project_logs(project.id)
     return
 
 @router.get("/{log_id}")
 def get_log(
     log_id: int,
-    project: Project = Depends(get_current_project_from_jwt),
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
     db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, examples=["id,timestamp,level,message"]),
 ):
-    log = (
-        db.query(LogEntry)
+    selected = _parse_fields_or_400(fields)
+
+    row = (
+        db.query(*log_columns(selected))
         .filter(
             LogEntry.id == log_id,
             LogEntry.project_id == project.id,
@@ -239,24 +571,15 @@ def get_log(
         .first()
     )
 
-    if not log:
+    if not row:
         raise HTTPException(status_code=404, detail="Log not found")
 
-    return {
-        "id": log.id,
-        "timestamp": log.timestamp,
-        "level": log.level,
-        "service": log.service,
-        "environment": log.environment,
-        "message": log.message,
-        "category_id": log.category_id,
-        "meta": log.meta,
-    }
+    return json_response(row_to_item(selected, row))
 
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_log(
     log_id: int,
-    project: Project = Depends(get_current_project_from_jwt),
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
     db: Session = Depends(get_db),
 ):
     log = (
@@ -272,5 +595,7 @@ def delete_log(
         raise HTTPException(status_code=404, detail="Log not found")
 
     db.delete(log)
+    bump_logs_version(db, project.id)
     db.commit()
+    invalidate_project_logs(project.id)
     return
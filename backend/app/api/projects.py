@@ -3,16 +3,19 @@ from hashlib import sha256
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.config import settings
+from app.config import get_settings
 from app.core.api_key import generate_api_key
 from app.core.db import get_db
+from app.core.project_cache import invalidate_project, project_claims
+from app.services.project_purge import deletion_status, request_project_deletion
 from app.core.jwt_utils import create_access_token
-from app.models.project import Project
+from app.models.project import PROJECT_DELETING, Project
 from app.schemas.project import (
     ProjectCreateRequest,
     ProjectUpdateRequest,
     ProjectLoginRequest,
     ProjectResponse,
+    ProjectDeletionResponse,
     LoginResponse   
 )
 
@@ -76,8 +79,16 @@ def login_project(
             detail="Invalid credentials",
         )
 
+    if project.status == PROJECT_DELETING:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Project is being deleted")
+
+    settings = get_settings()
+    claims = {"project_id": project.id}
+    if settings.jwt_embed_project_claims:
+        claims.update(project_claims(project))
+
     access_token = create_access_token(
-        data={"project_id": project.id},
+        data=claims,
         secret_key=settings.jwt_secret_key,
         algorithm=settings.jwt_algorithm,
         expires_minutes=settings.jwt_access_token_expires_minutes,
@@ -121,15 +132,22 @@ def update_project(
         setattr(project, field, value)
 
     db.commit()
+    invalidate_project(project_id)
     db.refresh(project)
     return project
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{project_id}",
+    response_model=ProjectDeletionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def delete_project(project_id: int, db: Session = Depends(get_db)):
+    """
+    Marks the project as deleting; its data is purged in the background.
+    """
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    db.delete(project)
-    db.commit()
-    return
+    request_project_deletion(db, project)
+    return deletion_status(db, project)
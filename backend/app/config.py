@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from fastapi.security import OAuth2PasswordBearer
 
@@ -9,10 +11,157 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "change_me_in_production"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expires_minutes: int = 60
+    # Verified dashboard tokens -> project, so refreshes skip the project
+    # lookup. With ``jwt_embed_project_claims`` new tokens also carry the
+    # project name, status and promoted keys, trusted for
+    # ``jwt_embedded_claims_max_age_seconds`` after issue.
+    jwt_cache_size: int = 10000
+    jwt_cache_ttl_seconds: int = 60
+    jwt_embed_project_claims: bool = False
+    jwt_embedded_claims_max_age_seconds: int = 300
+
+    # Defaults for projects without their own meta limits. Meta compressed
+    # under ``meta_compress_min_bytes`` is searched through its preview only
+    # and matched by meta filters only on promoted keys.
+    meta_max_bytes: int = 65536
+    meta_overflow_policy: str = "truncate"  # "truncate" | "reject"
+    meta_compress_min_bytes: int | None = None
+
+    # Meta keys (dotted paths allowed) checked in order for a trace /
+    # request id, copied into ``logs.correlation_id`` at ingest.
+    correlation_meta_keys: list[str] = [
+        "trace_id",
+        "traceId",
+        "request_id",
+        "requestId",
+        "correlation_id",
+    ]
+
+    # Schema is managed by Alembic; this is only a convenience for local dev.
+    auto_create_schema: bool = False
+
+    # Engine / connection pool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+
+    # In-process caches, warmed at startup
+    warm_caches_on_startup: bool = True
+    api_key_cache_size: int = 10000
+    api_key_cache_ttl_seconds: int = 60
+    category_cache_size: int = 10000
+    category_cache_ttl_seconds: int = 60
+
+    # Dashboard results, revalidated against each project's newest log id;
+    # a size of 0 disables the cache
+    dashboard_cache_size: int = 1000
+    dashboard_cache_ttl_seconds: int = 10
+    dashboard_cache_fresh_seconds: float = 2.0
+    # Dashboard query planning: projects up to this many logs are queried
+    # directly; larger ones get windowed "latest N" queries whose filtered
+    # totals are counted up to ``dashboard_count_cap``.
+    dashboard_direct_max_rows: int = 100_000
+    dashboard_count_cap: int = 10_000
+    # Text searches over more than ``dashboard_direct_max_rows`` logs run as
+    # up to ``search_slices`` time slices, queried newest first on a pool of
+    # ``search_parallelism`` threads, each with its own pooled connection
+    # (keep it below ``db_pool_size`` + ``db_max_overflow``); 1 disables.
+    search_parallelism: int = 4
+    search_slices: int = 16
+    # Newest logs of recently viewed projects, kept in memory to answer
+    # unfiltered / simply filtered latest pages; 0 disables.
+    recent_logs_size: int = 1000
+    recent_logs_max_projects: int = 1000
+    recent_logs_ttl_seconds: int = 60
+    # Hourly dimension counts (facets, estimated totals) are added up in
+    # memory once an ingest commits and upserted every
+    # ``dimension_flush_seconds``, in short transactions of their own;
+    # 0 upserts them right after each commit.
+    dimension_flush_seconds: float = 1.0
+
+    # Exposes Prometheus metrics on /metrics
+    metrics_enabled: bool = True
+
+    # "inline" writes logs in the request; "queue" stores validated batches
+    # in ``ingest_jobs`` for the worker processes (python -m app.workers.ingest_worker);
+    # "spool" appends them to a local on-disk spool drained by
+    # python -m app.workers.spool_replayer.
+    ingest_mode: str = "inline"  # "inline" | "queue" | "spool"
+    ingest_workers: int = 2
+    ingest_worker_batch_jobs: int = 50
+    ingest_worker_poll_seconds: float = 0.5
+    ingest_job_max_attempts: int = 5
+    # Client batch ids (X-Batch-Id header or "batch_id" field): a batch
+    # retried within the window is acknowledged again, not written twice.
+    ingest_batch_id_window_seconds: int = 86400
+    ingest_batch_id_cache_size: int = 100_000
+
+    # Alert rules, evaluated on ingest
+    alerts_enabled: bool = True
+    alert_rule_cache_ttl_seconds: int = 30
+    alert_dispatch_workers: int = 2
+    alert_check_interval_seconds: float = 30.0
+
+    # Write-ahead spool (INGEST_MODE=spool)
+    spool_dir: str = "spool"
+    spool_segment_bytes: int = 64 * 1024 * 1024
+    spool_fsync: str = "interval"  # "always" | "interval" | "never"
+    spool_fsync_interval_seconds: float = 1.0
+    spool_replay_batch_records: int = 200
+    spool_replay_poll_seconds: float = 0.5
+
+    # Category backfills (python -m app.workers.recategorizer): logs are
+    # re-evaluated ``recategorize_chunk_size`` per transaction, pausing
+    # ``recategorize_throttle_seconds`` between chunks. A job starts once
+    # ``category_cache_ttl_seconds`` have passed, when every ingest process
+    # uses the new rules.
+    recategorize_chunk_size: int = 1000
+    recategorize_throttle_seconds: float = 0.1
+    recategorize_poll_seconds: float = 2.0
+
+    # Deleted projects are purged by python -m app.workers.project_purger,
+    # ``project_purge_batch_size`` rows per transaction.
+    project_purge_batch_size: int = 5000
+    project_purge_throttle_seconds: float = 0.2
+    project_purge_poll_seconds: float = 5.0
+
+    # Syslog / framed TCP listeners (python -m app.workers.ingest_listener);
+    # a port of 0 disables that listener. Syslog carries no credentials, so
+    # its messages go to the project of ``syslog_api_key``.
+    listener_host: str = "0.0.0.0"
+    syslog_udp_port: int = 0
+    syslog_tcp_port: int = 0
+    framed_tcp_port: int = 0
+    syslog_api_key: str | None = None
+    syslog_environment: str | None = None
+    listener_batch_size: int = 1000
+    listener_flush_seconds: float = 0.5
+    listener_max_pending_batches: int = 8
+    listener_writers: int = 2
+    # Writes failing on transient database errors are retried up to this
+    # many times; other failures drop the batch at once.
+    listener_write_attempts: int = 5
+    listener_max_frame_bytes: int = 1024 * 1024
+    # Serves /metrics from the listener process; 0 disables.
+    listener_metrics_port: int = 0
 
     class Config:
         env_file = ".env"
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/admin/login")
-settings = Settings()
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Settings are read on first use rather than at import, so importing
+    the app never fails on a missing or incomplete environment.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Backwards compatible ``from app.config import settings``.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
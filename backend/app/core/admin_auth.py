@@ -4,13 +4,13 @@ from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.core.jwt_utils import decode_access_token
 from app.models.admin import Admin
-from app.config import settings, oauth2_scheme
+from app.config import get_settings, oauth2_scheme
 
 def get_current_admin(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ) -> Admin:
-    payload = decode_access_token(token, settings.jwt_secret_key)
+    payload = decode_access_token(token, get_settings().jwt_secret_key)
 
     if payload.get("role") != "admin":
         raise HTTPException(
@@ -1,8 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.models.project import Project
 from app.core.db import get_db
+from app.core.project_cache import ProjectSnapshot, get_project_by_api_key
 security = HTTPBearer(auto_error=False)
 
 
@@ -10,7 +10,7 @@ security = HTTPBearer(auto_error=False)
 def get_current_project(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> Project:
+) -> ProjectSnapshot:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,11 +25,7 @@ def get_current_project(
 
     api_key = credentials.credentials
 
-    project = (
-        db.query(Project)
-        .filter(Project.api_key == api_key)
-        .first()
-    )
+    project = get_project_by_api_key(db, api_key)
 
     if not project:
         raise HTTPException(
@@ -37,4 +33,10 @@ def get_current_project(
             detail="Invalid API key",
         )
 
+    if project.is_deleting:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Project is being deleted",
+        )
+
     return project
@@ -2,10 +2,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from app.config import settings
+from app.config import get_settings
 from app.core.jwt_utils import decode_access_token
 from app.core.db import get_db
-from app.models.project import Project
+from app.core.project_cache import ProjectSnapshot, get_project_by_token, token_cache
 
 
 dashboard_security = HTTPBearer(auto_error=False)
@@ -14,12 +14,14 @@ dashboard_security = HTTPBearer(auto_error=False)
 def get_current_project_from_jwt(
     credentials: HTTPAuthorizationCredentials = Depends(dashboard_security),
     db: Session = Depends(get_db),
-) -> Project:
+) -> ProjectSnapshot:
     """
     Dependency that authenticates a project using a JWT access token.
 
     Used for dashboard-style APIs where the caller logs in with
-    project name + password and receives a JWT.
+    project name + password and receives a JWT. Verified tokens are
+    cached, so repeated requests with the same token skip both the
+    signature check and the project lookup.
     """
     if credentials is None:
         raise HTTPException(
@@ -34,6 +36,11 @@ def get_current_project_from_jwt(
         )
 
     token = credentials.credentials
+    project = token_cache().get(token)
+    if project is not None:
+        return _check_not_deleting(project)
+
+    settings = get_settings()
     payload = decode_access_token(
         token,
         secret_key=settings.jwt_secret_key,
@@ -46,14 +53,22 @@ def get_current_project_from_jwt(
             detail="Invalid or expired token",
         )
 
-    project_id = payload["project_id"]
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = get_project_by_token(db, token, payload)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Project not found for token",
         )
 
+    return _check_not_deleting(project)
+
+
+def _check_not_deleting(project: ProjectSnapshot) -> ProjectSnapshot:
+    if project.is_deleting:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Project is being deleted",
+        )
     return project
 
 
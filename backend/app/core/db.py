@@ -1,7 +1,7 @@
-from app.database import SessionLocal
+from app.database import new_session
 
 def get_db():
-    db = SessionLocal()
+    db = new_session()
     try:
         yield db
     finally:
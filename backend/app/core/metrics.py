@@ -0,0 +1,375 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Metrics are plain counters/gauges/histograms guarded by a lock; observing a
+value is a dict lookup plus a bisect, cheap enough for per-request and
+per-stage use on the ingest hot path.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(state[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """
+        Registers a callable returning exposition lines, evaluated on every
+        scrape. Used for values that are cheaper to read than to track
+        (pool status, cache counters).
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# ---- Application metrics ----
+
+HTTP_REQUEST_SECONDS = histogram(
+    "bcube_http_request_duration_seconds",
+    "HTTP request duration by route.",
+    ("method", "route", "status"),
+)
+
+DB_QUERY_SECONDS = histogram(
+    "bcube_db_query_duration_seconds",
+    "Duration of individual SQL statements by originating route.",
+    ("route",),
+)
+
+DB_POOL_CHECKOUT_SECONDS = histogram(
+    "bcube_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+)
+
+INGEST_BATCH_SIZE = histogram(
+    "bcube_ingest_batch_size",
+    "Number of logs per ingest batch.",
+    buckets=SIZE_BUCKETS,
+)
+
+INGEST_ROWS = counter(
+    "bcube_ingest_rows_total",
+    "Logs written by the ingest pipeline.",
+)
+
+INGEST_SAMPLED_OUT = counter(
+    "bcube_ingest_sampled_out_total",
+    "Logs dropped by project sampling rules.",
+)
+
+INGEST_STAGE_SECONDS = histogram(
+    "bcube_ingest_stage_duration_seconds",
+    "Duration of each ingest pipeline stage.",
+    ("stage",),
+)
+
+LISTENER_MESSAGES = counter(
+    "bcube_listener_messages_total",
+    "Logs received by the syslog / framed TCP listeners, by outcome.",
+    ("listener", "result"),
+)
+
+QUEUE_DEPTH = gauge(
+    "bcube_queue_depth",
+    "Items waiting in internal queues.",
+    ("queue",),
+)
+
+SPOOL_PENDING_BYTES = gauge(
+    "bcube_spool_pending_bytes",
+    "Bytes written to the ingest spool and not yet replayed into the database.",
+)
+
+
+# ---- Request context ----
+
+# ASGI scope of the request being served, so SQL timings can be attributed
+# to the matched route (the route is only known after routing).
+current_scope: ContextVar[Optional[dict]] = ContextVar("bcube_current_scope", default=None)
+
+
+def route_label(scope: Optional[dict]) -> str:
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request by route template.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        token = current_scope.set(scope)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_label(scope),
+                status=str(status_holder["status"]),
+            )
+            current_scope.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """
+    Times every SQL statement and exports pool status on scrape.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._bcube_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_bcube_started", None)
+        if started is None:
+            return
+        DB_QUERY_SECONDS.observe(
+            time.perf_counter() - started,
+            route=route_label(current_scope.get()),
+        )
+
+    pool = engine.pool
+
+    def _pool_status() -> Iterable[str]:
+        if not hasattr(pool, "checkedout"):
+            return []
+        lines = [
+            "# HELP bcube_db_pool_connections Connection pool status.",
+            "# TYPE bcube_db_pool_connections gauge",
+            f'bcube_db_pool_connections{{state="checked_out"}} {pool.checkedout()}',
+            f'bcube_db_pool_connections{{state="checked_in"}} {pool.checkedin()}',
+        ]
+        if hasattr(pool, "overflow"):
+            lines.append(f'bcube_db_pool_connections{{state="overflow"}} {pool.overflow()}')
+        return lines
+
+    REGISTRY.register_collector(_pool_status)
+
+
+def _cache_stats() -> Iterable[str]:
+    from app.core.cache import all_caches
+
+    caches = all_caches()
+    if not caches:
+        return []
+
+    lines = [
+        "# HELP bcube_cache_requests_total Cache lookups by result.",
+        "# TYPE bcube_cache_requests_total counter",
+    ]
+    for cache in caches:
+        lines.append(f'bcube_cache_requests_total{{cache="{cache.name}",result="hit"}} {cache.hits}')
+        lines.append(f'bcube_cache_requests_total{{cache="{cache.name}",result="miss"}} {cache.misses}')
+    lines.extend([
+        "# HELP bcube_cache_entries Entries currently held per cache.",
+        "# TYPE bcube_cache_entries gauge",
+    ])
+    for cache in caches:
+        lines.append(f'bcube_cache_entries{{cache="{cache.name}"}} {len(cache)}')
+    return lines
+
+
+REGISTRY.register_collector(_cache_stats)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,187 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.project import PROJECT_ACTIVE, PROJECT_DELETING, Project
+from app.services.sampling import SamplingRule, parse_rules
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    """
+    Read-only copy of the project columns the request path needs.
+    Safe to share between requests and threads, unlike an ORM instance.
+    """
+
+    id: int
+    name: str
+    isAllowed: bool
+    meta_max_bytes: Optional[int] = None
+    meta_overflow_policy: Optional[str] = None
+    meta_compress_min_bytes: Optional[int] = None
+    promoted_meta_keys: Tuple[str, ...] = ()
+    sampling_rules: Tuple[SamplingRule, ...] = ()
+    status: str = PROJECT_ACTIVE
+
+    @property
+    def is_deleting(self) -> bool:
+        return self.status == PROJECT_DELETING
+
+    @classmethod
+    def from_model(cls, project: Project) -> "ProjectSnapshot":
+        return cls(
+            id=project.id,
+            name=project.name,
+            isAllowed=project.isAllowed,
+            meta_max_bytes=project.meta_max_bytes,
+            meta_overflow_policy=project.meta_overflow_policy,
+            meta_compress_min_bytes=project.meta_compress_min_bytes,
+            promoted_meta_keys=tuple(project.promoted_meta_keys or ()),
+            sampling_rules=parse_rules(project.sampling_rules),
+            status=project.status or PROJECT_ACTIVE,
+        )
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "ProjectSnapshot":
+        """
+        Snapshot from the claims ``project_claims`` embeds in a dashboard
+        token. Carries no meta or sampling settings, which dashboard
+        requests never use.
+        """
+        return cls(
+            id=claims["project_id"],
+            name=claims["project_name"],
+            isAllowed=bool(claims["project_allowed"]),
+            promoted_meta_keys=tuple(claims.get("promoted_meta_keys") or ()),
+            status=claims.get("project_status", PROJECT_ACTIVE),
+        )
+
+
+def project_claims(project: Project) -> Dict[str, Any]:
+    """
+    Claims to embed in a dashboard token (``JWT_EMBED_PROJECT_CLAIMS``).
+    """
+    return {
+        "project_name": project.name,
+        "project_allowed": bool(project.isAllowed),
+        "project_status": project.status or PROJECT_ACTIVE,
+        "promoted_meta_keys": list(project.promoted_meta_keys or ()),
+    }
+
+
+_api_key_cache: Optional[TTLCache] = None
+
+
+def api_key_cache() -> TTLCache:
+    global _api_key_cache
+    if _api_key_cache is None:
+        settings = get_settings()
+        _api_key_cache = TTLCache(
+            maxsize=settings.api_key_cache_size,
+            ttl=settings.api_key_cache_ttl_seconds,
+            name="api_keys",
+        )
+    return _api_key_cache
+
+
+def get_project_by_api_key(db: Session, api_key: str) -> Optional[ProjectSnapshot]:
+    cache = api_key_cache()
+
+    snapshot = cache.get(api_key)
+    if snapshot is not None:
+        return snapshot
+
+    project = db.query(Project).filter(Project.api_key == api_key).first()
+    if not project:
+        return None
+
+    snapshot = ProjectSnapshot.from_model(project)
+    cache.set(api_key, snapshot)
+    return snapshot
+
+
+_token_cache: Optional[TTLCache] = None
+
+# When each project last changed in this process. Tokens issued earlier
+# no longer have their embedded claims trusted here.
+_changed_at: Dict[int, float] = {}
+
+
+def token_cache() -> TTLCache:
+    global _token_cache
+    if _token_cache is None:
+        settings = get_settings()
+        _token_cache = TTLCache(
+            maxsize=settings.jwt_cache_size,
+            ttl=settings.jwt_cache_ttl_seconds,
+            name="jwt_tokens",
+        )
+    return _token_cache
+
+
+def get_project_by_token(
+    db: Session,
+    token: str,
+    claims: Dict[str, Any],
+) -> Optional[ProjectSnapshot]:
+    """
+    Project of an already verified dashboard token. Embedded project claims
+    are used when the token is recent enough
+    (``JWT_EMBEDDED_CLAIMS_MAX_AGE_SECONDS``); otherwise the project row is
+    loaded. The result is cached until the token expires.
+    """
+    settings = get_settings()
+    project_id = claims["project_id"]
+    issued_at = claims.get("iat")
+    now = time.time()
+
+    if (
+        "project_allowed" in claims
+        and issued_at is not None
+        and now - issued_at <= settings.jwt_embedded_claims_max_age_seconds
+        and issued_at >= _changed_at.get(project_id, 0)
+    ):
+        snapshot = ProjectSnapshot.from_claims(claims)
+    else:
+        project = db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            return None
+        snapshot = ProjectSnapshot.from_model(project)
+
+    cache = token_cache()
+    ttl = cache.ttl
+    if "exp" in claims:
+        ttl = min(ttl, claims["exp"] - now)
+    if ttl > 0:
+        cache.set(token, snapshot, ttl=ttl)
+    return snapshot
+
+
+def invalidate_project(project_id: int) -> None:
+    """
+    Drops cached snapshots of a project after it is updated or deleted.
+    Other worker processes pick up the change when their entries expire
+    (and, for embedded token claims, once the claims are too old to trust).
+    """
+    _changed_at[project_id] = time.time()
+    api_key_cache().discard_where(lambda _, snapshot: snapshot.id == project_id)
+    token_cache().discard_where(lambda _, snapshot: snapshot.id == project_id)
+
+
+def warm_api_key_cache(db: Session) -> int:
+    """
+    Loads every project in one query so the first ingest requests after
+    boot do not each pay an API key lookup.
+    """
+    cache = api_key_cache()
+    projects = db.query(Project).limit(cache.maxsize).all()
+
+    cache.set_many(
+        (project.api_key, ProjectSnapshot.from_model(project))
+        for project in projects
+    )
+    return len(projects)
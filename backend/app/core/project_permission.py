@@ -1,8 +1,10 @@
 from fastapi import Depends, HTTPException, status
-from app.models.project import Project
+from app.core.project_cache import ProjectSnapshot
 from app.core.dashboard_auth import get_current_project_from_jwt
 
-def require_project_allowed(project: Project = Depends(get_current_project_from_jwt)) -> Project:
+def require_project_allowed(
+    project: ProjectSnapshot = Depends(get_current_project_from_jwt),
+) -> ProjectSnapshot:
     """
     Dependency that ensures the project is allowed.
     """
@@ -0,0 +1,122 @@
+"""
+Log severities. Stored as small integers so level filters, including
+ranges such as ``level>=WARN``, are integer comparisons. Values are spaced
+by ten to leave room for levels in between.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+SEVERITIES: Dict[str, int] = {
+    "TRACE": 0,
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARN": 30,
+    "ERROR": 40,
+    "FATAL": 50,
+}
+
+SEVERITY_NAMES: Dict[int, str] = {value: name for name, value in SEVERITIES.items()}
+
+DEFAULT_LEVEL = "INFO"
+
+# Accepted spellings (lowercase) -> canonical level name.
+LEVEL_ALIASES: Dict[str, str] = {
+    "trace": "TRACE",
+    "debug": "DEBUG",
+    "info": "INFO",
+    "notice": "INFO",
+    "warn": "WARN",
+    "warning": "WARN",
+    "error": "ERROR",
+    "err": "ERROR",
+    "fatal": "FATAL",
+    "critical": "FATAL",
+}
+
+
+def severity_of(level: str) -> Optional[int]:
+    """
+    Severity of a level name or alias, case-insensitive; None if unknown.
+    """
+    name = LEVEL_ALIASES.get(level.strip().lower())
+    return SEVERITIES[name] if name else None
+
+
+def normalize_level(level: str) -> str:
+    """
+    Canonical name of an ingested level; unknown levels become INFO.
+    """
+    return LEVEL_ALIASES.get(level.lower(), DEFAULT_LEVEL)
+
+
+LEVEL_PARAM = "level"
+
+_LEVEL_EXPRESSION_RE = re.compile(r"^level(?P<op>>=|<=|=|>|<)(?P<value>[A-Za-z]+)$")
+
+
+@dataclass(frozen=True)
+class SeverityRange:
+    """
+    Inclusive severity bounds of a level filter; None leaves a side open.
+    """
+
+    min: Optional[int] = None
+    max: Optional[int] = None
+
+    def levels(self) -> List[str]:
+        """
+        Canonical level names inside the range, lowest first.
+        """
+        return [
+            name for name, value in SEVERITIES.items()
+            if (self.min is None or value >= self.min)
+            and (self.max is None or value <= self.max)
+        ]
+
+
+def parse_level_filter(params: Iterable[Tuple[str, str]]) -> Optional[SeverityRange]:
+    """
+    Parses ``level`` query parameters: ``level=WARN`` matches one level,
+    ``level>=WARN``, ``level>WARN``, ``level<=INFO`` and ``level<INFO``
+    match ranges, and repeated parameters narrow each other.
+
+    Like meta filters, ``level>=WARN`` arrives as the parameter ``level>``
+    with value ``WARN`` and ``level>WARN`` as a parameter without a value;
+    both are reassembled here. Returns None without level parameters.
+    Raises ``ValueError`` for malformed filters or unknown levels.
+    """
+    low: Optional[int] = None
+    high: Optional[int] = None
+    found = False
+
+    for name, value in params:
+        if not name.startswith(LEVEL_PARAM) or name[len(LEVEL_PARAM):][:1] not in ("", "<", ">", "="):
+            continue
+        if not value and name == LEVEL_PARAM:
+            continue
+
+        expression = f"{name}={value}" if value else name
+        match = _LEVEL_EXPRESSION_RE.match(expression)
+        if not match:
+            raise ValueError(f"Invalid level filter: {expression}")
+
+        severity = severity_of(match["value"])
+        if severity is None:
+            raise ValueError(
+                f"Unknown level {match['value']!r}. Allowed: {', '.join(SEVERITIES)}"
+            )
+
+        op = match["op"]
+        if op == ">":
+            severity += 1
+        elif op == "<":
+            severity -= 1
+        if op in ("=", ">=", ">"):
+            low = severity if low is None else max(low, severity)
+        if op in ("=", "<=", "<"):
+            high = severity if high is None else min(high, severity)
+        found = True
+
+    return SeverityRange(low, high) if found else None
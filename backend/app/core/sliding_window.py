@@ -0,0 +1,46 @@
+import time
+from typing import List, Optional
+
+
+class SlidingWindowCounter:
+    """
+    Event count over the last ``window`` seconds, kept in a ring of
+    ``buckets`` time slots. ``add`` and ``total`` are O(1) amortized:
+    expired slots are cleared lazily as time advances, at most once each.
+
+    Resolution is ``window / buckets``; events older than the window leave
+    the total one slot at a time. Not thread-safe; callers lock.
+    """
+
+    def __init__(self, window: float, buckets: int = 60):
+        self.window = window
+        self.buckets = buckets
+        self.width = window / buckets
+        self._counts: List[int] = [0] * buckets
+        self._total = 0
+        self._head: Optional[int] = None  # absolute index of the newest slot
+
+    def _advance(self, now: float) -> None:
+        index = int(now // self.width)
+        if self._head is None:
+            self._head = index
+            return
+        if index <= self._head:
+            return
+
+        for step in range(1, min(index - self._head, self.buckets) + 1):
+            slot = (self._head + step) % self.buckets
+            self._total -= self._counts[slot]
+            self._counts[slot] = 0
+        self._head = index
+
+    def add(self, amount: int = 1, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        self._advance(now)
+        self._counts[self._head % self.buckets] += amount
+        self._total += amount
+        return self._total
+
+    def total(self, now: Optional[float] = None) -> int:
+        self._advance(time.time() if now is None else now)
+        return self._total
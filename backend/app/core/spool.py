@@ -0,0 +1,367 @@
+"""
+Append-only, segmented on-disk spool.
+
+Each writer process owns a directory of numbered segment files and only
+ever appends to the newest one. It holds an exclusive ``flock`` on the
+directory's lock file for as long as it lives; whoever can take that lock
+knows the writer is gone and its newest segment is final. A record is framed as
+
+    4-byte big-endian payload length | 4-byte CRC32 of payload | payload
+
+so a reader can detect torn writes (a crash mid-append) and corruption.
+The reader's progress is a committed ``(segment, offset)`` pair stored next
+to the segments and replaced atomically; segments before it are deleted.
+"""
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import IO, Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER_SIZE = 8
+SEGMENT_SUFFIX = ".seg"
+OFFSET_FILE = "committed"
+WRITER_LOCK_FILE = "writer.lock"
+WRITER_PREFIX = "writer-"
+DEAD_LETTER_DIR = "dead-letter"
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_NEVER = "never"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+
+def _segment_name(seq: int) -> str:
+    return f"{seq:012d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: str) -> List[int]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        int(name[: -len(SEGMENT_SUFFIX)])
+        for name in names
+        if name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def _fsync_dir(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def encode_frame(payload: bytes) -> bytes:
+    header = len(payload).to_bytes(4, "big") + zlib.crc32(payload).to_bytes(4, "big")
+    return header + payload
+
+
+class SpoolWriter:
+    """
+    Appends framed records to ``directory``. Thread-safe; one instance per
+    process. Every instance starts a fresh segment, so a torn tail left by
+    a crash is never appended to.
+
+    ``fsync``: ``always`` syncs before ``append`` returns, ``interval`` at
+    most every ``fsync_interval`` seconds, ``never`` leaves it to the OS.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync: str = FSYNC_INTERVAL,
+        fsync_interval: float = 1.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}; expected one of {', '.join(FSYNC_POLICIES)}")
+
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self._lock_file = lock_writer_directory(directory, timeout=5.0)
+        if self._lock_file is None:
+            raise RuntimeError(f"Spool directory {directory} is locked by another writer")
+
+        segments = list_segments(directory)
+        self._seq = segments[-1] + 1 if segments else 1
+        self._file = None
+        self._size = 0
+        self._last_sync = time.monotonic()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._open_segment()
+
+    def _open_segment(self) -> None:
+        self._file = open(os.path.join(self.directory, _segment_name(self._seq)), "ab")
+        self._size = self._file.tell()
+        _fsync_dir(self.directory)
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+        self._dirty = False
+
+    def append(self, payload: bytes) -> None:
+        frame = encode_frame(payload)
+        with self._lock:
+            if self._size and self._size + len(frame) > self.segment_bytes:
+                self._sync()
+                self._file.close()
+                self._seq += 1
+                self._open_segment()
+
+            self._file.write(frame)
+            # Flushed to the OS on every append so the replayer sees it.
+            self._file.flush()
+            self._size += len(frame)
+            self._dirty = True
+
+            if self.fsync == FSYNC_ALWAYS or (
+                self.fsync == FSYNC_INTERVAL
+                and time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            if self._dirty and self.fsync != FSYNC_NEVER:
+                self._sync()
+            self._file.close()
+            self._file = None
+            # Only now may the replayer treat the newest segment as final.
+            self._lock_file.close()
+
+    def forget_lock(self) -> None:
+        """
+        Closes this process's copy of the lock file without unlocking it,
+        in a child forked from the writer's process: the lock (shared by
+        both copies) stays held until the writer itself closes it.
+        """
+        self._lock_file.close()
+
+
+@dataclass(frozen=True)
+class SpoolOffset:
+    segment: int
+    offset: int
+
+
+def read_offset(directory: str) -> SpoolOffset:
+    try:
+        with open(os.path.join(directory, OFFSET_FILE)) as f:
+            data = json.load(f)
+        return SpoolOffset(segment=data["segment"], offset=data["offset"])
+    except FileNotFoundError:
+        segments = list_segments(directory)
+        return SpoolOffset(segment=segments[0] if segments else 1, offset=0)
+
+
+def commit_offset(directory: str, position: SpoolOffset) -> None:
+    """
+    Durably records reader progress (write, fsync, rename), then deletes
+    the segments that lie entirely before it.
+    """
+    path = os.path.join(directory, OFFSET_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"segment": position.segment, "offset": position.offset}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(directory)
+
+    for seq in list_segments(directory):
+        if seq >= position.segment:
+            break
+        os.remove(os.path.join(directory, _segment_name(seq)))
+
+
+def read_records(
+    directory: str,
+    start: SpoolOffset,
+    limit: int,
+    is_sealed: Callable[[int], bool],
+) -> Tuple[List[bytes], SpoolOffset]:
+    """
+    Reads up to ``limit`` records from ``start``. Returns the payloads and
+    the position just after the last one.
+
+    A partial or corrupt frame at the end of the segment still being
+    written is treated as not yet written. In a sealed segment (one that
+    will never be appended to again) it is logged and the rest of the
+    segment is skipped.
+    """
+    payloads: List[bytes] = []
+    position = start
+
+    for seq in list_segments(directory):
+        if seq < position.segment:
+            continue
+        if seq > position.segment:
+            position = SpoolOffset(seq, 0)
+
+        sealed = is_sealed(seq)
+        with open(os.path.join(directory, _segment_name(seq)), "rb") as f:
+            f.seek(position.offset)
+            while len(payloads) < limit:
+                frame = _read_frame(f)
+                if frame is None:
+                    break
+                payloads.append(frame)
+                position = SpoolOffset(seq, f.tell())
+
+            if len(payloads) >= limit:
+                return payloads, position
+
+            if f.read(1) and sealed:
+                logger.warning(
+                    "Skipping torn or corrupt spool data in %s at offset %d",
+                    os.path.join(directory, _segment_name(seq)),
+                    position.offset,
+                )
+
+        if not sealed:
+            return payloads, position
+        position = SpoolOffset(seq + 1, 0)
+
+    return payloads, position
+
+
+def _read_frame(f) -> Optional[bytes]:
+    start = f.tell()
+    header = f.read(FRAME_HEADER_SIZE)
+    if len(header) == FRAME_HEADER_SIZE:
+        length = int.from_bytes(header[:4], "big")
+        payload = f.read(length)
+        if len(payload) == length and zlib.crc32(payload) == int.from_bytes(header[4:], "big"):
+            return payload
+    f.seek(start)
+    return None
+
+
+def pending_bytes(directory: str) -> int:
+    position = read_offset(directory)
+    total = 0
+    for seq in list_segments(directory):
+        if seq < position.segment:
+            continue
+        size = os.path.getsize(os.path.join(directory, _segment_name(seq)))
+        total += size - position.offset if seq == position.segment else size
+    return max(total, 0)
+
+
+def writer_directory(spool_dir: str, pid: Optional[int] = None) -> str:
+    return os.path.join(spool_dir, f"{WRITER_PREFIX}{pid or os.getpid()}")
+
+
+def writer_directories(spool_dir: str) -> Iterator[str]:
+    """
+    Yields the directory of every writer under ``spool_dir``, live or not.
+    """
+    try:
+        names = sorted(os.listdir(spool_dir))
+    except FileNotFoundError:
+        return
+    for name in names:
+        if name.startswith(WRITER_PREFIX):
+            yield os.path.join(spool_dir, name)
+
+
+def append_dead_letters(spool_dir: str, source: str, entries: List[Tuple[bytes, str]]) -> str:
+    """
+    Durably appends records that can never be replayed, with their error,
+    to ``<spool_dir>/dead-letter/<source>.ndjson`` for inspection. Returns
+    the file path.
+    """
+    directory = os.path.join(spool_dir, DEAD_LETTER_DIR)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{source}.ndjson")
+    failed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    with open(path, "a") as f:
+        for payload, error in entries:
+            f.write(json.dumps({
+                "failed_at": failed_at,
+                "error": error,
+                "record": payload.decode("utf-8", "replace"),
+            }) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return path
+
+
+def lock_writer_directory(directory: str, timeout: float = 0.0) -> Optional[IO[bytes]]:
+    """
+    Takes the exclusive writer lock of ``directory``, creating both if
+    needed, retrying for up to ``timeout`` seconds. Returns the open lock
+    file, which holds the lock until closed, or None if another process
+    holds it.
+
+    The replayer deletes a drained directory while holding its lock, so a
+    lock won on a file that was unlinked meanwhile is dropped and retried.
+    """
+    deadline = time.monotonic() + timeout
+    path = os.path.join(directory, WRITER_LOCK_FILE)
+    while True:
+        os.makedirs(directory, exist_ok=True)
+        lock_file = open(path, "ab")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+            continue
+
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and current.st_ino == os.fstat(lock_file.fileno()).st_ino:
+            return lock_file
+        lock_file.close()
+
+
+def remove_writer_directory(directory: str) -> None:
+    """
+    Deletes a drained writer directory. The caller holds its writer lock.
+    """
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+class SpoolLock:
+    """
+    Exclusive advisory lock so only one replayer drains a spool.
+    """
+
+    def __init__(self, spool_dir: str):
+        os.makedirs(spool_dir, exist_ok=True)
+        self._file = open(os.path.join(spool_dir, "replayer.lock"), "w")
+
+    def acquire(self) -> bool:
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def release(self) -> None:
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
@@ -1,12 +1,75 @@
+import time
+from functools import lru_cache
+
+import orjson
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from app.config import settings
-
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+from app.config import get_settings
+from app.core.metrics import DB_POOL_CHECKOUT_SECONDS, instrument_engine
 
+# Bound to the engine on first use; see ``get_engine``.
 SessionLocal = sessionmaker(
-    bind=engine,
     autoflush=False,
     autocommit=False,
 )
+
+
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    ``QueuePool`` that records how long callers wait for a connection.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """
+    Creates the engine on first use instead of at import time, so importing
+    the app (workers, CLI tools, Alembic) does not need database settings.
+    """
+    settings = get_settings()
+
+    options = {
+        "pool_pre_ping": True,
+        # JSON columns (``logs.meta`` above all) go through orjson rather
+        # than the stdlib ``json`` module on both write and read.
+        "json_serializer": _json_serializer,
+        "json_deserializer": orjson.loads,
+    }
+    if not settings.database_url.startswith("sqlite"):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+
+    engine = create_engine(settings.database_url, **options)
+    instrument_engine(engine)
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+def new_session():
+    get_engine()
+    return SessionLocal()
+
+
+def __getattr__(name: str):
+    # Backwards compatible ``from app.database import engine``.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
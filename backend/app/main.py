@@ -1,43 +1,147 @@
-import os
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.logs import router as logs_router
 from app.api.projects import router as projects_router
 from app.api.admin_auth import router as admin_router
 from app.api.admin_project import router as admin_project_router
-from app.models import Base
-from app.database import engine
-from app.config import settings
-
-# Create tables if they don't exist
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Bcube Logger API",
-    description="API for managing BCube Logger projects, logs, and admin operations.",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
-
-# CORS configuration
-frontend_url = settings.frontend_url
-
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[frontend_url],
-    allow_credentials=False,  # JWT in headers
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
-)
-
-app.include_router(projects_router)
-app.include_router(logs_router)
-app.include_router(admin_router)
-app.include_router(admin_project_router)
-
-@app.get("/health")
+from app.api.alerts import router as alerts_router
+from app.api.categories import router as categories_router
+from app.config import get_settings
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.project_cache import warm_api_key_cache
+from app.database import get_engine, new_session
+from app.services.alerting import AbsenceMonitor, drain_dispatcher
+from app.services.category_cache import warm_category_cache
+from app.services.ingest_queue import refresh_queue_depth
+from app.services.ingest_spool import close_spool_writer, refresh_spool_backlog
+from app.services.log_dimensions import stop_dimension_flusher
+
+logger = logging.getLogger(__name__)
+
+
+def warm_caches() -> None:
+    """
+    Bulk-loads API keys and categories so the first requests after boot
+    are served from memory. A slow or unavailable database only delays
+    warm-up; requests then fill the caches lazily.
+    """
+    db = new_session()
+    try:
+        projects = warm_api_key_cache(db)
+        categories = warm_category_cache(db)
+        logger.info("Warmed caches: %d projects, %d category sets", projects, categories)
+    except Exception:
+        logger.exception("Cache warm-up failed; caches will fill lazily")
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    engine = get_engine()
+
+    # Schema is managed by Alembic (`alembic upgrade head`).
+    if settings.auto_create_schema:
+        from app.models import Base
+        Base.metadata.create_all(bind=engine)
+
+    if settings.warm_caches_on_startup:
+        warm_caches()
+
+    absence_monitor = None
+    if settings.alerts_enabled:
+        absence_monitor = AbsenceMonitor(settings.alert_check_interval_seconds)
+        absence_monitor.start()
+
+    yield
+
+    if absence_monitor is not None:
+        absence_monitor.stop()
+    drain_dispatcher(timeout=10)
+    stop_dimension_flusher()
+    close_spool_writer()
+    engine.dispose()
+
+
+health_router = APIRouter()
+
+
+@health_router.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@health_router.get("/metrics", include_in_schema=False)
+def metrics():
+    settings = get_settings()
+    if not settings.metrics_enabled:
+        return Response(status_code=404)
+
+    # Workers and replayers run in other processes; read their backlog directly.
+    if settings.ingest_mode == "queue":
+        db = new_session()
+        try:
+            refresh_queue_depth(db)
+        finally:
+            db.close()
+    elif settings.ingest_mode == "spool":
+        refresh_spool_backlog()
+
+    return Response(
+        content=render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def create_app() -> FastAPI:
+    settings = get_settings()
+
+    app = FastAPI(
+        title="Bcube Logger API",
+        description="API for managing BCube Logger projects, logs, and admin operations.",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan,
+    )
+
+    # CORS configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[settings.frontend_url],
+        allow_credentials=False,  # JWT in headers
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization", "X-Batch-Id"],
+    )
+
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    app.include_router(health_router)
+    app.include_router(projects_router)
+    app.include_router(logs_router)
+    app.include_router(admin_router)
+    app.include_router(admin_project_router)
+    app.include_router(alerts_router)
+    app.include_router(categories_router)
+    return app
+
+
+_app: Optional[FastAPI] = None
+
+
+def __getattr__(name: str):
+    # ``uvicorn app.main:app``: the app is built on first access, so
+    # importing this module never reads the settings.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,14 @@
 from app.models.base import Base
 from app.models.project import Project
 from app.models.log_category import LogCategory
+from app.models.log_service import LogService
+from app.models.log_environment import LogEnvironment
 from app.models.log_entry import LogEntry
-from app.models.admin import Admin
\ No newline at end of file
+from app.models.admin import Admin
+from app.models.ingest_job import IngestJob
+from app.models.ingest_batch_id import IngestBatchId
+from app.models.log_dimension import LogDimension
+from app.models.log_meta_index import LogMetaIndex
+from app.models.alert_rule import AlertRule
+from app.models.alert import Alert
+from app.models.recategorize_job import RecategorizeJob
@@ -0,0 +1,45 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    JSON,
+)
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+
+class AlertRule(Base):
+    """
+    Per-project alert rule, evaluated on the ingest stream.
+
+    ``threshold`` rules fire when at least ``threshold`` matching logs arrive
+    within ``window_seconds``; ``absence`` rules fire when no matching log
+    arrives for ``window_seconds``. Matching fields left NULL match anything.
+    """
+
+    __tablename__ = "alert_rules"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    kind = Column(String(10), nullable=False, default="threshold")  # "threshold" | "absence"
+
+    level = Column(String(10), nullable=True)
+    category = Column(String(100), nullable=True)
+    service = Column(String(100), nullable=True)
+    pattern = Column(String(255), nullable=True)  # case-insensitive substring of the message
+
+    threshold = Column(Integer, nullable=False, default=1)
+    window_seconds = Column(Integer, nullable=False, default=300)
+    cooldown_seconds = Column(Integer, nullable=False, default=300)
+
+    # [{"type": "webhook", "url": "..."}, {"type": "store"}]; NULL = store only
+    sinks = Column(JSON, nullable=True)
+    enabled = Column(Boolean, nullable=False, default=True)
+
+    # Claimed atomically when firing, so several processes alert only once.
+    last_triggered_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,31 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    JSON,
+    Index,
+)
+from app.models.base import Base
+
+
+class IngestBatchId(Base):
+    """
+    Client batch ids of recently accepted ingest batches, with the answer
+    given, so a retried batch is acknowledged again instead of written twice.
+    Rows older than ``INGEST_BATCH_ID_WINDOW_SECONDS`` are ignored and pruned.
+    """
+
+    __tablename__ = "ingest_batch_ids"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    batch_id = Column(String(128), primary_key=True)
+
+    # Response fields of the first attempt (count, rejected logs, job id).
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_ingest_batch_ids_created_at", "created_at"),
+    )
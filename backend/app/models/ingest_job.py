@@ -0,0 +1,39 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    LargeBinary,
+    Index,
+)
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+
+class IngestJob(Base):
+    """
+    Validated ingest batch waiting for an ingest worker (``INGEST_MODE=queue``).
+    Rows are deleted once their logs are written.
+    """
+
+    __tablename__ = "ingest_jobs"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+
+    # The request body (``LogIngestRequest`` JSON), stored as received
+    # after the API validated it.
+    payload = Column(LargeBinary, nullable=False)
+    log_count = Column(Integer, nullable=False)
+
+    status = Column(String(10), nullable=False, default="pending")  # "pending" | "failed"
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_ingest_jobs_status_id", "status", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON
 from sqlalchemy.sql import func
 from app.models.base import Base
 
@@ -9,4 +9,12 @@ class LogCategory(Base):
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     name = Column(String(100), nullable=False)
     is_system = Column(Boolean, default=False)
+
+    # Matching rule: a log belongs to the first category (by id) with one of
+    # ``keywords`` in its message (case-insensitive) and, when ``levels`` is
+    # set, one of those levels. NULL keywords match the category name;
+    # an empty list matches nothing.
+    keywords = Column(JSON, nullable=True)
+    levels = Column(JSON, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,37 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    DateTime,
+    ForeignKey,
+    UniqueConstraint,
+)
+from app.models.base import Base
+
+
+class LogDimension(Base):
+    """
+    Hourly log counts per project and dimension value (service, environment,
+    level, category), maintained on ingest. Backs ``/logs/facets`` so filter
+    values never require a ``DISTINCT`` scan over ``logs``.
+    """
+
+    __tablename__ = "log_dimensions"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+
+    bucket = Column(DateTime(timezone=True), nullable=False)  # start of the UTC hour
+    dimension = Column(String(20), nullable=False)
+    value = Column(String(255), nullable=False)  # category id for "category"
+    count = Column(BigInteger, nullable=False, default=0)
+    # Logs represented, with sampled rows scaled up by their sample rate.
+    scaled_count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "dimension", "value", "bucket",
+            name="uq_log_dimensions_project_dimension_value_bucket",
+        ),
+    )
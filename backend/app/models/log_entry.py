@@ -1,11 +1,16 @@
 from sqlalchemy import (
     Column,
     Integer,
+    Float,
+    SmallInteger,
     String,
     DateTime,
     ForeignKey,
-    JSON
+    JSON,
+    LargeBinary,
+    Index,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.models.base import Base
 
@@ -15,15 +20,41 @@ class LogEntry(Base):
     id = Column(Integer, primary_key=True)
 
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    category_id = Column(Integer, ForeignKey("log_categories.id", ondelete="CASCADE"), nullable=False)
+    # A category cannot be deleted while logs still reference it.
+    category_id = Column(Integer, ForeignKey("log_categories.id", ondelete="RESTRICT"), nullable=False)
 
     timestamp = Column(DateTime(timezone=True), nullable=False)
-    level = Column(String(10), nullable=False)
+    # ``app.core.severity``: 0 TRACE ... 50 FATAL. The API speaks level names.
+    severity = Column(SmallInteger, nullable=False)
 
-    service = Column(String(100), nullable=True)
-    environment = Column(String(50), nullable=True)
+    # Dictionary-encoded per project; names live in log_services / log_environments.
+    service_id = Column(Integer, ForeignKey("log_services.id", ondelete="CASCADE"), nullable=True)
+    environment_id = Column(Integer, ForeignKey("log_environments.id", ondelete="CASCADE"), nullable=True)
 
     message = Column(String, nullable=False)
-    meta = Column(JSON, nullable=True)
+
+    # Trace / request id taken from meta at ingest (``CORRELATION_META_KEYS``).
+    correlation_id = Column(String(128), nullable=True)
+
+    # JSONB on PostgreSQL, for containment / jsonpath filters and the GIN index.
+    meta = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+
+    # Filled at ingest so list queries never have to read ``meta`` itself.
+    # ``meta_size`` is the JSON size of the stored (possibly truncated) meta.
+    meta_size = Column(Integer, nullable=True)
+    meta_preview = Column(String(200), nullable=True)
+    # zlib-compressed JSON for large blobs; ``meta`` is NULL when this is set.
+    meta_blob = Column(LargeBinary, nullable=True)
+
+    # Fraction of similar logs kept by ingest sampling; NULL when unsampled.
+    sample_rate = Column(Float, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Newest log id per project: the dashboard cache watermark.
+        Index("ix_logs_project_id_id", "project_id", "id"),
+        Index("ix_logs_project_id_correlation_id", "project_id", "correlation_id"),
+        # Newest logs per project: dashboard pages and their time windows.
+        Index("ix_logs_project_id_timestamp", "project_id", "timestamp"),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from app.models.base import Base
+
+
+class LogEnvironment(Base):
+    """
+    Per-project dictionary of environment names, referenced by
+    ``logs.environment_id``.
+    """
+
+    __tablename__ = "log_environments"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(50), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_log_environments_project_id_name"),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Float,
+    ForeignKey,
+    Index,
+)
+from app.models.base import Base
+
+
+class LogMetaIndex(Base):
+    """
+    Values of a project's promoted meta keys (``projects.promoted_meta_keys``),
+    one row per log and key, so filters on them are plain btree lookups.
+    """
+
+    __tablename__ = "log_meta_index"
+
+    log_id = Column(Integer, ForeignKey("logs.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    project_id = Column(Integer, nullable=False)
+
+    value_text = Column(String(255), nullable=True)
+    value_num = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_log_meta_index_text", "project_id", "key", "value_text"),
+        Index("ix_log_meta_index_num", "project_id", "key", "value_num"),
+    )
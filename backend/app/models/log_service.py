@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from app.models.base import Base
+
+
+class LogService(Base):
+    """
+    Per-project dictionary of service names; ``logs.service_id`` points here
+    instead of repeating the name on every row.
+    """
+
+    __tablename__ = "log_services"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(100), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_log_services_project_id_name"),
+    )
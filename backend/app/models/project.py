@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, JSON
 from sqlalchemy.sql import func
 
 from app.models.base import Base
 
 
+PROJECT_ACTIVE = "active"
+# Deleted by the API: ingest and dashboard access are refused while
+# ``python -m app.workers.project_purger`` removes its data in batches.
+PROJECT_DELETING = "deleting"
+
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -15,4 +21,21 @@ class Project(Base):
     api_key = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     isAllowed = Column(Boolean, default=False, nullable=False)
+
+    # Per-project meta limits; NULL falls back to the settings defaults.
+    meta_max_bytes = Column(Integer, nullable=True)
+    meta_overflow_policy = Column(String(10), nullable=True)
+    meta_compress_min_bytes = Column(Integer, nullable=True)
+    # Meta keys (dotted paths) copied into ``log_meta_index`` at ingest.
+    promoted_meta_keys = Column(JSON, nullable=True)
+    # Ingest sampling rules (``app.services.sampling``), checked in order.
+    sampling_rules = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    status = Column(String(10), nullable=False, default=PROJECT_ACTIVE, server_default=PROJECT_ACTIVE)
+    deletion_requested_at = Column(DateTime(timezone=True), nullable=True)
+    # Logs removed so far by the purge.
+    purged_logs = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # Bumped whenever stored logs are deleted or rewritten
+    # (``app.services.dashboard_cache.bump_logs_version``).
+    logs_version = Column(BigInteger, nullable=False, default=0, server_default="0")
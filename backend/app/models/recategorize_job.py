@@ -0,0 +1,54 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    Index,
+)
+from app.models.base import Base
+
+
+class RecategorizeJob(Base):
+    """
+    Backfill re-evaluating a project's logs in a time range against its
+    current category rules, run by ``python -m app.workers.recategorizer``.
+
+    Logs are walked in ``(timestamp, id)`` order; the position of the last
+    committed chunk is kept in ``cursor_ts`` / ``cursor_id``, so a stopped,
+    failed or cancelled job resumes where it left off.
+    """
+
+    __tablename__ = "recategorize_jobs"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+
+    # "pending" | "running" | "done" | "failed" | "cancelled"
+    status = Column(String(10), nullable=False, default="pending")
+
+    # Requested range; NULL bounds are fixed when the job starts (oldest
+    # log, start time), so logs ingested meanwhile do not extend it.
+    from_ts = Column(DateTime(timezone=True), nullable=True)
+    to_ts = Column(DateTime(timezone=True), nullable=True)
+
+    cursor_ts = Column(DateTime(timezone=True), nullable=True)
+    cursor_id = Column(Integer, nullable=True)
+
+    # Logs in the range by the hourly dimension counts, for progress.
+    total_estimate = Column(BigInteger, nullable=True)
+    scanned = Column(BigInteger, nullable=False, default=0)
+    updated = Column(BigInteger, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_recategorize_jobs_status_id", "status", "id"),
+        Index("ix_recategorize_jobs_project_id_id", "project_id", "id"),
+    )
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, Field, model_validator
+
+
+class AlertSinkConfig(BaseModel):
+    type: Literal["store", "webhook", "log"] = Field(..., examples=["webhook"])
+    url: str | None = Field(None, examples=["https://hooks.example.com/alerts"])
+
+    @model_validator(mode="after")
+    def _check_url(self):
+        if self.type == "webhook" and not self.url:
+            raise ValueError("webhook sinks need a url")
+        return self
+
+    def as_config(self) -> dict:
+        return self.model_dump(exclude_none=True)
+
+
+class AlertRuleCreateRequest(BaseModel):
+    name: str = Field(..., max_length=100, examples=["Error spike"])
+    kind: Literal["threshold", "absence"] = "threshold"
+    level: str | None = Field(None, max_length=10, examples=["ERROR"])
+    category: str | None = Field(None, max_length=100)
+    service: str | None = Field(None, max_length=100, examples=["billing"])
+    pattern: str | None = Field(None, max_length=255, examples=["timeout"])
+    threshold: int = Field(1, ge=1)
+    window_seconds: int = Field(300, ge=10, le=86400)
+    cooldown_seconds: int = Field(300, ge=0, le=86400)
+    sinks: list[AlertSinkConfig] | None = None
+    enabled: bool = True
+
+
+class AlertRuleUpdateRequest(BaseModel):
+    name: str | None = Field(None, max_length=100)
+    level: str | None = Field(None, max_length=10)
+    category: str | None = Field(None, max_length=100)
+    service: str | None = Field(None, max_length=100)
+    pattern: str | None = Field(None, max_length=255)
+    threshold: int | None = Field(None, ge=1)
+    window_seconds: int | None = Field(None, ge=10, le=86400)
+    cooldown_seconds: int | None = Field(None, ge=0, le=86400)
+    sinks: list[AlertSinkConfig] | None = None
+    enabled: bool | None = None
+
+
+class AlertRuleResponse(BaseModel):
+    id: int
+    name: str
+    kind: str
+    level: str | None
+    category: str | None
+    service: str | None
+    pattern: str | None
+    threshold: int
+    window_seconds: int
+    cooldown_seconds: int
+    sinks: list[dict] | None
+    enabled: bool
+    last_triggered_at: datetime | None
+    created_at: datetime | None
+
+
+class AlertResponse(BaseModel):
+    id: int
+    rule_id: int
+    value: int
+    message: str
+    triggered_at: datetime
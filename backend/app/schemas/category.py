@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Annotated, Literal
+from pydantic import BaseModel, Field, StringConstraints, model_validator
+
+
+Keyword = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+Level = Literal["TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL"]
+
+
+class CategoryCreateRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100, examples=["PAYMENTS"])
+    # Case-insensitive message substrings; omitted means the name itself,
+    # an empty list matches no logs.
+    keywords: list[Keyword] | None = Field(None, max_length=50, examples=[["payment", "invoice"]])
+    levels: list[Level] | None = Field(None, examples=[["WARN", "ERROR"]])
+
+
+class CategoryUpdateRequest(BaseModel):
+    name: str | None = Field(None, min_length=1, max_length=100)
+    keywords: list[Keyword] | None = Field(None, max_length=50)
+    levels: list[Level] | None = None
+
+
+class CategoryResponse(BaseModel):
+    id: int
+    name: str
+    is_system: bool
+    keywords: list[str] | None
+    levels: list[str] | None
+    created_at: datetime | None
+
+
+class RecategorizeRequest(BaseModel):
+    # Logs with from_ts <= timestamp < to_ts; open bounds mean the oldest
+    # log and the time the job starts.
+    from_ts: datetime | None = None
+    to_ts: datetime | None = None
+
+    @model_validator(mode="after")
+    def _check_range(self):
+        if self.from_ts and self.to_ts and self.from_ts >= self.to_ts:
+            raise ValueError("from_ts must be before to_ts")
+        return self
+
+
+class RecategorizeJobResponse(BaseModel):
+    id: int
+    status: str
+    from_ts: datetime | None
+    to_ts: datetime | None
+    cursor_ts: datetime | None
+    scanned: int
+    updated: int
+    total_estimate: int | None
+    # Fraction of ``total_estimate`` scanned; 1.0 once done.
+    progress: float | None = None
+    last_error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    updated_at: datetime | None
+    finished_at: datetime | None
@@ -6,3 +6,5 @@ class LogIngestRequest(BaseModel):
     service: Optional[str] = Field(None, examples=["auth-service"])
     environment: Optional[str] = Field(None, examples=["production"])
     logs: List[LogItem] = Field(..., min_items=1)
+    # Same id on a retry: the batch is acknowledged again, not written twice.
+    batch_id: Optional[str] = Field(None, max_length=128, examples=["3f9c2a7e-5b1d-4e8a-9c60-2d4b7f1e0a35"])
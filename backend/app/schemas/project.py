@@ -1,5 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr
+from typing import Annotated, Literal
+from pydantic import BaseModel, Field, EmailStr, StringConstraints
 
 
 class ProjectCreateRequest(BaseModel):
@@ -10,12 +11,34 @@ class ProjectCreateRequest(BaseModel):
     password: str = Field(..., min_length=6, examples=["strong-password"])
 
 
+class SamplingRuleSchema(BaseModel):
+    rate: float = Field(..., gt=0, le=1, examples=[0.1])
+    service: str | None = Field(None, max_length=100, examples=["gateway"])
+    max_level: Literal["TRACE", "DEBUG", "INFO", "WARN"] = "INFO"
+    mode: Literal["hash", "random"] = "hash"
+
+
 class ProjectUpdateRequest(BaseModel):
     name: str | None = None
     username: str | None = None
     email: EmailStr | None = None
     phone: str | None = None
     isAllowed: bool
+    meta_max_bytes: int | None = Field(None, ge=0)
+    meta_overflow_policy: Literal["truncate", "reject"] | None = None
+    meta_compress_min_bytes: int | None = Field(
+        None,
+        ge=0,
+        description=(
+            "Meta blobs at least this large are stored compressed. Compressed meta "
+            "is searched through its first 200 characters only and matched by meta "
+            "filters only on promoted_meta_keys."
+        ),
+    )
+    promoted_meta_keys: list[
+        Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9_\-]+(\.[A-Za-z0-9_\-]+)*$", max_length=100)]
+    ] | None = Field(None, max_length=20, examples=[["request_id", "user_id"]])
+    sampling_rules: list[SamplingRuleSchema] | None = Field(None, max_length=20)
 
 
 class ProjectResponse(BaseModel):
@@ -27,6 +50,20 @@ class ProjectResponse(BaseModel):
     api_key: str
     created_at: datetime
     isAllowed: bool
+    meta_max_bytes: int | None = None
+    meta_overflow_policy: str | None = None
+    meta_compress_min_bytes: int | None = None
+    promoted_meta_keys: list[str] | None = None
+    sampling_rules: list[SamplingRuleSchema] | None = None
+    status: str = "active"
+
+
+class ProjectDeletionResponse(BaseModel):
+    project_id: int
+    status: str
+    deletion_requested_at: datetime | None = None
+    purged_logs: int = 0
+    remaining_logs_estimate: int | None = None
 
 
 class ProjectLoginRequest(BaseModel):
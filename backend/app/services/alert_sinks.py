@@ -0,0 +1,111 @@
+"""
+Notification targets for fired alerts.
+
+A rule lists its sinks as ``{"type": ..., **options}``; new sink types are
+added with ``register_sink``. Sinks run on the alert dispatcher threads,
+never on the ingest path.
+"""
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import requests
+
+from app.database import new_session
+from app.models.alert import Alert
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    rule_id: int
+    rule_name: str
+    project_id: int
+    kind: str
+    value: int
+    threshold: int
+    window_seconds: int
+    triggered_at: datetime
+    message: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["triggered_at"] = self.triggered_at.isoformat()
+        return data
+
+
+class AlertSink:
+    def send(self, event: AlertEvent) -> None:
+        raise NotImplementedError
+
+
+class StoreSink(AlertSink):
+    """
+    Records the alert in the ``alerts`` table (``GET /api/v1/alerts``).
+    """
+
+    def send(self, event: AlertEvent) -> None:
+        db = new_session()
+        try:
+            db.add(Alert(
+                project_id=event.project_id,
+                rule_id=event.rule_id,
+                value=event.value,
+                message=event.message,
+                triggered_at=event.triggered_at,
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+
+class WebhookSink(AlertSink):
+    """
+    POSTs the alert as JSON to ``url``.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event: AlertEvent) -> None:
+        response = requests.post(self.url, json=event.as_dict(), timeout=self.timeout)
+        response.raise_for_status()
+
+
+class LogSink(AlertSink):
+    def send(self, event: AlertEvent) -> None:
+        logger.warning("ALERT [%s] project=%s: %s", event.rule_name, event.project_id, event.message)
+
+
+class MemorySink(AlertSink):
+    """
+    Keeps events in memory; a local stand-in for real sinks in tests.
+    """
+
+    events: List[AlertEvent] = []
+
+    def send(self, event: AlertEvent) -> None:
+        MemorySink.events.append(event)
+
+
+SINKS: Dict[str, Callable[..., AlertSink]] = {
+    "store": StoreSink,
+    "webhook": WebhookSink,
+    "log": LogSink,
+    "memory": MemorySink,
+}
+
+DEFAULT_SINKS = ({"type": "store"},)
+
+
+def register_sink(name: str, factory: Callable[..., AlertSink]) -> None:
+    SINKS[name] = factory
+
+
+def build_sink(config: Dict[str, Any]) -> AlertSink:
+    options = dict(config)
+    sink_type = options.pop("type")
+    return SINKS[sink_type](**options)
@@ -0,0 +1,392 @@
+"""
+Alert rules evaluated on the ingest stream.
+
+Every ingested batch is matched against the project's (cached) rules and
+added to per-rule sliding-window counters in memory, so evaluation costs no
+queries. When a threshold is crossed the alert is handed to a small thread
+pool, which claims it on the rule row (``last_triggered_at`` + cooldown,
+a single conditional UPDATE, so several processes fire once) and notifies
+the rule's sinks.
+
+Counters are per process: with several ingest processes a threshold is
+reached per process. Absence rules are checked periodically by
+``AbsenceMonitor``, which confirms a suspected absence with one query
+before firing.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.core.severity import severity_of
+from app.core.sliding_window import SlidingWindowCounter
+from app.database import new_session
+from app.models.alert_rule import AlertRule
+from app.models.log_category import LogCategory
+from app.models.log_entry import LogEntry
+from app.models.log_service import LogService
+from app.models.project import PROJECT_ACTIVE, Project
+from app.services.alert_sinks import DEFAULT_SINKS, AlertEvent, build_sink
+from app.services.category_cache import CategorySnapshot
+
+logger = logging.getLogger(__name__)
+
+KIND_THRESHOLD = "threshold"
+KIND_ABSENCE = "absence"
+
+
+@dataclass(frozen=True)
+class AlertRuleSnapshot:
+    id: int
+    project_id: int
+    name: str
+    kind: str
+    level: Optional[str]
+    category: Optional[str]
+    service: Optional[str]
+    pattern: Optional[str]  # lower-cased
+    threshold: int
+    window_seconds: int
+    cooldown_seconds: int
+    sinks: Tuple[Dict[str, Any], ...]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, rule: AlertRule) -> "AlertRuleSnapshot":
+        return cls(
+            id=rule.id,
+            project_id=rule.project_id,
+            name=rule.name,
+            kind=rule.kind,
+            level=rule.level.upper() if rule.level else None,
+            category=rule.category,
+            service=rule.service,
+            pattern=rule.pattern.lower() if rule.pattern else None,
+            threshold=rule.threshold,
+            window_seconds=rule.window_seconds,
+            cooldown_seconds=rule.cooldown_seconds,
+            sinks=tuple(rule.sinks or DEFAULT_SINKS),
+            created_at=rule.created_at,
+        )
+
+    def matches(self, log: Dict[str, Any], category_name: Optional[str]) -> bool:
+        if self.level and log["level"] != self.level:
+            return False
+        if self.service and log.get("service") != self.service:
+            return False
+        if self.category and category_name != self.category:
+            return False
+        if self.pattern and self.pattern not in log["message"].lower():
+            return False
+        return True
+
+
+# ---- Rule cache ----
+
+_rule_cache: Optional[TTLCache] = None
+
+
+def alert_rule_cache() -> TTLCache:
+    global _rule_cache
+    if _rule_cache is None:
+        settings = get_settings()
+        # One entry per project, like the API key cache.
+        _rule_cache = TTLCache(
+            maxsize=settings.api_key_cache_size,
+            ttl=settings.alert_rule_cache_ttl_seconds,
+            name="alert_rules",
+        )
+    return _rule_cache
+
+
+def get_project_rules(db: Session, project_id: int) -> List[AlertRuleSnapshot]:
+    cache = alert_rule_cache()
+
+    rules = cache.get(project_id)
+    if rules is not None:
+        return rules
+
+    rules = [
+        AlertRuleSnapshot.from_model(rule)
+        for rule in (
+            db.query(AlertRule)
+            .filter(AlertRule.project_id == project_id, AlertRule.enabled.is_(True))
+            .all()
+        )
+    ]
+    cache.set(project_id, rules)
+    return rules
+
+
+def invalidate_project_rules(project_id: int) -> None:
+    alert_rule_cache().pop(project_id)
+
+
+# ---- Stream evaluation ----
+
+class AlertEngine:
+    def __init__(self) -> None:
+        self._counters: Dict[Tuple[int, int], SlidingWindowCounter] = {}
+        self._last_seen: Dict[int, float] = {}
+        self._fired_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def _counter(self, rule: AlertRuleSnapshot) -> SlidingWindowCounter:
+        key = (rule.id, rule.window_seconds)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = SlidingWindowCounter(rule.window_seconds)
+        return counter
+
+    def observe(
+        self,
+        rules: Iterable[AlertRuleSnapshot],
+        logs: List[Dict[str, Any]],
+        category_names: Dict[int, str],
+        now: float,
+    ) -> List[Tuple[AlertRuleSnapshot, int]]:
+        """
+        Counts matching logs per rule. Returns the threshold rules whose
+        window count has reached their threshold, with that count. A rule
+        is returned at most once per cooldown, so a sustained spike does
+        not turn every batch into a claim query.
+        """
+        triggered = []
+        for rule in rules:
+            matched = sum(
+                1 for log in logs
+                if rule.matches(log, category_names.get(log.get("category_id")))
+            )
+            if not matched:
+                continue
+
+            with self._lock:
+                if rule.kind == KIND_ABSENCE:
+                    self._last_seen[rule.id] = now
+                    continue
+                total = self._counter(rule).add(matched, now)
+                if total < rule.threshold:
+                    continue
+                fired_at = self._fired_at.get(rule.id)
+                if fired_at is not None and now - fired_at < rule.cooldown_seconds:
+                    continue
+                self._fired_at[rule.id] = now
+
+            triggered.append((rule, total))
+        return triggered
+
+    def last_seen(self, rule_id: int) -> Optional[float]:
+        return self._last_seen.get(rule_id)
+
+
+_engine = AlertEngine()
+
+
+def evaluate_alerts(
+    db: Session,
+    project_id: int,
+    logs: List[Dict[str, Any]],
+    categories: List[CategorySnapshot],
+) -> None:
+    """
+    Feeds an ingested batch (rows with ``category_id`` resolved) to the
+    alert engine. No queries once the project's rules are cached.
+    """
+    rules = get_project_rules(db, project_id)
+    if not rules:
+        return
+
+    now = datetime.now(timezone.utc)
+    category_names = {category.id: category.name for category in categories}
+
+    for rule, value in _engine.observe(rules, logs, category_names, now.timestamp()):
+        dispatch(
+            rule,
+            value,
+            f"{value} matching logs in the last {rule.window_seconds}s "
+            f"(threshold {rule.threshold})",
+        )
+
+
+# ---- Dispatch ----
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def _dispatcher() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().alert_dispatch_workers,
+                    thread_name_prefix="alerts",
+                )
+    return _executor
+
+
+def dispatch(rule: AlertRuleSnapshot, value: int, message: str) -> None:
+    future = _dispatcher().submit(fire_alert, rule, value, message)
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+
+
+def drain_dispatcher(timeout: Optional[float] = None) -> None:
+    """
+    Waits for queued notifications, e.g. on shutdown.
+    """
+    wait(list(_pending), timeout=timeout)
+
+
+def claim_rule(db: Session, rule: AlertRuleSnapshot, now: datetime) -> bool:
+    """
+    Marks the rule as fired unless it fired within its cooldown.
+    Returns False when another process (or an earlier batch) got there first.
+    """
+    result = db.execute(
+        update(AlertRule)
+        .where(
+            AlertRule.id == rule.id,
+            or_(
+                AlertRule.last_triggered_at.is_(None),
+                AlertRule.last_triggered_at <= now - timedelta(seconds=rule.cooldown_seconds),
+            ),
+        )
+        .values(last_triggered_at=now)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def fire_alert(rule: AlertRuleSnapshot, value: int, message: str) -> bool:
+    now = datetime.now(timezone.utc)
+
+    db = new_session()
+    try:
+        if not claim_rule(db, rule, now):
+            return False
+    finally:
+        db.close()
+
+    event = AlertEvent(
+        rule_id=rule.id,
+        rule_name=rule.name,
+        project_id=rule.project_id,
+        kind=rule.kind,
+        value=value,
+        threshold=rule.threshold,
+        window_seconds=rule.window_seconds,
+        triggered_at=now,
+        message=message,
+    )
+    for config in rule.sinks:
+        try:
+            build_sink(config).send(event)
+        except Exception:
+            logger.exception("Alert sink %s failed for rule %s", config.get("type"), rule.id)
+    return True
+
+
+# ---- Absence rules ----
+
+def log_seen_since(db: Session, rule: AlertRuleSnapshot, since: datetime) -> bool:
+    query = db.query(LogEntry.id).filter(
+        LogEntry.project_id == rule.project_id,
+        LogEntry.created_at >= since,
+    )
+    if rule.level:
+        query = query.filter(LogEntry.severity == severity_of(rule.level))
+    if rule.service:
+        query = query.filter(
+            LogEntry.service_id == (
+                select(LogService.id)
+                .where(LogService.project_id == rule.project_id, LogService.name == rule.service)
+                .scalar_subquery()
+            )
+        )
+    if rule.pattern:
+        query = query.filter(LogEntry.message.ilike(f"%{rule.pattern}%"))
+    if rule.category:
+        query = (
+            query.join(LogCategory, LogEntry.category_id == LogCategory.id)
+            .filter(LogCategory.name == rule.category)
+        )
+    return query.first() is not None
+
+
+def check_absence_rules(db: Session) -> int:
+    """
+    Fires absence rules that saw no matching log for a full window.
+    Returns the number of alerts dispatched.
+    """
+    now = datetime.now(timezone.utc)
+    fired = 0
+
+    rules = (
+        db.query(AlertRule)
+        .join(Project, Project.id == AlertRule.project_id)
+        .filter(
+            AlertRule.kind == KIND_ABSENCE,
+            AlertRule.enabled.is_(True),
+            Project.status == PROJECT_ACTIVE,
+        )
+        .all()
+    )
+    for rule in map(AlertRuleSnapshot.from_model, rules):
+        since = now - timedelta(seconds=rule.window_seconds)
+
+        created_at = rule.created_at
+        if created_at is not None and created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if created_at is not None and created_at > since:
+            continue  # younger than one window
+
+        last_seen = _engine.last_seen(rule.id)
+        if last_seen is not None and last_seen >= since.timestamp():
+            continue
+        # Nothing seen here; other processes may have ingested it.
+        if log_seen_since(db, rule, since):
+            continue
+
+        dispatch(rule, 0, f"No matching logs in the last {rule.window_seconds}s")
+        fired += 1
+
+    return fired
+
+
+class AbsenceMonitor:
+    """
+    Background thread running ``check_absence_rules`` every
+    ``ALERT_CHECK_INTERVAL_SECONDS``.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="alert-absence", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = new_session()
+            try:
+                check_absence_rules(db)
+            except Exception:
+                logger.exception("Absence rule check failed")
+            finally:
+                db.close()
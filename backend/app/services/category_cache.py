@@ -0,0 +1,110 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.core.metrics import INGEST_STAGE_SECONDS
+from app.core.severity import normalize_level
+from app.models.log_category import LogCategory
+from app.services.category_seeder import SYSTEM_CATEGORIES, seed_system_categories
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    id: int
+    name: str
+    is_system: bool
+    # Lowercased message keywords and level names of the category rule;
+    # ``levels`` is None for any level.
+    keywords: Tuple[str, ...] = ()
+    levels: Optional[FrozenSet[str]] = None
+
+
+_category_cache: Optional[TTLCache] = None
+
+
+def category_cache() -> TTLCache:
+    global _category_cache
+    if _category_cache is None:
+        settings = get_settings()
+        _category_cache = TTLCache(
+            maxsize=settings.category_cache_size,
+            ttl=settings.category_cache_ttl_seconds,
+            name="categories",
+        )
+    return _category_cache
+
+
+def _snapshot(category: LogCategory) -> CategorySnapshot:
+    keywords = category.keywords if category.keywords is not None else [category.name]
+    return CategorySnapshot(
+        id=category.id,
+        name=category.name,
+        is_system=bool(category.is_system),
+        keywords=tuple(keyword.lower() for keyword in keywords),
+        levels=frozenset(normalize_level(level) for level in category.levels) if category.levels else None,
+    )
+
+
+def load_project_categories(db: Session, project_id: int) -> List[CategorySnapshot]:
+    """
+    Reads a project's categories, in rule order, past the cache.
+    """
+    return [
+        _snapshot(category)
+        for category in (
+            db.query(LogCategory)
+            .filter(LogCategory.project_id == project_id)
+            .order_by(LogCategory.id)
+            .all()
+        )
+    ]
+
+
+def get_project_categories(db: Session, project_id: int) -> List[CategorySnapshot]:
+    """
+    Returns the categories of a project, seeding the system categories
+    on first use. Cached, so a warm ingest path makes no category queries.
+    """
+    cache = category_cache()
+
+    categories = cache.get(project_id)
+    if categories is not None:
+        return categories
+
+    with INGEST_STAGE_SECONDS.time(stage="seed_system_categories"):
+        seed_system_categories(db, project_id)
+
+    categories = load_project_categories(db, project_id)
+
+    cache.set(project_id, categories)
+    return categories
+
+
+def invalidate_project_categories(project_id: int) -> None:
+    category_cache().pop(project_id)
+
+
+def warm_category_cache(db: Session) -> int:
+    """
+    Loads the categories of all projects in a single query. Projects that
+    are still missing system categories are left to be seeded lazily.
+    """
+    cache = category_cache()
+
+    by_project = defaultdict(list)
+    for category in db.query(LogCategory).order_by(LogCategory.id).all():
+        by_project[category.project_id].append(_snapshot(category))
+
+    warmed = 0
+    for project_id, categories in by_project.items():
+        system_names = {c.name for c in categories if c.is_system}
+        if not all(name in system_names for name in SYSTEM_CATEGORIES):
+            continue
+        cache.set(project_id, categories)
+        warmed += 1
+
+    return warmed
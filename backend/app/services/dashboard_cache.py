@@ -0,0 +1,179 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.log_entry import LogEntry
+from app.models.project import Project
+
+
+Watermark = Tuple[int, int]
+
+_dashboard_cache: Optional[TTLCache] = None
+
+# Striped locks for collapsing concurrent misses on the same page.
+_key_locks = [threading.Lock() for _ in range(64)]
+
+
+def dashboard_cache() -> TTLCache:
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        settings = get_settings()
+        _dashboard_cache = TTLCache(
+            maxsize=settings.dashboard_cache_size,
+            ttl=settings.dashboard_cache_ttl_seconds,
+            name="dashboard",
+        )
+    return _dashboard_cache
+
+
+def project_watermark(db: Session, project_id: int) -> Watermark:
+    """
+    Changes whenever logs are added to, changed in or deleted from a
+    project: the newest log id (a single probe of the ``(project_id, id)``
+    index) moves with every insert, and ``projects.logs_version`` with every
+    other change. Both live in the database and are read in one statement,
+    so every process sees the writes of every other one (API, queue
+    workers, spool replayer, recategorizer, purger).
+
+    Inserts do not bump the version, which would make every ingest
+    transaction update the project row. An insert that commits after one
+    with a higher id was already seen leaves the newest id unchanged, so
+    pages cached meanwhile can miss it until they expire, after
+    ``DASHBOARD_CACHE_TTL_SECONDS``.
+    """
+    newest_id = (
+        select(func.max(LogEntry.id))
+        .where(LogEntry.project_id == project_id)
+        .scalar_subquery()
+    )
+    row = db.query(newest_id, Project.logs_version).filter(Project.id == project_id).first()
+    if row is None:
+        return 0, 0
+    return row[0] or 0, row[1] or 0
+
+
+def bump_logs_version(db: Session, project_id: int) -> None:
+    """
+    Records, in the caller's transaction, that a project's stored logs were
+    deleted or rewritten. Inserts need no bump: they move the newest id.
+    """
+    (
+        db.query(Project)
+        .filter(Project.id == project_id)
+        .update({Project.logs_version: Project.logs_version + 1}, synchronize_session=False)
+    )
+
+
+def invalidate_project_logs(project_id: int) -> None:
+    """
+    Drops this process's cached pages of a project right away, after a
+    committed ``bump_logs_version``. Other processes notice the new version
+    on their next watermark check.
+    """
+    dashboard_cache().discard_where(lambda key, _: key[0] == project_id)
+
+
+def _normalize_ts(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat()
+
+
+def cache_key(project_id: int, **params: Any) -> Hashable:
+    """
+    Normalized filter set: equivalent requests (the same instant in
+    another timezone, parameter order) share one entry. Level filters
+    arrive already parsed, so ``level=error`` and ``level=ERROR`` match.
+    """
+    normalized = []
+    for name, value in sorted(params.items()):
+        if isinstance(value, datetime):
+            value = _normalize_ts(value)
+        elif isinstance(value, str):
+            value = value or None
+        normalized.append((name, value))
+    return (project_id, tuple(normalized))
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    watermark: Watermark
+    body: bytes
+    etag: str
+    created: float
+    # How the page was computed, for the ``X-Query-Plan`` header.
+    plan: Optional[str] = None
+
+
+def _key_lock(key: Hashable) -> threading.Lock:
+    return _key_locks[hash(key) % len(_key_locks)]
+
+
+def cached_page(
+    db: Session,
+    project_id: int,
+    key: Hashable,
+    compute: Callable[[], Tuple[bytes, Optional[str]]],
+) -> CachedPage:
+    """
+    Returns the dashboard page for ``key``, computing it at most once per
+    change of the project's watermark.
+
+    Pages younger than ``DASHBOARD_CACHE_FRESH_SECONDS`` are served without
+    even checking the watermark, so a crowd of viewers refreshing during
+    steady ingest costs one query set per filter combination per window.
+    Concurrent misses for the same key wait for a single computation.
+    ``compute`` returns the page body and a description of its query plan.
+    """
+    settings = get_settings()
+    cache = dashboard_cache()
+
+    page = cache.get(key)
+    if page is not None and time.monotonic() - page.created < settings.dashboard_cache_fresh_seconds:
+        return page
+
+    watermark = project_watermark(db, project_id)
+    if page is not None and page.watermark == watermark:
+        return page
+
+    with _key_lock(key):
+        page = cache.get(key)
+        if page is not None and (
+            page.watermark == watermark
+            or time.monotonic() - page.created < settings.dashboard_cache_fresh_seconds
+        ):
+            return page
+
+        body, plan = compute()
+        page = CachedPage(
+            watermark=watermark,
+            body=body,
+            etag=make_etag(body),
+            created=time.monotonic(),
+            plan=plan,
+        )
+        cache.set(key, page)
+        return page
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
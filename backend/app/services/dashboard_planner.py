@@ -0,0 +1,385 @@
+"""
+Execution strategies for the dashboard listing.
+
+``ORDER BY timestamp DESC LIMIT n`` over a large project makes the database
+walk or sort far more rows than the page needs, and ``count(*)`` reads all
+of them. The planner picks one of:
+
+- ``range``: ``from`` is set, so the time range already bounds the work.
+- ``direct``: the project is small; the query runs as written.
+- ``filter_first``: meta filters, which are index-backed and usually narrow,
+  are evaluated into a materialized set before sorting.
+- ``window``: "latest N" over a large project. Lower timestamp bounds are
+  probed from narrow to wide until one holds a full page. The first bound
+  comes from the hourly ``log_dimensions`` counts, so one probe is usually
+  enough; the total is estimated from the same counts or capped.
+- ``sliced``: text searches over many logs, which no index can narrow. The
+  range is cut into time slices of similar log counts, queried newest first
+  on a small thread pool until the page is filled (``run_sliced_query``).
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.config import get_settings
+from app.core.severity import SeverityRange
+from app.database import new_session
+from app.models.log_dimension import LogDimension
+from app.models.log_entry import LogEntry
+from app.services.category_cache import get_project_categories
+from app.services.log_dimensions import hour_bucket
+from app.services.meta_filters import MetaFilter
+
+
+PLAN_RANGE = "range"
+PLAN_DIRECT = "direct"
+PLAN_FILTER_FIRST = "filter_first"
+PLAN_WINDOW = "window"
+PLAN_SLICED = "sliced"
+
+# Widening steps after the bound derived from the dimension counts.
+WINDOWS: Tuple[Tuple[str, timedelta], ...] = (
+    ("5m", timedelta(minutes=5)),
+    ("1h", timedelta(hours=1)),
+    ("1d", timedelta(days=1)),
+    ("7d", timedelta(days=7)),
+    ("30d", timedelta(days=30)),
+)
+
+# Newest bucket first.
+BucketCounts = List[Tuple[datetime, int]]
+
+# (lower, upper, logs): ``lower <= timestamp < upper``; None is open.
+TimeSlice = Tuple[Optional[datetime], Optional[datetime], int]
+
+
+@dataclass
+class DashboardResult:
+    rows: List[Any]
+    total: int
+    total_estimated: bool
+    plan: str
+
+
+def bucket_counts(
+    db: Session,
+    project_id: int,
+    dimension: str = "level",
+    value: Union[str, Sequence[str], None] = None,
+    to_ts: Optional[datetime] = None,
+) -> BucketCounts:
+    """
+    Hourly log counts of a project, newest first. Without ``value`` every
+    value of ``dimension`` is summed, which for ``level`` counts all logs;
+    a list of values sums those.
+    """
+    query = (
+        db.query(LogDimension.bucket, func.sum(LogDimension.count))
+        .filter(
+            LogDimension.project_id == project_id,
+            LogDimension.dimension == dimension,
+        )
+    )
+    if isinstance(value, str):
+        query = query.filter(LogDimension.value == value)
+    elif value is not None:
+        query = query.filter(LogDimension.value.in_(value))
+    if to_ts:
+        query = query.filter(LogDimension.bucket <= hour_bucket(to_ts))
+
+    rows = query.group_by(LogDimension.bucket).order_by(LogDimension.bucket.desc()).all()
+    return [(bucket, int(count)) for bucket, count in rows]
+
+
+def newest_bound(counts: BucketCounts, needed: int) -> Optional[datetime]:
+    """
+    Start of the newest hour from which on at least ``needed`` logs exist,
+    or None if there are not that many.
+    """
+    seen = 0
+    for bucket, count in counts:
+        seen += count
+        if seen >= needed:
+            if bucket.tzinfo is None:
+                bucket = bucket.replace(tzinfo=timezone.utc)
+            return bucket
+    return None
+
+
+def _dimension_filters(
+    db: Session,
+    project_id: int,
+    level: Optional[SeverityRange],
+    service: Optional[str],
+    category: Optional[str],
+) -> List[Tuple[str, Union[str, List[str]]]]:
+    filters: List[Tuple[str, Union[str, List[str]]]] = []
+    if level:
+        filters.append(("level", level.levels()))
+    if service:
+        filters.append(("service", service))
+    if category:
+        ids = [c.id for c in get_project_categories(db, project_id) if c.name == category]
+        # An unknown name matches nothing; -1 never occurs as a category id.
+        filters.append(("category", str(ids[0] if ids else -1)))
+    return filters
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def time_slices(counts: BucketCounts, slices: int) -> List[TimeSlice]:
+    """
+    Cuts the hours of ``counts`` into at most ``slices`` hour-aligned slices
+    holding similar numbers of logs, newest first. The newest slice is open
+    upwards and the oldest downwards, so together they cover every log;
+    range filters are applied to each slice query anyway.
+    """
+    total = sum(count for _, count in counts)
+    target = max(total / slices, 1)
+
+    result: List[TimeSlice] = []
+    upper: Optional[datetime] = None
+    in_slice = 0
+    for index, (bucket, count) in enumerate(counts):
+        in_slice += count
+        last = index == len(counts) - 1
+        if not last and len(result) < slices - 1 and in_slice >= target:
+            lower = _utc(bucket)
+            result.append((lower, upper, in_slice))
+            upper, in_slice = lower, 0
+    result.append((None, upper, in_slice))
+    return result
+
+
+_slice_executor: Optional[ThreadPoolExecutor] = None
+_slice_executor_lock = threading.Lock()
+
+
+def _slice_pool() -> ThreadPoolExecutor:
+    global _slice_executor
+    if _slice_executor is None:
+        with _slice_executor_lock:
+            if _slice_executor is None:
+                _slice_executor = ThreadPoolExecutor(
+                    max_workers=get_settings().search_parallelism,
+                    thread_name_prefix="search-slices",
+                )
+    return _slice_executor
+
+
+def _slice_rows(
+    columns: Sequence[Any],
+    apply_filters: Callable[[Query], Query],
+    lower: Optional[datetime],
+    upper: Optional[datetime],
+    limit: int,
+) -> List[Any]:
+    # Own session, hence own connection: slices run side by side.
+    db = new_session()
+    try:
+        query = apply_filters(db.query(*columns))
+        if lower is not None:
+            query = query.filter(LogEntry.timestamp >= lower)
+        if upper is not None:
+            query = query.filter(LogEntry.timestamp < upper)
+        return query.order_by(LogEntry.timestamp.desc(), LogEntry.id.desc()).limit(limit).all()
+    finally:
+        db.close()
+
+
+def run_sliced_query(
+    db: Session,
+    project_id: int,
+    columns: Sequence[Any],
+    apply_filters: Callable[[Query], Query],
+    limit: int,
+    offset: int,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+) -> Optional[DashboardResult]:
+    """
+    Runs a page as parallel time slices, newest first: at most
+    ``SEARCH_PARALLELISM`` slice queries are in flight, each limited to the
+    rows still missing. Slices are disjoint in time, so the page is their
+    results in slice order, and once the finished newest slices hold
+    ``offset + limit`` rows, older slices cannot change it and are skipped.
+
+    The total is exact when every slice was read in full; otherwise it is
+    extrapolated from the scanned slices' share of the range's logs.
+    Returns None when the range holds too few logs to be worth slicing.
+    """
+    settings = get_settings()
+    if settings.search_parallelism < 2 or settings.search_slices < 2:
+        return None
+
+    counts = bucket_counts(db, project_id, to_ts=to_ts)
+    if from_ts:
+        first = hour_bucket(from_ts)
+        counts = [(bucket, count) for bucket, count in counts if _utc(bucket) >= first]
+    range_total = sum(count for _, count in counts)
+    if range_total <= settings.dashboard_direct_max_rows:
+        return None
+
+    slices = time_slices(counts, settings.search_slices)
+    needed = offset + limit
+    pool = _slice_pool()
+
+    pending: Dict[int, Tuple[Future, int]] = {}
+    rows: List[Any] = []
+    submitted = scanned = 0
+    complete = True
+    scanned_logs = 0
+    try:
+        while scanned < len(slices) and len(rows) < needed:
+            while submitted < len(slices) and submitted - scanned < settings.search_parallelism:
+                lower, upper, _ = slices[submitted]
+                slice_limit = needed - len(rows)
+                # A copied context keeps SQL timings attributed to the route.
+                future = pool.submit(
+                    copy_context().run,
+                    _slice_rows, columns, apply_filters, lower, upper, slice_limit,
+                )
+                pending[submitted] = (future, slice_limit)
+                submitted += 1
+
+            future, slice_limit = pending.pop(scanned)
+            slice_rows = future.result()
+            # A full slice may hold more matches than were read.
+            if len(slice_rows) == slice_limit:
+                complete = False
+            rows.extend(slice_rows)
+            scanned_logs += slices[scanned][2]
+            scanned += 1
+    finally:
+        for future, _ in pending.values():
+            future.cancel()
+
+    if complete and scanned == len(slices):
+        total, estimated = len(rows), False
+    else:
+        share = scanned_logs / range_total if range_total else 1
+        total = round(len(rows) / share) if share else len(rows)
+        total, estimated = max(total, len(rows)), True
+
+    return DashboardResult(
+        rows[offset:needed],
+        total,
+        estimated,
+        f"{PLAN_SLICED}:{len(slices)};scanned={scanned}",
+    )
+
+
+def _page(query: Query, limit: int, offset: int) -> List[Any]:
+    return query.order_by(LogEntry.timestamp.desc()).limit(limit).offset(offset).all()
+
+
+def _capped_count(db: Session, query: Query, cap: int) -> Tuple[int, bool]:
+    limited = query.with_entities(LogEntry.id).limit(cap).subquery()
+    count = db.query(func.count()).select_from(limited).scalar()
+    return count, count >= cap
+
+
+def run_dashboard_query(
+    db: Session,
+    project_id: int,
+    columns: Sequence[Any],
+    apply_filters: Callable[[Query], Query],
+    limit: int,
+    offset: int,
+    level: Optional[SeverityRange] = None,
+    service: Optional[str] = None,
+    category: Optional[str] = None,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    search: Optional[str] = None,
+    meta_filters: Sequence[MetaFilter] = (),
+) -> DashboardResult:
+    """
+    Runs one dashboard page with the cheapest applicable plan.
+    ``apply_filters`` adds the full filter set to a query over ``LogEntry``;
+    the remaining arguments only inform the choice of plan.
+    """
+    settings = get_settings()
+    query = apply_filters(db.query(*columns))
+
+    if search and not meta_filters:
+        result = run_sliced_query(
+            db, project_id, columns, apply_filters, limit, offset, from_ts=from_ts, to_ts=to_ts,
+        )
+        if result is not None:
+            return result
+
+    if from_ts:
+        return DashboardResult(_page(query, limit, offset), query.count(), False, PLAN_RANGE)
+
+    project_counts = bucket_counts(db, project_id, to_ts=to_ts)
+    project_total = sum(count for _, count in project_counts)
+    if project_total <= settings.dashboard_direct_max_rows:
+        return DashboardResult(_page(query, limit, offset), query.count(), False, PLAN_DIRECT)
+
+    if meta_filters:
+        matches = apply_filters(db.query(LogEntry.id)).cte("matches")
+        matches = matches.prefix_with("MATERIALIZED", dialect="postgresql")
+        rows = _page(
+            db.query(*columns).join(matches, LogEntry.id == matches.c.id),
+            limit,
+            offset,
+        )
+        total = db.query(func.count()).select_from(matches).scalar()
+        return DashboardResult(rows, total, False, PLAN_FILTER_FIRST)
+
+    # Narrowest known series: the most selective dimension filter, or the
+    # whole project. Its newest hours holding a full page give the first bound.
+    series, series_total = project_counts, project_total
+    filters = _dimension_filters(db, project_id, level, service, category)
+    for dimension, value in filters:
+        counts = bucket_counts(db, project_id, dimension, value, to_ts)
+        total = sum(count for _, count in counts)
+        if total < series_total:
+            series, series_total = counts, total
+
+    bound = newest_bound(series, offset + limit)
+    probes: List[Tuple[str, Optional[datetime]]] = []
+    if bound is not None:
+        anchor = to_ts or datetime.now(timezone.utc)
+        if anchor.tzinfo is None:
+            anchor = anchor.replace(tzinfo=timezone.utc)
+        # Windows reaching past the oldest hour with logs are no better
+        # than the unbounded query.
+        oldest = newest_bound(project_counts, project_total)
+        probes.append(("bucket", bound))
+        probes.extend(
+            (label, anchor - width)
+            for label, width in WINDOWS
+            if oldest < anchor - width < bound
+        )
+    probes.append(("unbounded", None))
+
+    for attempt, (label, lower) in enumerate(probes, start=1):
+        probe = query if lower is None else query.filter(LogEntry.timestamp >= lower)
+        rows = _page(probe, limit, offset)
+        # A full page from [lower, ...) is the same page as without the bound.
+        if lower is None or len(rows) == limit:
+            break
+
+    if len(filters) <= 1 and not search:
+        # Hour granularity and deletions make this an estimate; never
+        # report fewer logs than the page already shows.
+        total, estimated = max(series_total, offset + len(rows)), True
+    else:
+        total, estimated = _capped_count(db, query, settings.dashboard_count_cap)
+
+    return DashboardResult(
+        rows,
+        total,
+        estimated,
+        f"{PLAN_WINDOW}:{label};probes={attempt}",
+    )
@@ -0,0 +1,305 @@
+"""
+Binary encodings of the ingest body.
+
+Besides JSON, ``POST /api/v1/logs`` accepts the same body as MessagePack
+(``application/msgpack``, needs the optional ``msgpack`` package) and as
+Protobuf (``application/x-protobuf``, needs ``protobuf``; schema in
+``app/schemas/log_ingest.proto``). Both decode straight into an
+``IngestBatch``. They are smaller on the wire, and skip the JSON text
+parsing and timestamp strings: MessagePack carries timestamps as its
+native extension type, Protobuf as integer microseconds.
+
+A body without one of these content types is read as JSON, as before.
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.services.ingest_parser import (
+    BATCH_ID_MAX_LENGTH,
+    IngestBatch,
+    IngestValidationError,
+    batch_from_dict,
+    parse_ingest_batch,
+)
+
+
+JSON = "json"
+MSGPACK = "msgpack"
+PROTOBUF = "protobuf"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    MSGPACK: "application/msgpack",
+    PROTOBUF: "application/x-protobuf",
+}
+
+# Content type -> encoding, including the common aliases.
+_ENCODINGS = {
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/x-protobuf": PROTOBUF,
+    "application/protobuf": PROTOBUF,
+    "application/vnd.google.protobuf": PROTOBUF,
+}
+
+PROTO_PACKAGE = "bcube.logs.v1"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class IngestEncodingUnavailable(Exception):
+    """
+    Raised when an encoding's optional dependency is not installed.
+    """
+
+
+def encoding_for(content_type: Optional[str]) -> str:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return _ENCODINGS.get(media_type, JSON)
+
+
+def _invalid(kind: str, msg: str, loc: tuple = ()) -> IngestValidationError:
+    return IngestValidationError([{"type": kind, "loc": ("body",) + loc, "msg": msg, "input": None}])
+
+
+# ---- MessagePack ----
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as exc:
+        raise IngestEncodingUnavailable(
+            "MessagePack ingest requires the 'msgpack' package"
+        ) from exc
+    return msgpack
+
+
+def parse_msgpack_batch(body: bytes) -> IngestBatch:
+    msgpack = _msgpack()
+    try:
+        # timestamp=3: extension timestamps arrive as aware datetimes.
+        data = msgpack.unpackb(body, timestamp=3, raw=False, strict_map_key=True)
+    except (ValueError, TypeError) as exc:
+        raise _invalid("msgpack_invalid", f"MessagePack decode error: {exc or type(exc).__name__}")
+    batch = batch_from_dict(data)
+
+    # MessagePack can carry what JSON cannot (bin values, non-string map
+    # keys); such meta would only fail when it is stored.
+    errors = []
+    for index, meta in enumerate(batch.metas):
+        if meta is None:
+            continue
+        try:
+            orjson.dumps(meta)
+        except TypeError as exc:
+            errors.append({
+                "type": "json_type",
+                "loc": ("body", "logs", index, "meta"),
+                "msg": f"Input should be JSON-compatible: {exc}",
+                "input": None,
+            })
+    if errors:
+        raise IngestValidationError(errors)
+    return batch
+
+
+def _msgpack_timestamp(value: Optional[datetime]) -> Any:
+    # The timestamp extension needs an aware datetime; naive ones are
+    # sent as ISO strings, which the server reads like JSON timestamps.
+    if value is not None and value.tzinfo is None:
+        return value.isoformat()
+    return value
+
+
+def encode_msgpack(payload: Dict[str, Any]) -> bytes:
+    body = dict(payload)
+    body["logs"] = [
+        {**log, "timestamp": _msgpack_timestamp(log.get("timestamp"))}
+        for log in payload["logs"]
+    ]
+    return _msgpack().packb(body, datetime=True)
+
+
+# ---- Protobuf ----
+
+@lru_cache
+def _protobuf_classes():
+    """
+    ``(LogIngestRequest, LogEntry)`` message classes, built from a
+    descriptor matching ``log_ingest.proto`` so no generated code (or
+    protoc step) is needed.
+    """
+    try:
+        from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+    except ImportError as exc:
+        raise IngestEncodingUnavailable(
+            "Protobuf ingest requires the 'protobuf' package"
+        ) from exc
+
+    field = descriptor_pb2.FieldDescriptorProto
+    file = descriptor_pb2.FileDescriptorProto(
+        name="bcube/log_ingest.proto",
+        package=PROTO_PACKAGE,
+        syntax="proto3",
+    )
+
+    entry = file.message_type.add(name="LogEntry")
+    for name, number, kind in (
+        ("timestamp_us", 1, field.TYPE_INT64),
+        ("level", 2, field.TYPE_STRING),
+        ("message", 3, field.TYPE_STRING),
+        ("meta_json", 4, field.TYPE_BYTES),
+    ):
+        entry.field.add(name=name, number=number, type=kind, label=field.LABEL_OPTIONAL)
+
+    request = file.message_type.add(name="LogIngestRequest")
+    request.field.add(name="service", number=1, type=field.TYPE_STRING, label=field.LABEL_OPTIONAL)
+    request.field.add(name="environment", number=2, type=field.TYPE_STRING, label=field.LABEL_OPTIONAL)
+    request.field.add(name="batch_id", number=4, type=field.TYPE_STRING, label=field.LABEL_OPTIONAL)
+    request.field.add(
+        name="logs",
+        number=3,
+        type=field.TYPE_MESSAGE,
+        type_name=f".{PROTO_PACKAGE}.LogEntry",
+        label=field.LABEL_REPEATED,
+    )
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file)
+    return (
+        message_factory.GetMessageClass(pool.FindMessageTypeByName(f"{PROTO_PACKAGE}.LogIngestRequest")),
+        message_factory.GetMessageClass(pool.FindMessageTypeByName(f"{PROTO_PACKAGE}.LogEntry")),
+    )
+
+
+def parse_protobuf_batch(body: bytes) -> IngestBatch:
+    request_class, _ = _protobuf_classes()
+    try:
+        request = request_class.FromString(body)
+    except Exception as exc:  # google.protobuf.message.DecodeError
+        raise _invalid("protobuf_invalid", f"Protobuf decode error: {exc}")
+
+    logs = request.logs
+    if not logs:
+        raise _invalid("too_short", "List should have at least 1 item after validation, not 0", ("logs",))
+
+    count = len(logs)
+    timestamps: List[Optional[datetime]] = [None] * count
+    levels: List[str] = [None] * count
+    messages: List[str] = [None] * count
+    metas: List[Optional[Dict[str, Any]]] = [None] * count
+    errors = []
+
+    for index, log in enumerate(logs):
+        timestamp_us = log.timestamp_us
+        if timestamp_us:
+            timestamps[index] = _EPOCH + timedelta(microseconds=timestamp_us)
+        # proto3 cannot tell an unset string from an empty one; both are
+        # treated as missing, like an absent field in a JSON body.
+        for key, value in (("level", log.level), ("message", log.message)):
+            if not value:
+                errors.append({
+                    "type": "missing",
+                    "loc": ("body", "logs", index, key),
+                    "msg": "Field required",
+                    "input": None,
+                })
+        levels[index] = log.level
+        messages[index] = log.message
+
+        meta_json = log.meta_json
+        if not meta_json:
+            continue
+        try:
+            meta = orjson.loads(meta_json)
+        except orjson.JSONDecodeError:
+            meta = None
+        if not isinstance(meta, dict):
+            errors.append({
+                "type": "dict_type",
+                "loc": ("body", "logs", index, "meta"),
+                "msg": "Input should be a JSON object",
+                "input": None,
+            })
+            continue
+        metas[index] = meta
+
+    if errors:
+        raise IngestValidationError(errors)
+
+    if len(request.batch_id) > BATCH_ID_MAX_LENGTH:
+        raise _invalid(
+            "string_too_long",
+            f"String should have at most {BATCH_ID_MAX_LENGTH} characters",
+            ("batch_id",),
+        )
+
+    return IngestBatch(
+        request.service or None,
+        request.environment or None,
+        timestamps,
+        levels,
+        messages,
+        metas,
+        batch_id=request.batch_id or None,
+    )
+
+
+def _timestamp_us(value: datetime) -> int:
+    # Naive timestamps are taken as UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def encode_protobuf(payload: Dict[str, Any]) -> bytes:
+    request_class, _ = _protobuf_classes()
+    request = request_class(
+        service=payload.get("service") or "",
+        environment=payload.get("environment") or "",
+        batch_id=payload.get("batch_id") or "",
+    )
+    for log in payload["logs"]:
+        timestamp = log.get("timestamp")
+        meta = log.get("meta")
+        request.logs.add(
+            timestamp_us=_timestamp_us(timestamp) if timestamp else 0,
+            level=log["level"],
+            message=log["message"],
+            meta_json=orjson.dumps(meta) if meta else b"",
+        )
+    return request.SerializeToString()
+
+
+# ---- Dispatch ----
+
+def parse_ingest_body(body: bytes, content_type: Optional[str]) -> IngestBatch:
+    """
+    Decodes an ingest body by its content type. Raises
+    ``IngestValidationError`` for invalid bodies and
+    ``IngestEncodingUnavailable`` when the encoding cannot be decoded here.
+    """
+    encoding = encoding_for(content_type)
+    if encoding == MSGPACK:
+        return parse_msgpack_batch(body)
+    if encoding == PROTOBUF:
+        return parse_protobuf_batch(body)
+    return parse_ingest_batch(body)
+
+
+def encode_ingest_body(payload: Dict[str, Any], encoding: str) -> Tuple[bytes, str]:
+    """
+    Encodes an ingest body (``LogIngestRequest`` shape, datetime
+    timestamps). Returns the body and its content type.
+    """
+    if encoding == MSGPACK:
+        return encode_msgpack(payload), MEDIA_TYPES[MSGPACK]
+    if encoding == PROTOBUF:
+        return encode_protobuf(payload), MEDIA_TYPES[PROTOBUF]
+    if encoding == JSON:
+        return orjson.dumps(payload), MEDIA_TYPES[JSON]
+    raise ValueError(f"Unknown ingest encoding {encoding!r}")
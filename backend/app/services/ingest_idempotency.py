@@ -0,0 +1,132 @@
+"""
+Idempotent ingest by client batch id.
+
+A client that times out cannot tell whether its batch was written. When it
+retries with the same batch id, the answer of the first attempt is returned
+instead of writing the logs again.
+
+Accepted ids are recorded in ``ingest_batch_ids`` in the same transaction
+as the logs (or the queued job), so an id is only ever stored for a batch
+that was committed. Two attempts racing each other collide on its primary
+key and the loser answers from the winner's row. Recent ids are also cached
+in memory, filled once their transaction commits, so most retries are
+answered without a query. Spool mode has no transaction and only uses the
+per-process cache.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.ingest_batch_id import IngestBatchId
+
+# Session.info key: ids recorded in the session's open transaction.
+_PENDING = "ingest_batch_ids_pending"
+
+_batch_id_cache: Optional[TTLCache] = None
+
+# Expired rows are deleted at most this often per process.
+_PRUNE_INTERVAL_SECONDS = 60.0
+_last_prune = 0.0
+
+
+def batch_id_cache() -> TTLCache:
+    global _batch_id_cache
+    if _batch_id_cache is None:
+        settings = get_settings()
+        _batch_id_cache = TTLCache(
+            maxsize=settings.ingest_batch_id_cache_size,
+            ttl=settings.ingest_batch_id_window_seconds,
+            name="ingest_batch_ids",
+        )
+    return _batch_id_cache
+
+
+def _window_start() -> datetime:
+    window = get_settings().ingest_batch_id_window_seconds
+    return datetime.now(timezone.utc) - timedelta(seconds=window)
+
+
+def cached_batch_result(project_id: int, batch_id: str) -> Optional[Dict[str, Any]]:
+    return batch_id_cache().get((project_id, batch_id))
+
+
+def cache_batch_result(project_id: int, batch_id: str, result: Dict[str, Any]) -> None:
+    batch_id_cache().set((project_id, batch_id), result)
+
+
+def seen_batch(db: Session, project_id: int, batch_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The recorded result of an earlier attempt of this batch, or None.
+    """
+    result = cached_batch_result(project_id, batch_id)
+    if result is not None:
+        return result
+
+    row = db.execute(
+        select(IngestBatchId.result, IngestBatchId.created_at).where(
+            IngestBatchId.project_id == project_id,
+            IngestBatchId.batch_id == batch_id,
+        )
+    ).first()
+    if row is None:
+        return None
+
+    created_at = row.created_at
+    if created_at.tzinfo is None:
+        # SQLite returns naive timestamps.
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    if created_at < _window_start():
+        # Expired: the id may be reused. Removed in the caller's
+        # transaction, which is about to record it again.
+        db.execute(
+            delete(IngestBatchId).where(
+                IngestBatchId.project_id == project_id,
+                IngestBatchId.batch_id == batch_id,
+            )
+        )
+        return None
+
+    cache_batch_result(project_id, batch_id, row.result)
+    return row.result
+
+
+def remember_batch(db: Session, project_id: int, batch_id: str, result: Dict[str, Any]) -> None:
+    """
+    Records a batch id in the caller's transaction. Raises
+    ``IntegrityError`` when a concurrent attempt recorded it first.
+    """
+    global _last_prune
+
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(IngestBatchId).values(
+            project_id=project_id,
+            batch_id=batch_id,
+            result=result,
+            created_at=now,
+        )
+    )
+
+    key: Hashable = (project_id, batch_id)
+    db.info.setdefault(_PENDING, {})[key] = result
+
+    if time.monotonic() - _last_prune > _PRUNE_INTERVAL_SECONDS:
+        _last_prune = time.monotonic()
+        db.execute(delete(IngestBatchId).where(IngestBatchId.created_at < _window_start()))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        batch_id_cache().set_many(pending.items())
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
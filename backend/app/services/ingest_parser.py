@@ -0,0 +1,212 @@
+"""
+Ingest request parsing without per-log Pydantic models.
+
+``LogIngestRequest`` documents the ingest contract, but validating a batch
+into it builds one model per log, which the pipeline then copies again
+into row dicts. The ingest path instead parses the raw body with orjson
+and checks it by hand into an ``IngestBatch``: one list per column, plus
+the original bytes so queue and spool modes can persist the body as-is.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas.ingest import LogIngestRequest
+
+
+_DATETIME = TypeAdapter(datetime)
+
+BATCH_ID_MAX_LENGTH = 128
+
+
+class IngestValidationError(ValueError):
+    """
+    Raised for bodies ``LogIngestRequest`` would reject. ``errors`` follows
+    Pydantic's error format, so the API can answer with the usual 422.
+    """
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in errors
+        ))
+        self.errors = errors
+
+
+class IngestBatch:
+    """
+    A validated ingest batch, stored column by column.
+    """
+
+    __slots__ = ("service", "environment", "timestamps", "levels", "messages", "metas", "raw", "batch_id")
+
+    def __init__(
+        self,
+        service: Optional[str],
+        environment: Optional[str],
+        timestamps: List[Optional[datetime]],
+        levels: List[str],
+        messages: List[str],
+        metas: List[Optional[Dict[str, Any]]],
+        raw: Optional[bytes] = None,
+        batch_id: Optional[str] = None,
+    ):
+        self.service = service
+        self.environment = environment
+        self.timestamps = timestamps
+        self.levels = levels
+        self.messages = messages
+        self.metas = metas
+        self.raw = raw
+        self.batch_id = batch_id
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        The batch in ``LogIngestRequest`` shape, for when ``raw`` is not set.
+        """
+        data = {
+            "service": self.service,
+            "environment": self.environment,
+            "logs": [
+                {"timestamp": timestamp, "level": level, "message": message, "meta": meta}
+                for timestamp, level, message, meta in zip(
+                    self.timestamps, self.levels, self.messages, self.metas
+                )
+            ],
+        }
+        if self.batch_id is not None:
+            data["batch_id"] = self.batch_id
+        return data
+
+    def to_json(self) -> bytes:
+        return self.raw if self.raw is not None else orjson.dumps(self.as_dict())
+
+
+def _error(kind: str, loc: tuple, msg: str, value: Any = None) -> Dict[str, Any]:
+    return {"type": kind, "loc": ("body",) + loc, "msg": msg, "input": value}
+
+
+def _parse_timestamp(value: Any, loc: tuple, errors: List[Dict[str, Any]]) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        # Binary encodings (MessagePack) deliver datetimes already.
+        return value
+    if isinstance(value, str):
+        # Covers what clients actually send; anything else (unix times,
+        # unusual ISO variants) goes through Pydantic for identical rules.
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    try:
+        return _DATETIME.validate_python(value)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        errors.append(_error(error["type"], loc, error["msg"], value))
+        return None
+
+
+def _optional_str(data: Dict[str, Any], key: str, errors: List[Dict[str, Any]]) -> Optional[str]:
+    value = data.get(key)
+    if value is not None and not isinstance(value, str):
+        errors.append(_error("string_type", (key,), "Input should be a valid string", value))
+    return value
+
+
+def batch_from_dict(data: Any, raw: Optional[bytes] = None) -> IngestBatch:
+    """
+    Validates a decoded body with the rules of ``LogIngestRequest``.
+    Raises ``IngestValidationError`` listing every problem found.
+    """
+    if not isinstance(data, dict):
+        raise IngestValidationError([
+            _error("model_attributes_type", (), "Input should be a valid dictionary or object", data)
+        ])
+
+    errors: List[Dict[str, Any]] = []
+    service = _optional_str(data, "service", errors)
+    environment = _optional_str(data, "environment", errors)
+    batch_id = _optional_str(data, "batch_id", errors)
+    if isinstance(batch_id, str) and len(batch_id) > BATCH_ID_MAX_LENGTH:
+        errors.append(_error(
+            "string_too_long", ("batch_id",),
+            f"String should have at most {BATCH_ID_MAX_LENGTH} characters", batch_id,
+        ))
+
+    logs = data.get("logs")
+    if not isinstance(logs, list):
+        kind, msg = ("missing", "Field required") if logs is None else ("list_type", "Input should be a valid list")
+        errors.append(_error(kind, ("logs",), msg, logs))
+        raise IngestValidationError(errors)
+    if not logs:
+        errors.append(_error("too_short", ("logs",), "List should have at least 1 item after validation, not 0", logs))
+        raise IngestValidationError(errors)
+
+    count = len(logs)
+    timestamps: List[Optional[datetime]] = [None] * count
+    levels: List[str] = [None] * count
+    messages: List[str] = [None] * count
+    metas: List[Optional[Dict[str, Any]]] = [None] * count
+
+    for index, log in enumerate(logs):
+        if not isinstance(log, dict):
+            errors.append(_error("model_type", ("logs", index), "Input should be a valid dictionary", log))
+            continue
+
+        level = log.get("level")
+        message = log.get("message")
+        meta = log.get("meta")
+
+        for key, value in (("level", level), ("message", message)):
+            if not isinstance(value, str):
+                if value is None and key not in log:
+                    errors.append(_error("missing", ("logs", index, key), "Field required"))
+                else:
+                    errors.append(_error("string_type", ("logs", index, key), "Input should be a valid string", value))
+        if meta is not None and not isinstance(meta, dict):
+            errors.append(_error("dict_type", ("logs", index, "meta"), "Input should be a valid dictionary", meta))
+
+        timestamps[index] = _parse_timestamp(log.get("timestamp"), ("logs", index, "timestamp"), errors)
+        levels[index] = level
+        messages[index] = message
+        metas[index] = meta
+
+    if errors:
+        raise IngestValidationError(errors)
+
+    return IngestBatch(service, environment, timestamps, levels, messages, metas, raw=raw, batch_id=batch_id)
+
+
+def parse_ingest_batch(body: bytes) -> IngestBatch:
+    """
+    Parses and validates a raw ingest request body.
+    """
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as exc:
+        raise IngestValidationError([_error("json_invalid", (exc.pos,), f"JSON decode error: {exc.msg}")])
+    return batch_from_dict(data, raw=body)
+
+
+def _inline_refs(schema: Any, definitions: Dict[str, Any]) -> Any:
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if ref is not None:
+            return _inline_refs(definitions[ref.rsplit("/", 1)[-1]], definitions)
+        return {key: _inline_refs(value, definitions) for key, value in schema.items() if key != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_refs(value, definitions) for value in schema]
+    return schema
+
+
+def ingest_request_schema() -> Dict[str, Any]:
+    """
+    JSON schema of ``LogIngestRequest`` with references inlined, for the
+    OpenAPI docs of endpoints that read the body themselves.
+    """
+    schema = LogIngestRequest.model_json_schema()
+    return _inline_refs(schema, schema.get("$defs", {}))
@@ -0,0 +1,257 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.metrics import (
+    INGEST_BATCH_SIZE,
+    INGEST_ROWS,
+    INGEST_SAMPLED_OUT,
+    INGEST_STAGE_SECONDS,
+)
+from app.core.project_cache import ProjectSnapshot
+from app.database import new_session
+from app.models.project import PROJECT_ACTIVE, Project
+from app.services.category_cache import CategorySnapshot, get_project_categories
+from app.services.ingest_idempotency import remember_batch
+from app.services.ingest_parser import IngestBatch
+from app.services.log_dictionary import name_id
+from app.services.log_processor import process_logs
+from app.services.log_writer import (
+    resolve_category_ids,
+    bulk_insert_logs,
+    insert_logs_returning_ids,
+)
+from app.services.meta_index import record_promoted_meta
+from app.services.alerting import evaluate_alerts
+from app.services.log_dimensions import queue_dimensions
+from app.services.recent_logs import is_tracked, record_ingested
+from app.services.meta_policy import MetaTooLarge
+from app.services.sampling import sample_batch
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IngestedRows:
+    """
+    Rows of a batch written with ``commit=False``, handed to
+    ``after_ingest_commit`` once the caller has committed them.
+    """
+    project_id: int
+    logs: List[Dict[str, Any]]
+    categories: List[CategorySnapshot]
+
+
+def ingest_batch(
+    db: Session,
+    project: ProjectSnapshot,
+    batch: IngestBatch,
+    categories: Optional[List[CategorySnapshot]] = None,
+    commit: bool = True,
+    rejected: Optional[List[Dict[str, Any]]] = None,
+    batch_id: Optional[str] = None,
+    ingested: Optional[List[IngestedRows]] = None,
+) -> int:
+    """
+    Runs one ingest batch through sampling, categorization, the bulk
+    writer, the dimension counts and the alert rules.
+    Shared by the HTTP endpoint and the background ingest workers.
+
+    Returns the number of rows inserted, which excludes logs dropped by
+    the project's sampling rules. Raises ``MetaTooLarge`` when the
+    project rejects oversized meta, and ``RuntimeError`` for a category
+    that does not exist. Given a ``rejected`` list, such logs are skipped
+    instead and reported there as ``{"index", "reason", "error"}``, with
+    their position in ``batch``; the rest is written. A ``batch_id`` is
+    recorded with the result in the same transaction (see
+    ``ingest_idempotency``). With ``commit=False`` the insert is left in
+    the caller's transaction, and the written rows are appended to
+    ``ingested`` for ``after_ingest_commit`` once the caller commits.
+    """
+    INGEST_BATCH_SIZE.observe(len(batch))
+
+    sample_rates: Dict[str, float] = {}
+    kept = None
+    if project.sampling_rules:
+        with INGEST_STAGE_SECONDS.time(stage="sample_logs"):
+            sampled, sample_rates, kept = sample_batch(
+                batch,
+                project.sampling_rules,
+                get_settings().correlation_meta_keys,
+            )
+        INGEST_SAMPLED_OUT.inc(len(batch) - len(sampled))
+        batch = sampled
+        if not len(batch):
+            return 0
+
+    # Logs skipped for ``rejected``, by position in the (sampled) batch.
+    skipped: List[Dict[str, Any]] = []
+
+    if categories is None:
+        with INGEST_STAGE_SECONDS.time(stage="load_categories"):
+            categories = get_project_categories(db, project.id)
+
+    # One service and environment per batch: a single id lookup each.
+    with INGEST_STAGE_SECONDS.time(stage="resolve_dictionary_ids"):
+        service_id = name_id(db, "service", project.id, batch.service)
+        environment_id = name_id(db, "environment", project.id, batch.environment)
+
+    with INGEST_STAGE_SECONDS.time(stage="process_logs"):
+        try:
+            processed_logs = process_logs(
+                batch=batch,
+                project=project,
+                user_categories=categories,
+                service_id=service_id,
+                environment_id=environment_id,
+                sample_rates=sample_rates,
+                rejected=skipped if rejected is not None else None,
+            )
+        except MetaTooLarge as exc:
+            if kept is not None:
+                # Report the log's position in the batch as sent.
+                exc.index = kept[exc.index]
+            raise
+
+    unresolved = [log for log in processed_logs if "category" in log]
+    if unresolved:
+        with INGEST_STAGE_SECONDS.time(stage="resolve_category_ids"):
+            missing = resolve_category_ids(db, project.id, unresolved)
+        if missing:
+            if rejected is None:
+                raise RuntimeError(
+                    f"Category '{missing[0]['category']}' not found for project {project.id}"
+                )
+            processed_logs = _drop_rows(processed_logs, missing, skipped)
+
+    # Positions of the rows in ``batch``, once some logs were skipped.
+    metas = batch.metas
+    if skipped:
+        skipped_positions = {item["index"] for item in skipped}
+        positions = [i for i in range(len(batch)) if i not in skipped_positions]
+        metas = [batch.metas[i] for i in positions]
+        for item in sorted(skipped, key=lambda item: item["index"]):
+            if kept is not None:
+                item["index"] = kept[item["index"]]
+            rejected.append(item)
+
+    if not processed_logs:
+        return 0
+
+    # Ids are needed for promoted meta, and for the in-memory recent logs
+    # of a project whose dashboard is open in this process.
+    track_recent = commit and is_tracked(project.id)
+
+    with INGEST_STAGE_SECONDS.time(stage="bulk_insert_logs"):
+        if project.promoted_meta_keys or track_recent:
+            log_ids = insert_logs_returning_ids(db, processed_logs)
+            inserted_count = len(log_ids)
+        else:
+            inserted_count = bulk_insert_logs(db, project.id, processed_logs, commit=False)
+
+    if project.promoted_meta_keys:
+        with INGEST_STAGE_SECONDS.time(stage="record_promoted_meta"):
+            record_promoted_meta(
+                db,
+                project.id,
+                log_ids,
+                metas,
+                project.promoted_meta_keys,
+            )
+
+    if batch_id is not None:
+        remember_batch(db, project.id, batch_id, {"count": inserted_count, "rejected": rejected or []})
+
+    if commit:
+        db.commit()
+
+    INGEST_ROWS.inc(inserted_count)
+
+    if track_recent:
+        record_ingested(project.id, processed_logs, log_ids)
+
+    if commit:
+        after_ingest_commit(db, [IngestedRows(project.id, processed_logs, categories)])
+    elif ingested is not None:
+        ingested.append(IngestedRows(project.id, processed_logs, categories))
+
+    return inserted_count
+
+
+def after_ingest_commit(db: Session, ingested: List[IngestedRows]) -> None:
+    """
+    Adds committed batches to the dimension counts and feeds them to the
+    alert rules. Alert errors are logged, not raised: the rows are already
+    committed, and failing the caller would only get them written twice by
+    a retry.
+    """
+    with INGEST_STAGE_SECONDS.time(stage="record_dimensions"):
+        for rows in ingested:
+            queue_dimensions(rows.project_id, rows.logs)
+
+    if not ingested or not get_settings().alerts_enabled:
+        return
+    with INGEST_STAGE_SECONDS.time(stage="evaluate_alerts"):
+        for rows in ingested:
+            try:
+                evaluate_alerts(db, rows.project_id, rows.logs, rows.categories)
+            except Exception:
+                logger.exception("Alert evaluation failed for project %s", rows.project_id)
+
+
+def _drop_rows(
+    rows: List[Dict[str, Any]],
+    missing: List[Dict[str, Any]],
+    skipped: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Removes rows with an unknown category, adding them to ``skipped``.
+    ``rows`` are the batch's logs minus those already in ``skipped``.
+    """
+    missing_rows = {id(row) for row in missing}
+    skipped_positions = {item["index"] for item in skipped}
+    positions = (i for i in range(len(rows) + len(skipped)) if i not in skipped_positions)
+
+    kept_rows = []
+    for position, row in zip(positions, rows):
+        if id(row) in missing_rows:
+            skipped.append({
+                "index": position,
+                "reason": "unknown_category",
+                "error": f"Category '{row['category']}' not found",
+            })
+        else:
+            kept_rows.append(row)
+    return kept_rows
+
+
+def load_ingest_context(
+    db: Session,
+    project_ids: Iterable[int],
+) -> Tuple[Dict[int, ProjectSnapshot], Dict[int, List[CategorySnapshot]]]:
+    """
+    Projects and categories for a set of deferred batches (queue jobs,
+    spool records). Projects that no longer exist, or are being deleted,
+    are left out.
+    """
+    project_ids = set(project_ids)
+    projects = {
+        project.id: ProjectSnapshot.from_model(project)
+        for project in (
+            db.query(Project)
+            .filter(Project.id.in_(project_ids), Project.status == PROJECT_ACTIVE)
+        )
+    }
+
+    # Separate session: seeding system categories commits, which must not
+    # end the caller's transaction (or release the locks it holds).
+    categories_db = new_session()
+    try:
+        categories = {pid: get_project_categories(categories_db, pid) for pid in projects}
+    finally:
+        categories_db.close()
+
+    return projects, categories
@@ -0,0 +1,70 @@
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.metrics import INGEST_BATCH_SIZE, QUEUE_DEPTH
+from app.core.project_cache import ProjectSnapshot
+from app.models.ingest_job import IngestJob
+from app.services.ingest_idempotency import remember_batch
+from app.services.ingest_parser import IngestBatch
+
+
+JOB_PENDING = "pending"
+JOB_FAILED = "failed"
+
+
+def enqueue_batch(
+    db: Session,
+    project: ProjectSnapshot,
+    batch: IngestBatch,
+    batch_id: Optional[str] = None,
+) -> IngestJob:
+    """
+    Stores an already validated batch for the ingest workers. This is the
+    whole request-side cost in queue mode: the request body is stored as
+    received, in one insert. A ``batch_id`` is recorded with the job.
+    """
+    INGEST_BATCH_SIZE.observe(len(batch))
+
+    job = IngestJob(
+        project_id=project.id,
+        payload=batch.to_json(),
+        log_count=len(batch),
+        status=JOB_PENDING,
+        attempts=0,
+    )
+    db.add(job)
+    if batch_id is not None:
+        db.flush()
+        remember_batch(db, project.id, batch_id, {"count": job.log_count, "job_id": job.id})
+    db.commit()
+    return job
+
+
+def claim_jobs(db: Session, limit: int) -> List[IngestJob]:
+    """
+    Locks up to ``limit`` pending jobs for the current transaction.
+    ``SKIP LOCKED`` lets any number of workers poll the same table without
+    handing out a job twice; databases without row locks ignore it.
+    """
+    return (
+        db.query(IngestJob)
+        .filter(IngestJob.status == JOB_PENDING)
+        .order_by(IngestJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def pending_job_count(db: Session) -> int:
+    return (
+        db.query(func.count(IngestJob.id))
+        .filter(IngestJob.status == JOB_PENDING)
+        .scalar()
+    )
+
+
+def refresh_queue_depth(db: Session) -> None:
+    QUEUE_DEPTH.set(pending_job_count(db), queue="ingest_jobs")
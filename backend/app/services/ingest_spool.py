@@ -0,0 +1,86 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+import orjson
+
+from app.config import get_settings
+from app.core.metrics import INGEST_BATCH_SIZE, SPOOL_PENDING_BYTES
+from app.core.project_cache import ProjectSnapshot
+from app.core.spool import SpoolWriter, pending_bytes, writer_directories, writer_directory
+from app.services.ingest_parser import IngestBatch, batch_from_dict
+
+
+_writer: Optional[SpoolWriter] = None
+_writer_pid: Optional[int] = None
+_writer_lock = threading.Lock()
+
+
+def spool_writer() -> SpoolWriter:
+    """
+    The spool writer of this process, opened on first use in a directory
+    of its own, so several API processes can share one spool.
+    """
+    if _writer is None or _writer_pid != os.getpid():
+        with _writer_lock:
+            if _writer is None or _writer_pid != os.getpid():
+                _open_writer()
+    return _writer
+
+
+def _open_writer() -> None:
+    global _writer, _writer_pid
+    settings = get_settings()
+    _writer = SpoolWriter(
+        writer_directory(settings.spool_dir),
+        segment_bytes=settings.spool_segment_bytes,
+        fsync=settings.spool_fsync,
+        fsync_interval=settings.spool_fsync_interval_seconds,
+    )
+    _writer_pid = os.getpid()
+
+
+def _forget_inherited_writer() -> None:
+    # A forked child opens a writer of its own; the parent's stays locked.
+    global _writer
+    if _writer is not None:
+        _writer.forget_lock()
+    _writer = None
+
+
+os.register_at_fork(after_in_child=_forget_inherited_writer)
+
+
+def close_spool_writer() -> None:
+    global _writer
+    if _writer is not None and _writer_pid == os.getpid():
+        _writer.close()
+    _writer = None
+
+
+def encode_record(project_id: int, batch: IngestBatch) -> bytes:
+    # The validated request body is spliced in verbatim instead of being
+    # decoded and re-encoded.
+    return b'{"project_id":%d,"batch":%s}' % (project_id, batch.to_json())
+
+
+def decode_record(data: bytes) -> Tuple[int, IngestBatch]:
+    record = orjson.loads(data)
+    return record["project_id"], batch_from_dict(record["batch"])
+
+
+def spool_batch(project: ProjectSnapshot, batch: IngestBatch) -> int:
+    """
+    Appends a validated batch to the spool. Does not touch the database,
+    so ingest keeps accepting logs while the database is slow or down.
+    """
+    INGEST_BATCH_SIZE.observe(len(batch))
+    spool_writer().append(encode_record(project.id, batch))
+    return len(batch)
+
+
+def refresh_spool_backlog() -> None:
+    spool_dir = get_settings().spool_dir
+    SPOOL_PENDING_BYTES.set(
+        sum(pending_bytes(directory) for directory in writer_directories(spool_dir))
+    )
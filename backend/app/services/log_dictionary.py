@@ -0,0 +1,116 @@
+"""
+Per-project dictionaries of service and environment names.
+
+Log rows store integer ids; names are resolved once per batch. Missing
+names are created in the caller's transaction, and ids only enter the
+shared cache once that transaction commits, so a rolled back batch cannot
+leave a cached id that points at a row that was never written.
+"""
+from typing import Dict, Hashable, Optional
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.log_environment import LogEnvironment
+from app.models.log_service import LogService
+
+
+DICTIONARIES = {
+    "service": LogService,
+    "environment": LogEnvironment,
+}
+
+# Session.info key: ids resolved in the session's open transaction.
+_PENDING = "log_dictionary_pending"
+
+_dictionary_cache: Optional[TTLCache] = None
+
+
+def dictionary_cache() -> TTLCache:
+    global _dictionary_cache
+    if _dictionary_cache is None:
+        settings = get_settings()
+        _dictionary_cache = TTLCache(
+            maxsize=settings.category_cache_size,
+            ttl=settings.category_cache_ttl_seconds,
+            name="log_dictionary",
+        )
+    return _dictionary_cache
+
+
+def _insert_missing(db: Session, model, project_id: int, name: str) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model).values(project_id=project_id, name=name))
+        except IntegrityError:
+            pass
+        return
+
+    db.execute(
+        dialect_insert(model)
+        .values(project_id=project_id, name=name)
+        .on_conflict_do_nothing(index_elements=["project_id", "name"])
+    )
+
+
+def name_id(db: Session, kind: str, project_id: int, name: Optional[str]) -> Optional[int]:
+    """
+    Id of ``name`` in a project's ``kind`` dictionary (``"service"`` or
+    ``"environment"``), created if missing. None for a missing name.
+    """
+    if name is None:
+        return None
+
+    key: Hashable = (kind, project_id, name)
+    value = dictionary_cache().get(key)
+    if value is not None:
+        return value
+
+    model = DICTIONARIES[kind]
+    lookup = select(model.id).where(model.project_id == project_id, model.name == name)
+    value = db.execute(lookup).scalar()
+    if value is None:
+        _insert_missing(db, model, project_id, name)
+        value = db.execute(lookup).scalar_one()
+
+    # Even a row found by the lookup may be this transaction's own insert.
+    db.info.setdefault(_PENDING, {})[key] = value
+    return value
+
+
+def name_ids(db: Session, kind: str, project_id: int, pattern: str):
+    """
+    Subquery of the ids whose name matches an ``ILIKE`` pattern.
+    """
+    model = DICTIONARIES[kind]
+    return select(model.id).where(model.project_id == project_id, model.name.ilike(pattern))
+
+
+def id_names(db: Session, kind: str, project_id: int) -> Dict[int, str]:
+    model = DICTIONARIES[kind]
+    return dict(
+        db.query(model.id, model.name).filter(model.project_id == project_id).all()
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        dictionary_cache().set_many(pending.items())
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    # Also fires for savepoints; ids resolved before it are simply looked
+    # up again.
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,340 @@
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import func, update, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import new_session
+from app.models.log_category import LogCategory
+from app.models.log_dimension import LogDimension
+
+logger = logging.getLogger(__name__)
+
+
+DIMENSIONS = ("service", "environment", "level", "category")
+
+_COLUMN_FOR = {
+    "service": "service",
+    "environment": "environment",
+    "level": "level",
+    "category": "category_id",
+}
+
+DimensionKey = Tuple[str, str, datetime]
+
+
+def hour_bucket(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+    if ts.tzinfo is not timezone.utc:
+        ts = ts.astimezone(timezone.utc)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+_dimension_values = itemgetter(*(_COLUMN_FOR[dimension] for dimension in DIMENSIONS))
+
+
+def count_dimensions(logs: Iterable[Dict[str, Any]]) -> Dict[DimensionKey, List[float]]:
+    """
+    ``[count, scaled count]`` per dimension value and hour; sampled rows
+    count ``1 / sample_rate`` logs towards the scaled count.
+    """
+    # Rows of a batch share few value combinations: count those first,
+    # then fan each one out to its dimensions.
+    combinations = Counter(
+        (_dimension_values(log), hour_bucket(log["timestamp"]), log.get("sample_rate"))
+        for log in logs
+    )
+
+    counts: Dict[DimensionKey, List[float]] = {}
+    for (values, bucket, rate), count in combinations.items():
+        scaled = count / rate if rate else count
+        for dimension, value in zip(DIMENSIONS, values):
+            if value is not None:
+                entry = counts.setdefault((dimension, str(value), bucket), [0, 0.0])
+                entry[0] += count
+                entry[1] += scaled
+    return counts
+
+
+def record_dimensions(
+    db: Union[Session, Connection],
+    project_id: int,
+    logs: List[Dict[str, Any]],
+) -> None:
+    """
+    Adds a batch of insert-ready log rows (``category_id`` resolved) to the
+    hourly dimension counts, in the caller's transaction. For bulk loads;
+    ingest uses ``queue_dimensions``.
+
+    Rows are upserted in a fixed order so concurrent batches for the same
+    project lock them in the same order and cannot deadlock.
+    """
+    _add_counts(db, project_id, count_dimensions(logs))
+
+
+# ---- Buffered counts of ingested logs ----
+
+# project id -> counts not yet upserted.
+_queued: Dict[int, Dict[DimensionKey, List[float]]] = {}
+_queued_lock = threading.Lock()
+
+_flusher: Optional["DimensionFlusher"] = None
+_flusher_lock = threading.Lock()
+
+
+def _merge_queued(project_id: int, counts: Dict[DimensionKey, List[float]]) -> None:
+    with _queued_lock:
+        queued = _queued.setdefault(project_id, {})
+        for key, (count, scaled) in counts.items():
+            entry = queued.setdefault(key, [0, 0.0])
+            entry[0] += count
+            entry[1] += scaled
+
+
+def queue_dimensions(project_id: int, logs: List[Dict[str, Any]]) -> None:
+    """
+    Adds committed log rows to the hourly dimension counts. The counts are
+    summed in memory and upserted by ``flush_dimensions`` outside any
+    ingest transaction, so ingest never waits on the shared count rows.
+    """
+    _merge_queued(project_id, count_dimensions(logs))
+
+    interval = get_settings().dimension_flush_seconds
+    if interval <= 0:
+        flush_dimensions()
+    else:
+        _start_flusher(interval)
+
+
+def flush_dimensions() -> None:
+    """
+    Upserts the queued counts, one short transaction per project. Counts
+    that cannot be written for now are queued again; those of a project
+    deleted meanwhile are dropped.
+    """
+    global _queued
+    with _queued_lock:
+        queued, _queued = _queued, {}
+    if not queued:
+        return
+
+    db = new_session()
+    try:
+        for project_id in sorted(queued):
+            try:
+                _add_counts(db, project_id, queued[project_id])
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                logger.warning("Dropping dimension counts of deleted project %s", project_id)
+            except Exception:
+                db.rollback()
+                logger.exception("Flushing dimension counts failed; retrying later")
+                for unflushed in sorted(queued):
+                    if unflushed >= project_id:
+                        _merge_queued(unflushed, queued[unflushed])
+                return
+    finally:
+        db.close()
+
+
+class DimensionFlusher:
+    """
+    Background thread running ``flush_dimensions`` every
+    ``DIMENSION_FLUSH_SECONDS``.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dimension-flusher", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            flush_dimensions()
+
+
+def _start_flusher(interval: float) -> None:
+    global _flusher
+    if _flusher is None:
+        with _flusher_lock:
+            if _flusher is None:
+                _flusher = DimensionFlusher(interval)
+                _flusher.start()
+
+
+def _reset_after_fork() -> None:
+    # The parent's queued counts and flusher thread stay with the parent.
+    global _queued, _queued_lock, _flusher, _flusher_lock
+    _queued, _queued_lock = {}, threading.Lock()
+    _flusher, _flusher_lock = None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def stop_dimension_flusher() -> None:
+    """
+    Stops the background flusher and writes what is still queued; call
+    on shutdown of every process that ingests.
+    """
+    global _flusher
+    with _flusher_lock:
+        if _flusher is not None:
+            _flusher.stop()
+            _flusher = None
+    flush_dimensions()
+
+
+def move_dimension_values(
+    db: Union[Session, Connection],
+    project_id: int,
+    dimension: str,
+    moves: Iterable[Tuple[Any, Any, datetime, Optional[float]]],
+) -> None:
+    """
+    Moves logs between values of one dimension, given ``(old value, new
+    value, timestamp, sample_rate)`` per log, in the caller's transaction.
+    Used when existing logs are recategorized.
+    """
+    combinations = Counter(
+        (str(old), str(new), hour_bucket(timestamp), rate)
+        for old, new, timestamp, rate in moves
+    )
+
+    counts: Dict[DimensionKey, List[float]] = {}
+    for (old, new, bucket, rate), count in combinations.items():
+        scaled = count / rate if rate else count
+        for value, sign in ((old, -1), (new, 1)):
+            entry = counts.setdefault((dimension, value, bucket), [0, 0.0])
+            entry[0] += sign * count
+            entry[1] += sign * scaled
+    _add_counts(db, project_id, {key: value for key, value in counts.items() if value[0]})
+
+
+def _add_counts(
+    db: Union[Session, Connection],
+    project_id: int,
+    counts: Dict[DimensionKey, List[float]],
+) -> None:
+    if not counts:
+        return
+
+    rows = [
+        {
+            "project_id": project_id,
+            "dimension": dimension,
+            "value": value,
+            "bucket": bucket,
+            "count": count,
+            "scaled_count": round(scaled),
+        }
+        for (dimension, value, bucket), (count, scaled) in sorted(counts.items())
+    ]
+
+    dialect = db.dialect.name if isinstance(db, Connection) else db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        _update_then_insert(db, rows)
+        return
+
+    table = LogDimension.__table__
+    statement = dialect_insert(table).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["project_id", "dimension", "value", "bucket"],
+        set_={
+            "count": table.c.count + statement.excluded["count"],
+            "scaled_count": table.c.scaled_count + statement.excluded["scaled_count"],
+        },
+    )
+    db.execute(statement)
+
+
+def _update_then_insert(db: Union[Session, Connection], rows: List[Dict[str, Any]]) -> None:
+    table = LogDimension.__table__
+    for row in rows:
+        result = db.execute(
+            update(table)
+            .where(
+                table.c.project_id == row["project_id"],
+                table.c.dimension == row["dimension"],
+                table.c.value == row["value"],
+                table.c.bucket == row["bucket"],
+            )
+            .values(
+                count=table.c.count + row["count"],
+                scaled_count=table.c.scaled_count + row["scaled_count"],
+            )
+        )
+        if not result.rowcount:
+            db.execute(insert(table).values(**row))
+
+
+def get_facets(
+    db: Session,
+    project_id: int,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Distinct dimension values with log counts, most frequent first. The
+    time range is applied at hour granularity. ``scaled_count`` estimates
+    the logs sent before ingest sampling.
+    """
+    query = (
+        db.query(
+            LogDimension.dimension,
+            LogDimension.value,
+            func.sum(LogDimension.count),
+            func.sum(LogDimension.scaled_count),
+        )
+        .filter(LogDimension.project_id == project_id)
+    )
+    if from_ts:
+        query = query.filter(LogDimension.bucket >= hour_bucket(from_ts))
+    if to_ts:
+        query = query.filter(LogDimension.bucket <= hour_bucket(to_ts))
+
+    rows = query.group_by(LogDimension.dimension, LogDimension.value).all()
+
+    category_names = dict(
+        db.query(LogCategory.id, LogCategory.name)
+        .filter(LogCategory.project_id == project_id)
+        .all()
+    )
+
+    facets: Dict[str, List[Dict[str, Any]]] = {dimension: [] for dimension in DIMENSIONS}
+    for dimension, value, count, scaled_count in rows:
+        if not count:
+            continue
+        item = {"value": value, "count": int(count), "scaled_count": int(scaled_count)}
+        if dimension == "category":
+            name = category_names.get(int(value))
+            if name is None:
+                continue
+            item = {"id": int(value), **item, "value": name}
+        facets[dimension].append(item)
+
+    for items in facets.values():
+        items.sort(key=lambda item: (-item["count"], item["value"]))
+
+    return facets
@@ -0,0 +1,237 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from app.database import new_session
+from app.models.log_entry import LogEntry
+from app.services.log_query import apply_dashboard_filters
+from app.services.log_serializer import DEFAULT_FIELDS, log_columns, rows_to_items, dumps
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+EXPORT_COMPRESSIONS = ("none", "gzip")
+
+EXPORT_FIELDS = DEFAULT_FIELDS
+
+EXPORT_COLUMNS = log_columns(EXPORT_FIELDS)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class ExportFormatUnavailable(Exception):
+    """
+    Raised when the requested export format needs an optional
+    dependency that is not installed.
+    """
+
+
+def ensure_format_available(fmt: str) -> None:
+    """
+    Checks optional dependencies up front, before the response starts
+    streaming and an HTTP error can no longer be returned.
+    """
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ExportFormatUnavailable(
+                "Parquet export requires the 'pyarrow' package"
+            ) from exc
+
+
+# ---- Row source ----
+
+def iter_export_partitions(
+    filters: Dict[str, Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields lists of row dicts in ``(timestamp, id)`` order.
+
+    Uses ``yield_per`` so the driver streams from a server-side cursor
+    (a named cursor on psycopg2) instead of buffering the whole result.
+    The session is owned by the generator because it must stay open for
+    as long as the response is streaming.
+    """
+    db = new_session()
+    try:
+        query = apply_dashboard_filters(db.query(*EXPORT_COLUMNS), **filters)
+        stmt = query.order_by(LogEntry.timestamp, LogEntry.id).statement
+
+        result = db.execute(stmt, execution_options={"yield_per": chunk_size})
+        for partition in result.partitions():
+            yield rows_to_items(EXPORT_FIELDS, partition)
+    finally:
+        db.close()
+
+
+# ---- Encoders ----
+
+def encode_ndjson(partitions: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for items in partitions:
+        yield b"".join(dumps(item) + b"\n" for item in items)
+
+
+def _flat_value(value: Any) -> Any:
+    """
+    Renders a value for flat formats: datetimes as ISO strings and
+    nested meta as a JSON string.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
+
+
+def encode_csv(partitions: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_FIELDS)
+    header = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    yield header.encode("utf-8")
+
+    for items in partitions:
+        for item in items:
+            writer.writerow([_flat_value(item[name]) for name in EXPORT_FIELDS])
+
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        yield chunk.encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """
+    Write-only file object that keeps bytes until drained, so the
+    parquet writer can be streamed one row group at a time.
+    """
+
+    def __init__(self) -> None:
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def encode_parquet(
+    partitions: Iterable[List[Dict[str, Any]]],
+    compression: str = "none",
+) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("level", pa.string()),
+        ("service", pa.string()),
+        ("environment", pa.string()),
+        ("message", pa.string()),
+        ("category_id", pa.int64()),
+        ("correlation_id", pa.string()),
+        ("sample_rate", pa.float64()),
+        ("meta", pa.string()),
+    ])
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(
+        sink,
+        schema,
+        compression="gzip" if compression == "gzip" else "none",
+    )
+
+    try:
+        for items in partitions:
+            columns = {name: [item[name] for item in items] for name in EXPORT_FIELDS}
+            columns["meta"] = [
+                dumps(meta).decode() if meta is not None else None
+                for meta in columns["meta"]
+            ]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+
+    yield compressor.flush()
+
+
+ENCODERS: Dict[str, Callable[..., Iterator[bytes]]] = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
+
+
+# ---- Public entry point ----
+
+def stream_export(
+    filters: Dict[str, Any],
+    fmt: str = "ndjson",
+    compression: str = "none",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Streams the filtered logs of a project as encoded bytes.
+    Memory use is bounded by ``chunk_size`` rows regardless of result size.
+    """
+    partitions = iter_export_partitions(filters, chunk_size)
+
+    if fmt == "parquet":
+        # Parquet compresses column pages itself, so gzip is applied
+        # as the page codec instead of wrapping the file.
+        return encode_parquet(partitions, compression)
+
+    chunks = ENCODERS[fmt](partitions)
+
+    if compression == "gzip":
+        return gzip_stream(chunks)
+
+    return chunks
+
+
+def export_filename(fmt: str, compression: str) -> str:
+    extension = EXPORT_FORMATS[fmt][1]
+    if compression == "gzip" and fmt != "parquet":
+        extension += ".gz"
+    return f"logs_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.{extension}"
+
+
+def export_media_type(fmt: str, compression: str) -> str:
+    if compression == "gzip" and fmt != "parquet":
+        return "application/gzip"
+    return EXPORT_FORMATS[fmt][0]
@@ -1,25 +1,17 @@
 from datetime import datetime, timezone
-from typing import List, Optional
-import re
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from app.schemas.ingest import LogIngestRequest
-from app.models.project import Project
-from app.models.log_category import LogCategory
+from app.config import get_settings
 
+from app.core.project_cache import ProjectSnapshot
+from app.core.severity import SEVERITIES, normalize_level
+from app.services.category_cache import CategorySnapshot
+from app.services.ingest_parser import IngestBatch
+from app.services.meta_index import extract_correlation_id
+from app.services.meta_policy import MetaTooLarge, policy_for_project, prepare_meta
 
-# ---- Normalization helpers ----
-
-LEVEL_MAP = {
-    "info": "INFO",
-    "warn": "WARN",
-    "warning": "WARN",
-    "error": "ERROR",
-}
-
-
-def normalize_level(level: str) -> str:
-    return LEVEL_MAP.get(level.lower(), "INFO")
 
+# ---- Normalization helpers ----
 
 def normalize_timestamp(ts: Optional[datetime]) -> datetime:
     if ts:
@@ -34,9 +26,11 @@ DB_KEYWORDS = ("db", "sql", "database", "query")
 
 
 def system_categorize(level: str, message: str) -> str:
-    msg = message.lower()
+    return _system_category(level, message.lower())
+
 
-    if level == "ERROR":
+def _system_category(level: str, msg: str) -> str:
+    if level == "ERROR" or level == "FATAL":
         return "ERROR"
 
     if any(k in msg for k in AUTH_KEYWORDS):
@@ -48,62 +42,111 @@ def system_categorize(level: str, message: str) -> str:
     return "GENERAL"
 
 
-def apply_user_rules(
-    message: str,
-    level: str,
-    user_categories: List[LogCategory],
-) -> Optional[int]:
+# (keywords, levels, category id) of each category, in rule order.
+CategoryRule = Tuple[Tuple[str, ...], Optional[FrozenSet[str]], int]
+
+
+def category_rules(categories: List[CategorySnapshot]) -> List[CategoryRule]:
+    return [(category.keywords, category.levels, category.id) for category in categories]
+
+
+def match_category(rules: List[CategoryRule], level: str, msg: str) -> Optional[int]:
     """
-    MVP behavior:
-    - If category name appears in message → match
+    Id of the first category whose rule matches a log, given its level
+    name and lowercased message; None to fall back to the system category.
     """
-    msg = message.lower()
+    for keywords, levels, category_id in rules:
+        if levels is not None and level not in levels:
+            continue
+        for keyword in keywords:
+            if keyword in msg:
+                return category_id
+    return None
 
-    for category in user_categories:
-        if category.name.lower() in msg:
-            return category.id
 
-    return None
+def apply_user_rules(
+    message: str,
+    level: str,
+    user_categories: List[CategorySnapshot],
+) -> Optional[int]:
+    return match_category(category_rules(user_categories), normalize_level(level), message.lower())
 
 
 # ---- Main processor ----
 
 def process_logs(
-    payload: LogIngestRequest,
-    project: Project,
-    user_categories: List[LogCategory],
+    batch: IngestBatch,
+    project: ProjectSnapshot,
+    user_categories: List[CategorySnapshot],
+    service_id: Optional[int] = None,
+    environment_id: Optional[int] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    rejected: Optional[List[Dict[str, Any]]] = None,
 ) -> List[dict]:
     """
-    Returns normalized + categorized log dicts.
+    Returns insert-ready log rows. ``category_id`` is resolved from the
+    cached categories; a row whose system category is not cached keeps its
+    name under ``category`` for ``resolve_category_ids``.
+    Rows also keep the level, service and environment names, which the
+    insert ignores but dimension counts and alert rules read.
+    ``sample_rates`` maps the levels the batch was sampled at to their rate.
     No DB writes.
+    Raises ``MetaTooLarge`` (with ``index`` set) when a log's meta exceeds
+    the project cap under the ``reject`` policy; given a ``rejected`` list,
+    such logs are skipped and reported there instead.
     """
-
-    processed_logs = []
-
-    for log in payload.logs:
-        level = normalize_level(log.level)
-        timestamp = normalize_timestamp(log.timestamp)
-
-        category_id = apply_user_rules(
-            message=log.message,
-            level=level,
-            user_categories=user_categories,
-        )
-
-        if category_id is None:
-            system_category_name = system_categorize(level, log.message)
-            # category_id resolution happens later (DB lookup)
-            category_id = system_category_name
-
-        processed_logs.append({
+    meta_policy = policy_for_project(project)
+    correlation_keys = get_settings().correlation_meta_keys
+
+    # Column-wise normalization: a batch has few distinct levels, and
+    # messages are lowercased once for all the keyword checks below.
+    level_map = {raw: normalize_level(raw) for raw in set(batch.levels)}
+    levels = [level_map[raw] for raw in batch.levels]
+    now = datetime.now(timezone.utc)
+    timestamps = [ts.astimezone(timezone.utc) if ts else now for ts in batch.timestamps]
+    lowered = [message.lower() for message in batch.messages]
+
+    sample_rates = sample_rates or {}
+    rules = category_rules(user_categories)
+    system_ids = {category.name: category.id for category in user_categories if category.is_system}
+
+    rows = []
+    for index, (timestamp, level, message, msg, meta) in enumerate(
+        zip(timestamps, levels, batch.messages, lowered, batch.metas)
+    ):
+        category_id = match_category(rules, level, msg)
+
+        try:
+            meta_columns = prepare_meta(meta, meta_policy)
+        except MetaTooLarge as exc:
+            exc.index = index
+            if rejected is None:
+                raise
+            rejected.append({"index": index, "reason": "meta_too_large", "error": str(exc)})
+            continue
+
+        row = {
             "project_id": project.id,
             "timestamp": timestamp,
+            "severity": SEVERITIES[level],
+            "service_id": service_id,
+            "environment_id": environment_id,
             "level": level,
-            "service": payload.service,
-            "environment": payload.environment,
-            "message": log.message,
-            "meta": log.meta,
-            "category": category_id,  # name for now
-        })
-
-    return processed_logs
+            "service": batch.service,
+            "environment": batch.environment,
+            "message": message,
+            "correlation_id": extract_correlation_id(meta, correlation_keys),
+            "sample_rate": sample_rates.get(level),
+            **meta_columns,
+        }
+
+        if category_id is None:
+            system_name = _system_category(level, msg)
+            category_id = system_ids.get(system_name)
+            if category_id is None:
+                row["category"] = system_name
+
+        row["category_id"] = category_id
+        rows.append(row)
+
+    return rows
@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import or_, cast, select, String
+from sqlalchemy.orm import Query
+
+from app.core.severity import SeverityRange
+from app.models.log_entry import LogEntry
+from app.models.log_category import LogCategory
+from app.models.log_service import LogService
+from app.services.meta_filters import MetaFilter, apply_meta_filters
+
+
+def apply_dashboard_filters(
+    query: Query,
+    project_id: int,
+    level: Optional[SeverityRange] = None,
+    category: Optional[str] = None,
+    service: Optional[str] = None,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    search: Optional[str] = None,
+    meta_filters: Sequence[MetaFilter] = (),
+    promoted_keys: Sequence[str] = (),
+) -> Query:
+    """
+    Applies the dashboard filter set to a query over ``LogEntry``.
+    Shared by the dashboard listing and the bulk export.
+    """
+
+    query = query.filter(LogEntry.project_id == project_id)
+
+    if level:
+        if level.min == level.max:
+            query = query.filter(LogEntry.severity == level.min)
+        else:
+            if level.min is not None:
+                query = query.filter(LogEntry.severity >= level.min)
+            if level.max is not None:
+                query = query.filter(LogEntry.severity <= level.max)
+
+    if service:
+        query = query.filter(
+            LogEntry.service_id == (
+                select(LogService.id)
+                .where(LogService.project_id == project_id, LogService.name == service)
+                .scalar_subquery()
+            )
+        )
+
+    if from_ts:
+        query = query.filter(LogEntry.timestamp >= from_ts)
+
+    if to_ts:
+        query = query.filter(LogEntry.timestamp <= to_ts)
+
+    if category:
+        query = (
+            query.join(LogCategory, LogEntry.category_id == LogCategory.id)
+            .filter(LogCategory.name == category)
+        )
+
+    if search:
+        term = f"%{search}%"
+        query = query.filter(
+            or_(
+                LogEntry.message.ilike(term),
+                cast(LogEntry.meta, String).ilike(term),
+                # Compressed meta is only searchable through its preview.
+                LogEntry.meta_preview.ilike(term),
+            )
+        )
+
+    return apply_meta_filters(query, project_id, meta_filters, promoted_keys)
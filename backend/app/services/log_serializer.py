@@ -0,0 +1,144 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import Response
+from sqlalchemy import case, select
+
+from app.core.severity import SEVERITY_NAMES
+from app.models.log_entry import LogEntry
+from app.models.log_environment import LogEnvironment
+from app.models.log_service import LogService
+from app.services.meta_policy import decompress_meta
+
+
+# Logs store a severity and dictionary ids; the API speaks names.
+LEVEL_NAME = case(SEVERITY_NAMES, value=LogEntry.severity)
+SERVICE_NAME = (
+    select(LogService.name)
+    .where(LogService.id == LogEntry.service_id)
+    .scalar_subquery()
+)
+ENVIRONMENT_NAME = (
+    select(LogEnvironment.name)
+    .where(LogEnvironment.id == LogEntry.environment_id)
+    .scalar_subquery()
+)
+
+# Public field name -> selected column.
+LOG_FIELDS = {
+    "id": LogEntry.id,
+    "timestamp": LogEntry.timestamp,
+    "level": LEVEL_NAME,
+    "service": SERVICE_NAME,
+    "environment": ENVIRONMENT_NAME,
+    "message": LogEntry.message,
+    "category_id": LogEntry.category_id,
+    "correlation_id": LogEntry.correlation_id,
+    "sample_rate": LogEntry.sample_rate,
+    "meta": LogEntry.meta,
+    "has_meta": LogEntry.meta_size > 0,
+    "meta_preview": LogEntry.meta_preview,
+}
+
+# Full rows, as returned by ``GET /logs/{id}`` and the export.
+DEFAULT_FIELDS: Tuple[str, ...] = (
+    "id",
+    "timestamp",
+    "level",
+    "service",
+    "environment",
+    "message",
+    "category_id",
+    "correlation_id",
+    "sample_rate",
+    "meta",
+)
+
+# List endpoints carry a meta preview instead of the full blob.
+LIST_FIELDS: Tuple[str, ...] = (
+    "id",
+    "timestamp",
+    "level",
+    "service",
+    "environment",
+    "message",
+    "category_id",
+    "correlation_id",
+    "has_meta",
+    "meta_preview",
+)
+
+
+def parse_fields(
+    fields: Optional[str],
+    default: Tuple[str, ...] = DEFAULT_FIELDS,
+) -> Tuple[str, ...]:
+    """
+    Parses a sparse fieldset such as ``"id,timestamp,message"``.
+    ``id`` is always included so rows stay addressable.
+    Raises ``ValueError`` for unknown field names.
+    """
+    if not fields:
+        return default
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+
+    unknown = [name for name in requested if name not in LOG_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Allowed: {', '.join(LOG_FIELDS)}"
+        )
+
+    selected = ["id"] + [name for name in requested if name != "id"]
+    return tuple(dict.fromkeys(selected))
+
+
+def log_columns(fields: Sequence[str]) -> List[Any]:
+    """
+    Columns to select for ``fields``. When ``meta`` is requested the
+    compressed ``meta_blob`` is appended as a trailing hidden column.
+    """
+    columns = [LOG_FIELDS[name] for name in fields]
+    if "meta" in fields:
+        columns.append(LogEntry.meta_blob)
+    return columns
+
+
+def row_to_item(fields: Sequence[str], row: Sequence[Any]) -> Dict[str, Any]:
+    item = dict(zip(fields, row))
+
+    if "meta" in item and item["meta"] is None and row[-1] is not None:
+        item["meta"] = decompress_meta(row[-1])
+
+    if "has_meta" in item:
+        item["has_meta"] = bool(item["has_meta"])
+
+    return item
+
+
+def rows_to_items(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    if "meta" not in fields and "has_meta" not in fields:
+        return [dict(zip(fields, row)) for row in rows]
+    return [row_to_item(fields, row) for row in rows]
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Serializes straight to JSON bytes, skipping FastAPI's
+    ``jsonable_encoder`` pass over every row.
+    """
+    return Response(
+        content=dumps(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -1,5 +1,6 @@
 # app/services/log_writer.py
 from typing import List, Dict, Any
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.log_entry import LogEntry
@@ -10,11 +11,13 @@ def resolve_category_ids(
     db: Session,
     project_id: int,
     logs: List[Dict[str, Any]],
-) -> None:
+) -> List[Dict[str, Any]]:
     """
     Mutates logs in-place.
     Replaces category name with category_id.
     If category is missing or invalid, assigns DEFAULT_CATEGORY_ID.
+    Returns the logs naming a category the project does not have; they
+    keep their ``category`` and get no ``category_id``.
     """
 
     # Collect all category names from logs that are strings
@@ -41,6 +44,8 @@ def resolve_category_ids(
     # Fallback category ID if none provided or not found
     DEFAULT_CATEGORY_ID = 1
 
+    missing = []
+
     for log in logs:
         cat_value = log.get("category")
 
@@ -48,9 +53,8 @@ def resolve_category_ids(
             # Lookup category ID from map
             category_id = category_map.get(cat_value)
             if not category_id:
-                raise RuntimeError(
-                    f"Category '{cat_value}' not found for project {project_id}"
-                )
+                missing.append(log)
+                continue
             log["category_id"] = category_id
 
         elif isinstance(cat_value, int):
@@ -59,30 +63,56 @@ def resolve_category_ids(
 
         else:
             # Missing or invalid category, use default
-            log["category_id"] = DEFAULT_CATEGORY_ID
+            # (keeping an id resolved by an earlier call)
+            log.setdefault("category_id", DEFAULT_CATEGORY_ID)
 
         # Remove original category key
         if "category" in log:
             del log["category"]
 
+    return missing
+
 
 def bulk_insert_logs(
     db: Session,
     project_id: int,
     logs: List[Dict[str, Any]],
+    commit: bool = True,
 ) -> int:
     """
     Inserts logs in bulk.
     Returns number of rows inserted.
+    Expects ``category_id`` already set by ``resolve_category_ids``, and
+    every row to have the same keys (one Core ``executemany``, no ORM
+    bookkeeping per row). Keys that are not ``logs`` columns are ignored.
     """
 
     if not logs:
         return 0
 
-    # 🔑 REQUIRED: resolve category_id before insert
-    resolve_category_ids(db, project_id, logs)
-
-    db.bulk_insert_mappings(LogEntry, logs)
-    db.commit()
+    db.execute(insert(LogEntry.__table__), logs)
+    if commit:
+        db.commit()
 
     return len(logs)
+
+
+def insert_logs_returning_ids(
+    db: Session,
+    logs: List[Dict[str, Any]],
+) -> List[int]:
+    """
+    Like ``bulk_insert_logs`` without committing, but returns the new ids
+    in input order (batched ``INSERT ... RETURNING``). Slightly slower, so
+    only used when rows have to be referenced right away.
+    """
+    if not logs:
+        return []
+
+    result = db.execute(
+        insert(LogEntry.__table__).returning(
+            LogEntry.__table__.c.id, sort_by_parameter_order=True
+        ),
+        logs,
+    )
+    return list(result.scalars())
@@ -0,0 +1,193 @@
+import json
+import operator
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import String, and_, cast, literal, not_, or_, select
+from sqlalchemy.orm import Query
+
+from app.models.log_entry import LogEntry
+from app.models.log_meta_index import LogMetaIndex
+
+
+META_PARAM_PREFIX = "meta."
+META_OPERATORS = (">=", "<=", "!=", "=", ">", "<")
+MAX_META_FILTERS = 10
+
+_PATH_RE = re.compile(r"^[A-Za-z0-9_\-]+(\.[A-Za-z0-9_\-]+)*$")
+_EXPRESSION_RE = re.compile(
+    r"^(?P<path>[^<>!=]+)(?P<op>" + "|".join(re.escape(op) for op in META_OPERATORS) + r")(?P<value>.*)$"
+)
+
+
+@dataclass(frozen=True)
+class MetaFilter:
+    path: Tuple[str, ...]
+    op: str
+    value: Any
+
+    @property
+    def key(self) -> str:
+        return ".".join(self.path)
+
+
+def _typed(raw: str) -> Any:
+    """
+    ``123`` -> 123, ``1.5`` -> 1.5, ``true``/``false``/``null`` -> JSON
+    literals, anything else stays a string. Quote a value (``"123"``) to
+    force a string.
+    """
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        return raw[1:-1]
+    if raw in ("true", "false", "null"):
+        return json.loads(raw)
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def parse_meta_filters(params: Iterable[Tuple[str, str]]) -> List[MetaFilter]:
+    """
+    Parses ``meta.<path><op><value>`` query parameters, e.g.
+    ``meta.user_id=123``, ``meta.status>=500``, ``meta.http.method!=GET``.
+
+    In a query string ``meta.status>=500`` arrives as the parameter
+    ``meta.status>`` with value ``500``, and ``meta.status>500`` as a
+    parameter without a value; both are reassembled here.
+    Raises ``ValueError`` for malformed filters.
+    """
+    filters = []
+    for name, value in params:
+        if not name.startswith(META_PARAM_PREFIX):
+            continue
+
+        expression = name[len(META_PARAM_PREFIX):]
+        if value or not any(op in expression for op in ("<", ">", "!")):
+            expression = f"{expression}={value}"
+
+        match = _EXPRESSION_RE.match(expression)
+        if not match or not _PATH_RE.match(match["path"]):
+            raise ValueError(f"Invalid meta filter: {name}={value}")
+
+        op, raw = match["op"], match["value"]
+        typed = _typed(raw)
+        if op not in ("=", "!=") and not isinstance(typed, (int, float, str)):
+            raise ValueError(f"Meta filter {name!r}: {op} needs a number or string")
+
+        filters.append(MetaFilter(path=tuple(match["path"].split(".")), op=op, value=typed))
+
+    if len(filters) > MAX_META_FILTERS:
+        raise ValueError(f"At most {MAX_META_FILTERS} meta filters are allowed")
+
+    return filters
+
+
+def _nest(path: Sequence[str], value: Any) -> Any:
+    for key in reversed(path):
+        value = {key: value}
+    return value
+
+
+def _jsonpath(f: MetaFilter) -> str:
+    accessor = "$" + "".join(f".{json.dumps(key)}" for key in f.path)
+    op = "==" if f.op == "=" else f.op
+    return f"{accessor} ? (@ {op} {json.dumps(f.value)})"
+
+
+def _postgres_condition(f: MetaFilter):
+    from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+
+    if f.op in ("=", "!="):
+        # ``@>`` containment is answered by the GIN index. Numbers also
+        # match their string form, since clients are not consistent.
+        candidates = [f.value]
+        if isinstance(f.value, (int, float)) and not isinstance(f.value, bool):
+            candidates.append(str(f.value))
+        condition = or_(*(
+            LogEntry.meta.op("@>")(cast(literal(json.dumps(_nest(f.path, v))), JSONB))
+            for v in candidates
+        ))
+        return condition if f.op == "=" else not_(condition)
+
+    return LogEntry.meta.op("@?")(cast(literal(_jsonpath(f)), JSONPATH))
+
+
+def _generic_condition(f: MetaFilter):
+    element = LogEntry.meta[f.path]
+
+    if isinstance(f.value, bool) or f.value is None:
+        column, value = cast(element, String), json.dumps(f.value)
+    elif isinstance(f.value, (int, float)):
+        column, value = element.as_float(), f.value
+    else:
+        column, value = element.as_string(), f.value
+
+    return _compare(column, f.op, value)
+
+
+def _compare(column, op: str, value: Any):
+    if op == "!=":
+        return not_(column == value)
+    return _COMPARATORS[op](column, value)
+
+
+_COMPARATORS = {
+    "=": operator.eq,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+def _promoted_condition(f: MetaFilter, project_id: int):
+    index = LogMetaIndex
+    numeric = isinstance(f.value, (int, float)) and not isinstance(f.value, bool)
+    column = index.value_num if numeric else index.value_text
+    value = f.value if numeric or isinstance(f.value, str) else json.dumps(f.value)
+
+    matching = select(index.log_id).where(
+        index.project_id == project_id,
+        index.key == f.key,
+        _compare(column, "=" if f.op == "!=" else f.op, value),
+    )
+    condition = LogEntry.id.in_(matching)
+    return condition if f.op != "!=" else not_(condition)
+
+
+def apply_meta_filters(
+    query: Query,
+    project_id: int,
+    filters: Sequence[MetaFilter],
+    promoted_keys: Sequence[str] = (),
+) -> Query:
+    """
+    Adds meta filters to a query over ``LogEntry``.
+
+    Promoted keys are looked up in ``log_meta_index`` (a btree probe on
+    any database). Other keys use JSONB containment / jsonpath on
+    PostgreSQL, backed by the GIN index on ``logs.meta``, and JSON
+    extraction elsewhere. Compressed meta (``meta_blob``) is matched on
+    promoted keys only, which are indexed from the full meta at ingest.
+    """
+    if not filters:
+        return query
+
+    dialect = query.session.get_bind().dialect.name
+
+    conditions = []
+    for f in filters:
+        if f.key in promoted_keys:
+            conditions.append(_promoted_condition(f, project_id))
+        elif dialect == "postgresql":
+            conditions.append(_postgres_condition(f))
+        else:
+            conditions.append(_generic_condition(f))
+
+    return query.filter(and_(*conditions))
@@ -0,0 +1,88 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.log_meta_index import LogMetaIndex
+
+
+VALUE_TEXT_MAX = 255
+
+
+def lookup_path(meta: Dict[str, Any], key: str) -> Any:
+    """
+    Value at a dotted path (``"http.status"``) in a meta dict, or None.
+    """
+    value: Any = meta
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+CORRELATION_ID_MAX = 128
+
+
+def extract_correlation_id(
+    meta: Optional[Dict[str, Any]],
+    keys: Sequence[str],
+) -> Optional[str]:
+    """
+    First string or integer value found under ``keys`` in the original
+    (untruncated) meta.
+    """
+    if not meta:
+        return None
+    for key in keys:
+        value = lookup_path(meta, key) if "." in key else meta.get(key)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (str, int)) and value != "":
+            return str(value)[:CORRELATION_ID_MAX]
+    return None
+
+
+def promoted_values(meta: Optional[Dict[str, Any]], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Index rows (without ``log_id``) for the promoted keys present in
+    ``meta``. Objects and arrays are not indexed.
+    """
+    if not meta:
+        return []
+
+    rows = []
+    for key in keys:
+        value = lookup_path(meta, key)
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        if isinstance(value, bool):
+            rows.append({"key": key, "value_text": json.dumps(value), "value_num": None})
+        elif isinstance(value, (int, float)):
+            rows.append({"key": key, "value_text": str(value), "value_num": float(value)})
+        else:
+            rows.append({"key": key, "value_text": str(value)[:VALUE_TEXT_MAX], "value_num": None})
+    return rows
+
+
+def record_promoted_meta(
+    db: Session,
+    project_id: int,
+    log_ids: Sequence[int],
+    metas: Sequence[Optional[Dict[str, Any]]],
+    keys: Sequence[str],
+) -> int:
+    """
+    Writes index rows for freshly inserted logs, in the caller's
+    transaction. ``metas`` are the original (untruncated) blobs, aligned
+    with ``log_ids``. Returns the number of index rows written.
+    """
+    rows = [
+        {"log_id": log_id, "project_id": project_id, **row}
+        for log_id, meta in zip(log_ids, metas)
+        for row in promoted_values(meta, keys)
+    ]
+    if rows:
+        db.execute(insert(LogMetaIndex), rows)
+    return len(rows)
@@ -0,0 +1,116 @@
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import orjson
+
+from app.config import get_settings
+
+
+# Matches the width of ``LogEntry.meta_preview``.
+META_PREVIEW_CHARS = 200
+
+OVERFLOW_TRUNCATE = "truncate"
+OVERFLOW_REJECT = "reject"
+
+
+class MetaTooLarge(Exception):
+    """
+    Raised when a meta blob exceeds the project cap
+    and the project's overflow policy is ``reject``.
+    """
+
+    def __init__(self, size: int, max_bytes: int, index: Optional[int] = None):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.index = index
+        super().__init__(f"meta is {size} bytes, limit is {max_bytes} bytes")
+
+
+@dataclass(frozen=True)
+class MetaPolicy:
+    max_bytes: int
+    overflow: str = OVERFLOW_TRUNCATE
+    compress_min_bytes: Optional[int] = None
+
+
+def policy_for_project(project) -> MetaPolicy:
+    """
+    Resolves the meta limits for a project, falling back to the settings
+    defaults for anything the project does not override.
+    """
+    settings = get_settings()
+    max_bytes = getattr(project, "meta_max_bytes", None)
+    overflow = getattr(project, "meta_overflow_policy", None)
+    compress_min_bytes = getattr(project, "meta_compress_min_bytes", None)
+
+    return MetaPolicy(
+        max_bytes=max_bytes if max_bytes is not None else settings.meta_max_bytes,
+        overflow=overflow or settings.meta_overflow_policy,
+        compress_min_bytes=(
+            compress_min_bytes
+            if compress_min_bytes is not None
+            else settings.meta_compress_min_bytes
+        ),
+    )
+
+
+def _truncate(meta: Dict[str, Any], encoded_size: int, max_bytes: int) -> Dict[str, Any]:
+    """
+    Keeps top-level keys in order while they fit under the cap,
+    so the truncated blob is still a valid, queryable object.
+    """
+    truncated: Dict[str, Any] = {"_truncated": True, "_original_size": encoded_size}
+    budget = max_bytes - len(orjson.dumps(truncated))
+
+    for key, value in meta.items():
+        # key + value + quotes, colon and comma
+        cost = len(orjson.dumps(key)) + len(orjson.dumps(value)) + 2
+        if cost > budget:
+            continue
+        truncated[key] = value
+        budget -= cost
+
+    return truncated
+
+
+def prepare_meta(
+    meta: Optional[Dict[str, Any]],
+    policy: MetaPolicy,
+) -> Dict[str, Any]:
+    """
+    Returns the meta-related column values for one log row:
+    ``meta``, ``meta_size``, ``meta_preview`` and ``meta_blob``.
+    ``meta_size`` is the JSON size of the meta as stored (after truncation,
+    before compression); a truncated blob keeps the size it arrived with
+    in ``_original_size``.
+    """
+    if not meta:
+        return {"meta": meta, "meta_size": 0, "meta_preview": None, "meta_blob": None}
+
+    encoded = orjson.dumps(meta)
+    size = len(encoded)
+
+    if size > policy.max_bytes:
+        if policy.overflow == OVERFLOW_REJECT:
+            raise MetaTooLarge(size, policy.max_bytes)
+
+        meta = _truncate(meta, size, policy.max_bytes)
+        encoded = orjson.dumps(meta)
+        size = len(encoded)
+
+    preview = encoded[: META_PREVIEW_CHARS * 4].decode("utf-8", "ignore")[:META_PREVIEW_CHARS]
+
+    if policy.compress_min_bytes is not None and len(encoded) >= policy.compress_min_bytes:
+        return {
+            "meta": None,
+            "meta_size": size,
+            "meta_preview": preview,
+            "meta_blob": zlib.compress(encoded),
+        }
+
+    return {"meta": meta, "meta_size": size, "meta_preview": preview, "meta_blob": None}
+
+
+def decompress_meta(blob: bytes) -> Dict[str, Any]:
+    return orjson.loads(zlib.decompress(blob))
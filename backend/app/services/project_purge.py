@@ -0,0 +1,137 @@
+"""
+Chunked project deletion.
+
+Deleting a project in one transaction removes every one of its logs in a
+single statement, which on a large tenant runs for a long time, holds its
+locks throughout and floods the WAL while other projects ingest. Instead,
+``request_project_deletion`` only marks the project ``deleting``: its API
+key, dashboard tokens and queued batches are refused from then on. The
+project purger (``python -m app.workers.project_purger``) then deletes its
+rows ``PROJECT_PURGE_BATCH_SIZE`` at a time, one short transaction per batch
+with a pause in between, and removes the project itself last.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.project_cache import invalidate_project
+from app.models.alert import Alert
+from app.models.alert_rule import AlertRule
+from app.models.ingest_batch_id import IngestBatchId
+from app.models.ingest_job import IngestJob
+from app.models.log_category import LogCategory
+from app.models.log_dimension import LogDimension
+from app.models.log_entry import LogEntry
+from app.models.log_environment import LogEnvironment
+from app.models.log_meta_index import LogMetaIndex
+from app.models.log_service import LogService
+from app.models.project import PROJECT_DELETING, Project
+from app.models.recategorize_job import RecategorizeJob
+from app.services.alerting import invalidate_project_rules
+from app.services.category_cache import invalidate_project_categories
+from app.services.dashboard_cache import bump_logs_version, invalidate_project_logs
+
+
+# Large per-project tables, emptied in batches (after ``logs``).
+_BATCHED_MODELS = (Alert, LogDimension)
+
+# Small per-project tables, deleted with the project.
+_FINAL_MODELS = (
+    IngestJob,
+    IngestBatchId,
+    AlertRule,
+    RecategorizeJob,
+    LogCategory,
+    LogService,
+    LogEnvironment,
+)
+
+
+def request_project_deletion(db: Session, project: Project) -> None:
+    """
+    Marks a project for deletion and drops it from this process's caches.
+    Other processes refuse it once their cached snapshots expire.
+    """
+    if project.status != PROJECT_DELETING:
+        project.status = PROJECT_DELETING
+        project.deletion_requested_at = datetime.now(timezone.utc)
+        db.commit()
+
+    invalidate_project(project.id)
+    invalidate_project_categories(project.id)
+    invalidate_project_logs(project.id)
+    invalidate_project_rules(project.id)
+
+
+def deletion_status(db: Session, project: Project) -> Dict[str, Any]:
+    # Every log is counted once under the "level" dimension; the counts
+    # are purged after the logs.
+    counted = (
+        db.query(func.coalesce(func.sum(LogDimension.count), 0))
+        .filter(LogDimension.project_id == project.id, LogDimension.dimension == "level")
+        .scalar()
+    )
+    return {
+        "project_id": project.id,
+        "status": project.status,
+        "deletion_requested_at": project.deletion_requested_at,
+        "purged_logs": project.purged_logs or 0,
+        "remaining_logs_estimate": max(int(counted) - (project.purged_logs or 0), 0),
+    }
+
+
+def claim_deleting_project(db: Session) -> Optional[Project]:
+    """
+    Locks the project deleted longest ago for the current transaction,
+    skipping projects another purger holds.
+    """
+    return (
+        db.query(Project)
+        .filter(Project.status == PROJECT_DELETING)
+        .order_by(Project.deletion_requested_at, Project.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+
+
+def _delete_batch(db: Session, model, project_id: int, batch_size: int) -> int:
+    ids = [
+        row_id
+        for (row_id,) in (
+            db.query(model.id)
+            .filter(model.project_id == project_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        )
+    ]
+    if not ids:
+        return 0
+    if model is LogEntry:
+        # Cascaded on PostgreSQL; explicit for databases without it.
+        db.query(LogMetaIndex).filter(LogMetaIndex.log_id.in_(ids)).delete(synchronize_session=False)
+    db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+    return len(ids)
+
+
+def purge_batch(db: Session, project: Project, batch_size: int) -> bool:
+    """
+    Deletes the next batch of a deleting project's rows in the caller's
+    transaction. Returns True once the project itself was deleted.
+    """
+    deleted = _delete_batch(db, LogEntry, project.id, batch_size)
+    if deleted:
+        project.purged_logs = (project.purged_logs or 0) + deleted
+        bump_logs_version(db, project.id)
+        return False
+
+    for model in _BATCHED_MODELS:
+        if _delete_batch(db, model, project.id, batch_size):
+            return False
+
+    for model in _FINAL_MODELS:
+        db.query(model).filter(model.project_id == project.id).delete(synchronize_session=False)
+    db.delete(project)
+    return True
@@ -0,0 +1,204 @@
+"""
+Category backfills: re-evaluating stored logs against changed category rules.
+
+Category rules are applied at ingest, so a new or edited category only
+affects logs written after the change. A ``RecategorizeJob`` brings the logs
+of a time range in line. The recategorizer worker walks them in
+``(timestamp, id)`` keyset order on the ``(project_id, timestamp)`` index,
+one chunk of ``RECATEGORIZE_CHUNK_SIZE`` logs per transaction, rewrites only
+the logs whose category changes and moves their hourly dimension counts
+along. The job row is locked for the chunk and its cursor committed with the
+updates, so concurrent workers never process the same job at once and a
+stopped worker resumes after the last committed chunk.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.severity import DEFAULT_LEVEL, SEVERITY_NAMES
+from app.models.log_dimension import LogDimension
+from app.models.log_entry import LogEntry
+from app.models.recategorize_job import RecategorizeJob
+from app.services.category_cache import load_project_categories
+from app.services.dashboard_cache import bump_logs_version
+from app.services.log_dimensions import hour_bucket, move_dimension_values
+from app.services.log_processor import category_rules, match_category, system_categorize
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (JOB_PENDING, JOB_RUNNING)
+
+
+def active_job(db: Session, project_id: int) -> Optional[RecategorizeJob]:
+    return (
+        db.query(RecategorizeJob)
+        .filter(
+            RecategorizeJob.project_id == project_id,
+            RecategorizeJob.status.in_(ACTIVE_STATUSES),
+        )
+        .first()
+    )
+
+
+def create_job(
+    db: Session,
+    project_id: int,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+) -> RecategorizeJob:
+    job = RecategorizeJob(
+        project_id=project_id,
+        status=JOB_PENDING,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        scanned=0,
+        updated=0,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def job_progress(job: RecategorizeJob) -> Optional[float]:
+    """
+    Approximate fraction of the job done: logs scanned out of the logs the
+    dimension counts gave for its range when it started.
+    """
+    if job.status == JOB_DONE:
+        return 1.0
+    if not job.total_estimate:
+        return None
+    return round(min(job.scanned / job.total_estimate, 1.0), 4)
+
+
+def claim_job(db: Session, created_before: datetime) -> Optional[RecategorizeJob]:
+    """
+    Locks the oldest active job created before ``created_before`` for the
+    current transaction, skipping jobs another worker holds.
+    """
+    return (
+        db.query(RecategorizeJob)
+        .filter(
+            RecategorizeJob.status.in_(ACTIVE_STATUSES),
+            RecategorizeJob.created_at <= created_before,
+        )
+        .order_by(RecategorizeJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+
+
+def start_job(db: Session, job: RecategorizeJob) -> None:
+    """
+    Fixes the open ends of the job's range and estimates its size.
+    """
+    now = datetime.now(timezone.utc)
+    if job.to_ts is None:
+        job.to_ts = now
+    if job.from_ts is None:
+        job.from_ts = (
+            db.query(func.min(LogEntry.timestamp))
+            .filter(LogEntry.project_id == job.project_id)
+            .scalar()
+        ) or job.to_ts
+
+    # Every log is counted once under the "level" dimension.
+    job.total_estimate = (
+        db.query(func.coalesce(func.sum(LogDimension.count), 0))
+        .filter(
+            LogDimension.project_id == job.project_id,
+            LogDimension.dimension == "level",
+            LogDimension.bucket >= hour_bucket(job.from_ts),
+            LogDimension.bucket <= hour_bucket(job.to_ts),
+        )
+        .scalar()
+    )
+    job.status = JOB_RUNNING
+    job.started_at = now
+    job.updated_at = now
+
+
+def process_chunk(db: Session, job: RecategorizeJob, chunk_size: int) -> int:
+    """
+    Re-evaluates the next ``chunk_size`` logs of a running job and advances
+    its cursor, in the caller's transaction. Marks the job done after the
+    last chunk. Returns the number of logs scanned.
+    """
+    categories = load_project_categories(db, job.project_id)
+    rules = category_rules(categories)
+    system_ids = {category.name: category.id for category in categories if category.is_system}
+
+    query = db.query(
+        LogEntry.id,
+        LogEntry.timestamp,
+        LogEntry.severity,
+        LogEntry.message,
+        LogEntry.category_id,
+        LogEntry.sample_rate,
+    ).filter(
+        LogEntry.project_id == job.project_id,
+        LogEntry.timestamp >= job.from_ts,
+        LogEntry.timestamp < job.to_ts,
+    )
+    if job.cursor_id is not None:
+        # The plain timestamp bound is what the index range scan uses;
+        # the row comparison skips the logs of the cursor's own timestamp.
+        query = query.filter(
+            LogEntry.timestamp >= job.cursor_ts,
+            tuple_(LogEntry.timestamp, LogEntry.id) > tuple_(job.cursor_ts, job.cursor_id),
+        )
+    rows = query.order_by(LogEntry.timestamp, LogEntry.id).limit(chunk_size).all()
+
+    changed: Dict[int, List[int]] = defaultdict(list)
+    moves = []
+    for log_id, timestamp, severity, message, category_id, sample_rate in rows:
+        level = SEVERITY_NAMES.get(severity, DEFAULT_LEVEL)
+        new_id = match_category(rules, level, message.lower())
+        if new_id is None:
+            new_id = system_ids.get(system_categorize(level, message))
+        if new_id is None or new_id == category_id:
+            continue
+        changed[new_id].append(log_id)
+        moves.append((category_id, new_id, timestamp, sample_rate))
+
+    for category_id, log_ids in changed.items():
+        (
+            db.query(LogEntry)
+            .filter(LogEntry.id.in_(log_ids))
+            .update({LogEntry.category_id: category_id}, synchronize_session=False)
+        )
+    move_dimension_values(db, job.project_id, "category", moves)
+    if moves:
+        bump_logs_version(db, job.project_id)
+
+    now = datetime.now(timezone.utc)
+    if rows:
+        job.cursor_ts, job.cursor_id = rows[-1][1], rows[-1][0]
+    job.scanned += len(rows)
+    job.updated += len(moves)
+    job.updated_at = now
+    if len(rows) < chunk_size:
+        job.status = JOB_DONE
+        job.finished_at = now
+    return len(rows)
+
+
+def fail_job(db: Session, job_id: int, error: str) -> None:
+    job = db.get(RecategorizeJob, job_id)
+    if job is None or job.status not in ACTIVE_STATUSES:
+        return
+    job.status = JOB_FAILED
+    job.last_error = error[:2000]
+    job.updated_at = datetime.now(timezone.utc)
+    db.commit()
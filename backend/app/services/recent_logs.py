@@ -0,0 +1,340 @@
+"""
+In-memory buffers of the newest logs of recently viewed projects.
+
+"Latest page, no or simple filters" is by far the most requested dashboard
+view. A ``RecentLogs`` buffer holds a project's newest ``RECENT_LOGS_SIZE``
+logs by timestamp (list fields only) and answers such pages without
+reading ``logs``. Buffers exist only for projects whose dashboard was
+viewed in the last ``RECENT_LOGS_TTL_SECONDS`` (every view extends it); an
+expired buffer is rebuilt from the database on the next view.
+
+Logs ingested by this process are added right after their commit. Before
+answering, a buffer compares itself with the project watermark: logs that
+other processes wrote in the meantime are counted with one index probe and
+fetched only when they are not already in the buffer. Deletes, purges and
+recategorization by any process bump the project's logs version, which
+rebuilds the buffer.
+
+The watermark's newest id misses an insert that commits after a later id
+was already seen (a slow transaction holding a lower id), so buffers are
+also rebuilt once they are ``RECENT_LOGS_TTL_SECONDS`` old; that bounds how
+long such a log can be missing from them.
+"""
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.core.severity import SEVERITIES, SeverityRange
+from app.models.log_dimension import LogDimension
+from app.models.log_entry import LogEntry
+from app.services.category_cache import get_project_categories
+from app.services.dashboard_cache import Watermark, project_watermark
+from app.services.dashboard_planner import DashboardResult
+from app.services.log_serializer import LIST_FIELDS, log_columns, rows_to_items
+
+
+PLAN_RECENT = "recent"
+
+_COUNTED = ("level", "service", "category")
+
+_buffers: Optional[TTLCache] = None
+_buffers_lock = threading.Lock()
+
+
+def _sort_key(item: Dict[str, Any]):
+    return item["timestamp"], item["id"]
+
+
+def _utc(ts: datetime) -> datetime:
+    # SQLite returns naive timestamps; ingested rows carry UTC ones.
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def item_from_row(row: Dict[str, Any], log_id: int) -> Dict[str, Any]:
+    """
+    ``LIST_FIELDS`` item of an insert-ready row from the ingest pipeline.
+    """
+    return {
+        "id": log_id,
+        "timestamp": _utc(row["timestamp"]),
+        "level": row["level"],
+        "service": row["service"],
+        "environment": row["environment"],
+        "message": row["message"],
+        "category_id": row["category_id"],
+        "correlation_id": row["correlation_id"],
+        "has_meta": bool(row.get("meta_size")),
+        "meta_preview": row.get("meta_preview"),
+    }
+
+
+class RecentLogs:
+    """
+    The newest logs of one project, oldest first by ``(timestamp, id)``.
+    Complete for every log up to ``synced`` (plus the ``pending`` ids added
+    by this process since), and for the whole project while ``complete``.
+    """
+
+    def __init__(self, project_id: int, size: int):
+        self.project_id = project_id
+        self.size = size
+        self.lock = threading.Lock()
+        self.items: List[Dict[str, Any]] = []
+        self.ids: Set[int] = set()
+        self.synced: Optional[Watermark] = None
+        self.pending: Set[int] = set()
+        self.complete = False
+        self.built_at = 0.0
+        # (dimension, value) -> logs in the project, for page totals.
+        self.counts: Counter = Counter()
+
+    # ---- Maintenance (call with ``lock`` held) ----
+
+    def _merge(self, items: Iterable[Dict[str, Any]]) -> List[int]:
+        new = [item for item in items if item["id"] not in self.ids]
+        if not new:
+            return []
+
+        for item in new:
+            self.counts[("level", item["level"])] += 1
+            if item["service"] is not None:
+                self.counts[("service", item["service"])] += 1
+            self.counts[("category", str(item["category_id"]))] += 1
+
+        # Nearly sorted input: Timsort merges the runs in linear time.
+        merged = sorted(self.items + new, key=_sort_key)
+        if len(merged) > self.size:
+            merged = merged[-self.size:]
+            self.complete = False
+        self.items = merged
+        self.ids = {item["id"] for item in merged}
+        return [item["id"] for item in new]
+
+    def _fetch(self, db: Session, *conditions) -> List[Dict[str, Any]]:
+        rows = (
+            db.query(*log_columns(LIST_FIELDS))
+            .filter(LogEntry.project_id == self.project_id, *conditions)
+            .order_by(LogEntry.timestamp.desc())
+            .limit(self.size)
+            .all()
+        )
+        items = rows_to_items(LIST_FIELDS, rows)
+        for item in items:
+            item["timestamp"] = _utc(item["timestamp"])
+        return items
+
+    def _rebuild(self, db: Session, watermark: Watermark) -> None:
+        items = self._fetch(db, LogEntry.id <= watermark[0])
+
+        counts = (
+            db.query(LogDimension.dimension, LogDimension.value, func.sum(LogDimension.count))
+            .filter(
+                LogDimension.project_id == self.project_id,
+                LogDimension.dimension.in_(_COUNTED),
+            )
+            .group_by(LogDimension.dimension, LogDimension.value)
+            .all()
+        )
+
+        self.items = sorted(items, key=_sort_key)
+        self.ids = {item["id"] for item in items}
+        self.complete = len(items) < self.size
+        self.counts = Counter({(dimension, value): int(count) for dimension, value, count in counts})
+        self.pending = set()
+        self.synced = watermark
+        self.built_at = time.monotonic()
+
+    def sync(self, db: Session) -> None:
+        """
+        Brings the buffer up to the project's current watermark.
+        """
+        watermark = project_watermark(db, self.project_id)
+        with self.lock:
+            synced = self.synced
+            if (
+                synced is None
+                or watermark[1] != synced[1]
+                or watermark[0] < synced[0]
+                or time.monotonic() - self.built_at >= get_settings().recent_logs_ttl_seconds
+            ):
+                self._rebuild(db, watermark)
+                return
+            if watermark[0] == synced[0]:
+                return
+
+            newest = watermark[0]
+            local = sum(1 for log_id in self.pending if log_id <= newest)
+            arrived = (
+                db.query(func.count(LogEntry.id))
+                .filter(
+                    LogEntry.project_id == self.project_id,
+                    LogEntry.id > synced[0],
+                    LogEntry.id <= newest,
+                )
+                .scalar()
+            )
+            if arrived > self.size:
+                self._rebuild(db, watermark)
+                return
+            if arrived != local:
+                self._merge(self._fetch(db, LogEntry.id > synced[0], LogEntry.id <= newest))
+
+            self.synced = watermark
+            self.pending = {log_id for log_id in self.pending if log_id > newest}
+
+    def add(self, items: Sequence[Dict[str, Any]]) -> None:
+        """
+        Adds logs this process just committed.
+        """
+        with self.lock:
+            if self.synced is None:
+                return
+            added = self._merge(items)
+            self.pending.update(log_id for log_id in added if log_id > self.synced[0])
+
+    # ---- Reads ----
+
+    def page(
+        self,
+        limit: int,
+        offset: int,
+        level: Optional[SeverityRange] = None,
+        service: Optional[str] = None,
+        category_id: Optional[int] = None,
+    ) -> Optional[DashboardResult]:
+        """
+        The page newest first, or None when the buffer cannot answer it
+        exactly.
+        """
+        filters = [f for f in (level, service, category_id) if f is not None]
+        with self.lock:
+            items = self.items
+            complete = self.complete
+            counts = self.counts
+
+            matches = []
+            needed = offset + limit
+            for item in reversed(items):
+                if level is not None:
+                    severity = SEVERITIES[item["level"]]
+                    if (level.min is not None and severity < level.min) or (
+                        level.max is not None and severity > level.max
+                    ):
+                        continue
+                if service is not None and item["service"] != service:
+                    continue
+                if category_id is not None and item["category_id"] != category_id:
+                    continue
+                matches.append(item)
+                if len(matches) >= needed and not complete:
+                    break
+
+            if len(matches) < needed and not complete:
+                return None
+
+            rows = matches[offset:needed]
+            if complete:
+                return DashboardResult(rows, len(matches), False, PLAN_RECENT)
+            if len(filters) > 1:
+                return None
+
+            if level is not None:
+                total = sum(counts[("level", name)] for name in level.levels())
+            elif service is not None:
+                total = counts[("service", service)]
+            elif category_id is not None:
+                total = counts[("category", str(category_id))]
+            else:
+                total = sum(count for (dimension, _), count in counts.items() if dimension == "level")
+
+        return DashboardResult(rows, max(total, needed), True, PLAN_RECENT)
+
+
+def recent_logs_buffers() -> TTLCache:
+    global _buffers
+    if _buffers is None:
+        settings = get_settings()
+        _buffers = TTLCache(
+            maxsize=settings.recent_logs_max_projects,
+            ttl=settings.recent_logs_ttl_seconds,
+            name="recent_logs",
+        )
+    return _buffers
+
+
+def is_tracked(project_id: int) -> bool:
+    """
+    Whether ingest should hand this project's new logs to its buffer.
+    """
+    return get_settings().recent_logs_size > 0 and recent_logs_buffers().get(project_id) is not None
+
+
+def record_ingested(project_id: int, rows: Sequence[Dict[str, Any]], log_ids: Sequence[int]) -> None:
+    """
+    Adds committed rows of the ingest pipeline to the project's buffer.
+    """
+    buffer = recent_logs_buffers().get(project_id)
+    if buffer is not None:
+        buffer.add([item_from_row(row, log_id) for row, log_id in zip(rows, log_ids)])
+
+
+def _buffer_for(project_id: int) -> RecentLogs:
+    """
+    The project's buffer, created on first view. Every view restarts its
+    time to live, so buffers of projects still being viewed are kept.
+    """
+    buffers = recent_logs_buffers()
+    with _buffers_lock:
+        buffer = buffers.get(project_id)
+        if buffer is None:
+            buffer = RecentLogs(project_id, get_settings().recent_logs_size)
+        buffers.set(project_id, buffer)
+    return buffer
+
+
+def recent_page(
+    db: Session,
+    project_id: int,
+    fields: Sequence[str],
+    limit: int,
+    offset: int,
+    level: Optional[SeverityRange] = None,
+    service: Optional[str] = None,
+    category: Optional[str] = None,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    search: Optional[str] = None,
+    meta_filters: Sequence[Any] = (),
+) -> Optional[DashboardResult]:
+    """
+    A dashboard page answered from memory, or None when the filters or the
+    page fall outside what the project's buffer holds.
+    """
+    size = get_settings().recent_logs_size
+    if (
+        size <= 0
+        or from_ts or to_ts or search or meta_filters
+        or offset + limit > size
+        or not set(fields) <= set(LIST_FIELDS)
+    ):
+        return None
+
+    category_id = None
+    if category:
+        ids = [c.id for c in get_project_categories(db, project_id) if c.name == category]
+        # An unknown name matches nothing; -1 never occurs as a category id.
+        category_id = ids[0] if ids else -1
+
+    buffer = _buffer_for(project_id)
+    buffer.sync(db)
+    result = buffer.page(limit, offset, level=level, service=service, category_id=category_id)
+    if result is not None:
+        result.rows = [tuple(item[name] for name in fields) for item in result.rows]
+    return result
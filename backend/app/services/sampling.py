@@ -0,0 +1,137 @@
+"""
+Per-project ingest sampling.
+
+A project's ``sampling_rules`` keep only a fraction of its low-severity
+logs, before they are processed or written. Kept rows record their
+``sample_rate`` so counts can be scaled back up (``scaled_count`` in the
+facets). ERROR and FATAL logs are always kept.
+
+Rules are checked in order; the first one matching a log's service and
+level decides its rate. ``hash`` sampling (the default) decides from the
+log's correlation id, so every log of a request is kept or dropped
+together; logs without one hash their message, timestamp and position in
+the batch, so repeated messages are sampled independently while a retried
+batch still samples the same way. ``random`` sampling draws independently
+per log.
+"""
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.severity import SEVERITIES, normalize_level
+from app.services.ingest_parser import IngestBatch
+from app.services.meta_index import extract_correlation_id
+
+
+SAMPLING_MODES = ("hash", "random")
+
+# Levels from here on are never sampled.
+ALWAYS_KEEP_SEVERITY = SEVERITIES["ERROR"]
+
+_HASH_SCALE = float(2 ** 64)
+
+
+@dataclass(frozen=True)
+class SamplingRule:
+    rate: float
+    service: Optional[str] = None
+    # The rule covers logs at or below this level.
+    max_level: str = "INFO"
+    mode: str = "hash"
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SamplingRule":
+        return cls(
+            rate=float(config["rate"]),
+            service=config.get("service"),
+            max_level=config.get("max_level") or "INFO",
+            mode=config.get("mode") or "hash",
+        )
+
+    def matches(self, service: Optional[str], severity: int) -> bool:
+        return (
+            severity < ALWAYS_KEEP_SEVERITY
+            and severity <= SEVERITIES[self.max_level]
+            and (self.service is None or self.service == service)
+        )
+
+
+def parse_rules(configs: Optional[Iterable[Dict[str, Any]]]) -> Tuple[SamplingRule, ...]:
+    return tuple(SamplingRule.from_config(config) for config in configs or ())
+
+
+def rule_for(
+    rules: Sequence[SamplingRule],
+    service: Optional[str],
+    severity: int,
+) -> Optional[SamplingRule]:
+    for rule in rules:
+        if rule.matches(service, severity):
+            return rule
+    return None
+
+
+def _fallback_key(batch: IngestBatch, index: int) -> str:
+    # Hashing the message alone would keep or drop every copy of a
+    # repeated message together.
+    timestamp = batch.timestamps[index]
+    stamp = timestamp.isoformat() if timestamp is not None else ""
+    return f"{batch.messages[index]}\x00{stamp}\x00{index}"
+
+
+def _hash_fraction(key: str) -> float:
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / _HASH_SCALE
+
+
+def sample_batch(
+    batch: IngestBatch,
+    rules: Sequence[SamplingRule],
+    correlation_keys: Sequence[str],
+) -> Tuple[IngestBatch, Dict[str, float], Optional[List[int]]]:
+    """
+    Drops the logs the rules do not keep. Returns the kept logs, the
+    sample rate of each sampled (normalized) level, and the positions of
+    the kept logs in ``batch``, or None when every log was kept.
+    """
+    level_map = {raw: normalize_level(raw) for raw in set(batch.levels)}
+
+    rates: Dict[str, float] = {}
+    modes: Dict[str, str] = {}
+    for level in set(level_map.values()):
+        rule = rule_for(rules, batch.service, SEVERITIES[level])
+        if rule is not None and rule.rate < 1:
+            rates[level] = rule.rate
+            modes[level] = rule.mode
+
+    if not rates:
+        return batch, rates, None
+
+    keep: List[int] = []
+    for index, raw in enumerate(batch.levels):
+        level = level_map[raw]
+        rate = rates.get(level)
+        if rate is None:
+            keep.append(index)
+            continue
+        if modes[level] == "random":
+            fraction = random.random()
+        else:
+            key = extract_correlation_id(batch.metas[index], correlation_keys)
+            fraction = _hash_fraction(key or _fallback_key(batch, index))
+        if fraction < rate:
+            keep.append(index)
+
+    if len(keep) == len(batch):
+        return batch, rates, None
+
+    sampled = IngestBatch(
+        batch.service,
+        batch.environment,
+        [batch.timestamps[i] for i in keep],
+        [batch.levels[i] for i in keep],
+        [batch.messages[i] for i in keep],
+        [batch.metas[i] for i in keep],
+    )
+    return sampled, rates, keep
@@ -0,0 +1,169 @@
+"""
+Syslog message parsing for the ingest listeners.
+
+RFC 5424 messages (``<PRI>1 TIMESTAMP HOST APP PROCID MSGID [SD] MSG``) are
+parsed in full; anything else with a ``<PRI>`` is read as the older BSD
+format (RFC 3164, ``<PRI>Mmm dd hh:mm:ss HOST TAG[PID]: MSG``), and text
+without one is kept whole as the message. Parsing never fails: a log line
+a device sent is always worth storing.
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+
+# Syslog severity (0 emergency ... 7 debug) -> level name.
+SYSLOG_LEVELS = ("FATAL", "FATAL", "FATAL", "ERROR", "WARN", "INFO", "INFO", "DEBUG")
+
+# Facility "user", severity "notice": the RFC 3164 default for a missing PRI.
+DEFAULT_PRI = 13
+
+NILVALUE = "-"
+
+_PRI_RE = re.compile(r"<(\d{1,3})>")
+_BSD_RE = re.compile(
+    r"(?P<ts>[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d) "
+    r"(?P<host>\S+) "
+    r"(?:(?P<tag>[^:\[\s]{1,48})(?:\[(?P<pid>[^\]]*)\])?: ?)?"
+    r"(?P<msg>.*)",
+    re.DOTALL,
+)
+
+
+@dataclass
+class SyslogMessage:
+    level: str
+    message: str
+    timestamp: Optional[datetime] = None
+    app_name: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+def _nil(value: str) -> Optional[str]:
+    return None if value == NILVALUE else value
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    if value == NILVALUE:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_structured_data(text: str) -> Tuple[Dict[str, Dict[str, str]], str]:
+    """
+    Parses leading ``[id name="value" ...]`` elements. Returns them and
+    the rest of the text.
+    """
+    elements: Dict[str, Dict[str, str]] = {}
+    pos = 0
+    length = len(text)
+
+    while pos < length and text[pos] == "[":
+        end = pos + 1
+        while end < length and text[end] not in " ]":
+            end += 1
+        params: Dict[str, str] = {}
+        elements[text[pos + 1:end]] = params
+        pos = end
+
+        while pos < length and text[pos] != "]":
+            pos += 1  # the space before a parameter
+            equals = text.find('="', pos)
+            if equals == -1:
+                return elements, ""
+            name = text[pos:equals]
+            pos = equals + 2
+
+            value = []
+            while pos < length and text[pos] != '"':
+                if text[pos] == "\\" and pos + 1 < length and text[pos + 1] in '"\\]':
+                    pos += 1
+                value.append(text[pos])
+                pos += 1
+            params[name] = "".join(value)
+            pos += 1  # closing quote
+
+        pos += 1  # closing bracket
+
+    return elements, text[pos:]
+
+
+def _parse_rfc5424(text: str, message: SyslogMessage) -> None:
+    parts = text.split(" ", 5)
+    if len(parts) < 6:
+        message.message = text
+        return
+
+    timestamp, hostname, app_name, procid, msgid, rest = parts
+    message.timestamp = _parse_timestamp(timestamp)
+    message.app_name = _nil(app_name)
+
+    if rest.startswith(NILVALUE):
+        structured_data, rest = {}, rest[1:]
+    else:
+        structured_data, rest = _parse_structured_data(rest)
+
+    message.message = rest[1:] if rest.startswith(" ") else rest
+    message.message = message.message.lstrip("\ufeff")
+
+    for key, value in (
+        ("hostname", _nil(hostname)),
+        ("procid", _nil(procid)),
+        ("msgid", _nil(msgid)),
+    ):
+        if value is not None:
+            message.meta[key] = value
+    if structured_data:
+        message.meta["structured_data"] = structured_data
+
+
+def _parse_rfc3164(text: str, message: SyslogMessage, received_at: datetime) -> None:
+    match = _BSD_RE.match(text)
+    if not match:
+        message.message = text
+        return
+
+    try:
+        timestamp = datetime.strptime(
+            f"{received_at.year} {match['ts']}", "%Y %b %d %H:%M:%S"
+        ).replace(tzinfo=timezone.utc)
+    except ValueError:
+        timestamp = None
+    # No year in the format: a date ahead of now is from last year.
+    if timestamp is not None and timestamp - received_at > timedelta(days=1):
+        timestamp = timestamp.replace(year=timestamp.year - 1)
+
+    message.timestamp = timestamp
+    message.app_name = match["tag"]
+    message.message = match["msg"]
+    message.meta["hostname"] = match["host"]
+    if match["pid"]:
+        message.meta["procid"] = match["pid"]
+
+
+def parse_syslog(data: bytes, received_at: Optional[datetime] = None) -> SyslogMessage:
+    """
+    Parses one syslog message (without transport framing).
+    """
+    received_at = received_at or datetime.now(timezone.utc)
+    text = data.decode("utf-8", "replace").rstrip("\r\n\x00")
+
+    match = _PRI_RE.match(text)
+    pri = int(match[1]) if match and int(match[1]) < 192 else DEFAULT_PRI
+    facility, severity = divmod(pri, 8)
+
+    message = SyslogMessage(level=SYSLOG_LEVELS[severity], message=text)
+    message.meta["facility"] = facility
+    if not match:
+        return message
+
+    rest = text[match.end():]
+    if rest.startswith("1 "):
+        _parse_rfc5424(rest[2:], message)
+    else:
+        _parse_rfc3164(rest, message, received_at)
+    return message
@@ -7,6 +7,8 @@ and import ``send_log`` / ``send_logs`` from here.
 
 from __future__ import annotations
 
+import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
@@ -35,6 +37,13 @@ class LogClient:
             environment="development",
         )
         client.send_log("ERROR", "Something went wrong", {"user_id": 123})
+
+    ``encoding="msgpack"`` or ``"protobuf"`` sends smaller, cheaper to
+    decode bodies; they need the ``msgpack`` / ``protobuf`` packages and
+    ``app.services.ingest_encodings``.
+
+    Every batch carries a batch id, so failed or timed out requests are
+    retried (``retries`` times) without risking duplicates.
     """
 
     base_url: str
@@ -42,6 +51,9 @@ class LogClient:
     service: Optional[str] = None
     environment: Optional[str] = None
     timeout: int = 5
+    encoding: str = "json"  # "json" | "msgpack" | "protobuf"
+    retries: int = 2
+    retry_backoff: float = 0.5
     _session: requests.Session = field(default_factory=requests.Session, init=False, repr=False)
 
     @property
@@ -79,16 +91,20 @@ class LogClient:
         logs: Iterable[LogRecord],
         service: Optional[str] = None,
         environment: Optional[str] = None,
+        batch_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Send multiple log entries in a single request.
+        Send multiple log entries in a single request. A ``batch_id`` is
+        generated when not given; the response lists logs the server
+        rejected under ``rejected`` and has ``duplicate`` set when an
+        earlier attempt of the batch was already accepted.
         """
         payload = {
             "service": service or self.service,
             "environment": environment or self.environment,
             "logs": [
                 {
-                    "timestamp": log.timestamp.isoformat() if log.timestamp else None,
+                    "timestamp": log.timestamp,
                     "level": log.level,
                     "message": log.message,
                     "meta": log.meta,
@@ -97,12 +113,36 @@ class LogClient:
             ],
         }
 
-        response = self._session.post(
-            self._logs_endpoint,
-            json=payload,
-            headers=self._headers(),
-            timeout=self.timeout,
-        )
+        headers = {**self._headers(), "X-Batch-Id": batch_id or uuid.uuid4().hex}
+
+        if self.encoding == "json":
+            for log in payload["logs"]:
+                if log["timestamp"] is not None:
+                    log["timestamp"] = log["timestamp"].isoformat()
+            request = {"json": payload}
+        else:
+            from app.services.ingest_encodings import encode_ingest_body
+
+            body, content_type = encode_ingest_body(payload, self.encoding)
+            request = {"data": body}
+            headers["Content-Type"] = content_type
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._session.post(
+                    self._logs_endpoint,
+                    headers=headers,
+                    timeout=self.timeout,
+                    **request,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code < 500 or attempt == self.retries:
+                    break
+            time.sleep(self.retry_backoff * 2 ** attempt)
+
         response.raise_for_status()
         return response.json()
 
@@ -0,0 +1,561 @@
+"""
+Socket listeners for log shippers that do not speak HTTP.
+
+- Syslog over UDP and TCP (``SYSLOG_UDP_PORT`` / ``SYSLOG_TCP_PORT``):
+  RFC 5424 or RFC 3164 messages, framed on TCP by octet counting or by
+  newlines (RFC 6587). Syslog has no credentials; every message goes to
+  the project of ``SYSLOG_API_KEY``, with the APP-NAME as its service.
+- Framed TCP (``FRAMED_TCP_PORT``): frames are a 4-byte big-endian length
+  and a payload. The first frame is the project's API key, every later one
+  a JSON body as for ``POST /api/v1/logs``. Each frame is answered with a
+  framed JSON ack (``{"ok": true, ...}`` or ``{"ok": false, "error": ...}``)
+  once its logs are queued for writing.
+
+Logs are merged per project, service and environment into batches of
+``LISTENER_BATCH_SIZE``, written through the usual ingest pipeline by
+``LISTENER_WRITERS`` threads. At most ``LISTENER_MAX_PENDING_BATCHES`` wait
+for a writer: beyond that TCP connections stop being read (the senders'
+socket buffers fill up and they slow down) and UDP datagrams are dropped.
+Queued logs are held in memory only, so a crash loses up to that backlog.
+Writes failing on a lost or unavailable database are retried up to
+``LISTENER_WRITE_ATTEMPTS`` times; any other failure drops the batch.
+
+    python -m app.workers.ingest_listener
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.exc import DBAPIError, DisconnectionError, InterfaceError, OperationalError, TimeoutError
+
+from app.config import get_settings
+from app.core.metrics import LISTENER_MESSAGES, QUEUE_DEPTH, render_metrics
+from app.core.project_cache import ProjectSnapshot, api_key_cache, get_project_by_api_key
+from app.database import new_session
+from app.services.ingest_parser import IngestBatch, IngestValidationError, parse_ingest_batch
+from app.services.ingest_pipeline import ingest_batch
+from app.services.log_dimensions import stop_dimension_flusher
+from app.services.syslog_parser import parse_syslog
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct(">I")
+
+MAX_BACKOFF_SECONDS = 30.0
+
+# Errors that may go away on retry (database down, connection lost, pool
+# exhausted). Any other error would fail the same way again.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, DisconnectionError, TimeoutError)
+
+BatchKey = Tuple[int, Optional[str], Optional[str]]
+
+
+class FrameTooLarge(ValueError):
+    pass
+
+
+def is_transient(exc: Exception) -> bool:
+    return isinstance(exc, TRANSIENT_ERRORS) or (
+        isinstance(exc, DBAPIError) and exc.connection_invalidated
+    )
+
+
+# ---- Batching ----
+
+class _PendingBatch:
+    __slots__ = ("project", "batch", "started", "sources")
+
+    def __init__(self, project: ProjectSnapshot, service: Optional[str], environment: Optional[str]):
+        self.project = project
+        self.batch = IngestBatch(service, environment, [], [], [], [])
+        self.started = time.monotonic()
+        # Logs per listener, to count them by listener if they are dropped.
+        self.sources: Dict[str, int] = {}
+
+    def extend(self, project: ProjectSnapshot, batch: IngestBatch, listener: str) -> None:
+        # The newest snapshot wins: project settings may have changed.
+        self.project = project
+        self.sources[listener] = self.sources.get(listener, 0) + len(batch)
+        self.batch.timestamps.extend(batch.timestamps)
+        self.batch.levels.extend(batch.levels)
+        self.batch.messages.extend(batch.messages)
+        self.batch.metas.extend(batch.metas)
+
+
+class IngestBatcher:
+    """
+    Merges incoming logs into batches and writes them on worker threads.
+    A batch is handed to the writers when it is full or
+    ``flush_seconds`` old, through a queue of at most ``max_pending``.
+    A write is tried up to ``write_attempts`` times, retrying transient
+    database errors only.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_seconds: float,
+        max_pending: int,
+        writers: int,
+        write_attempts: int = 5,
+    ):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.writers = writers
+        self.write_attempts = write_attempts
+        self._pending: Dict[BatchKey, _PendingBatch] = {}
+        self._ready: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        self._tasks.append(asyncio.create_task(self._run_flusher()))
+        for _ in range(self.writers):
+            self._tasks.append(asyncio.create_task(self._run_writer()))
+
+    def _merge(self, project: ProjectSnapshot, batch: IngestBatch, listener: str) -> Optional[_PendingBatch]:
+        """
+        Adds ``batch`` to its pending batch. Returns that batch, taken out
+        of ``_pending``, once it is full.
+        """
+        key = (project.id, batch.service, batch.environment)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingBatch(project, batch.service, batch.environment)
+        pending.extend(project, batch, listener)
+        if len(pending.batch) >= self.batch_size:
+            return self._pending.pop(key)
+        return None
+
+    async def _enqueue(self, pending: _PendingBatch) -> None:
+        await self._ready.put(pending)
+        QUEUE_DEPTH.set(self._ready.qsize(), queue="listener")
+
+    async def add(self, project: ProjectSnapshot, batch: IngestBatch, listener: str) -> None:
+        """
+        Adds logs received by ``listener``, waiting while the writers are
+        behind.
+        """
+        full = self._merge(project, batch, listener)
+        if full is not None:
+            await self._enqueue(full)
+
+    def try_add(self, project: ProjectSnapshot, batch: IngestBatch, listener: str) -> bool:
+        """
+        Adds logs unless the writers are behind and their batch is already
+        full. Returns whether the logs were taken.
+        """
+        if self._ready.full():
+            key = (project.id, batch.service, batch.environment)
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingBatch(project, batch.service, batch.environment)
+            elif len(pending.batch) >= self.batch_size:
+                return False
+            pending.extend(project, batch, listener)
+            return True
+
+        full = self._merge(project, batch, listener)
+        if full is not None:
+            self._ready.put_nowait(full)
+            QUEUE_DEPTH.set(self._ready.qsize(), queue="listener")
+        return True
+
+    async def _run_flusher(self) -> None:
+        interval = max(self.flush_seconds / 4, 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush(time.monotonic() - self.flush_seconds)
+
+    async def flush(self, started_before: Optional[float] = None) -> None:
+        """
+        Hands over pending batches started before ``started_before``
+        (all of them by default).
+        """
+        due = [
+            key for key, pending in self._pending.items()
+            if started_before is None or pending.started <= started_before
+        ]
+        for key in due:
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                await self._enqueue(pending)
+
+    async def _run_writer(self) -> None:
+        while True:
+            pending = await self._ready.get()
+            QUEUE_DEPTH.set(self._ready.qsize(), queue="listener")
+            try:
+                await asyncio.to_thread(self._write, pending)
+            finally:
+                self._ready.task_done()
+
+    def _write(self, pending: _PendingBatch) -> bool:
+        """
+        Writes a batch. Returns False if it was dropped.
+        """
+        project, batch = pending.project, pending.batch
+        backoff = 0.5
+        attempt = 0
+        while True:
+            attempt += 1
+            db = new_session()
+            try:
+                # Bad logs are dropped alone; the rest of a merged batch
+                # came from other messages (or other senders).
+                rejected = []
+                ingest_batch(db, project, batch, rejected=rejected)
+                for item in rejected:
+                    logger.warning("Dropping log for project %s: %s", project.id, item["error"])
+                return True
+            except Exception as exc:
+                db.rollback()
+                if not is_transient(exc):
+                    reason = "failed"
+                elif attempt >= self.write_attempts:
+                    reason = f"failed {attempt} times"
+                elif self._stopping.is_set():
+                    reason = "failed on shutdown"
+                else:
+                    logger.exception(
+                        "Writing %d logs for project %s failed; retrying in %.1fs",
+                        len(batch), project.id, backoff,
+                    )
+                    self._stopping.wait(backoff)
+                    backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                    continue
+                logger.exception("Dropping %d logs for project %s: write %s", len(batch), project.id, reason)
+                for listener, count in pending.sources.items():
+                    LISTENER_MESSAGES.inc(count, listener=listener, result="write_failed")
+                return False
+            finally:
+                db.close()
+
+    async def close(self) -> None:
+        """
+        Writes everything still pending, then stops the tasks.
+        """
+        flusher, writers = self._tasks[0], self._tasks[1:]
+        flusher.cancel()
+        # Failed writes are no longer retried from here on.
+        self._stopping.set()
+        await self.flush()
+        await self._ready.join()
+        for task in writers:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# ---- Projects ----
+
+def _lookup_project(api_key: str) -> Optional[ProjectSnapshot]:
+    db = new_session()
+    try:
+        return get_project_by_api_key(db, api_key)
+    finally:
+        db.close()
+
+
+async def resolve_project(api_key: str) -> Optional[ProjectSnapshot]:
+    snapshot = api_key_cache().get(api_key)
+    if snapshot is None:
+        snapshot = await asyncio.to_thread(_lookup_project, api_key)
+    # Projects being deleted accept no logs.
+    if snapshot is not None and snapshot.is_deleting:
+        return None
+    return snapshot
+
+
+# ---- Framing ----
+
+async def read_frame(reader: asyncio.StreamReader, max_bytes: int) -> Optional[bytes]:
+    """
+    One length-prefixed frame, or None at a clean end of stream.
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial:
+            return None
+        raise
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > max_bytes:
+        raise FrameTooLarge(f"Frame of {length} bytes exceeds {max_bytes}")
+    return await reader.readexactly(length)
+
+
+def write_frame(writer: asyncio.StreamWriter, payload: dict) -> None:
+    data = orjson.dumps(payload)
+    writer.write(FRAME_HEADER.pack(len(data)) + data)
+
+
+async def read_syslog_frames(reader: asyncio.StreamReader, max_bytes: int) -> AsyncIterator[bytes]:
+    """
+    Messages of a syslog TCP stream, octet-counted (``123 <34>1 ...``) or
+    newline-delimited; a sender may mix both.
+    """
+    while True:
+        try:
+            head = await reader.readexactly(1)
+        except asyncio.IncompleteReadError:
+            return
+        if head in (b"\r", b"\n", b"\x00"):
+            continue
+
+        if head.isdigit():
+            digits = head + await reader.readuntil(b" ")
+            length = int(digits[:-1])
+            if length > max_bytes:
+                raise FrameTooLarge(f"Syslog message of {length} bytes exceeds {max_bytes}")
+            yield await reader.readexactly(length)
+            continue
+
+        try:
+            yield head + await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                yield head + exc.partial
+            return
+
+
+# ---- Listeners ----
+
+class IngestListener:
+    def __init__(self, batcher: IngestBatcher, max_frame_bytes: int):
+        settings = get_settings()
+        self.batcher = batcher
+        self.max_frame_bytes = max_frame_bytes
+        self.syslog_api_key = settings.syslog_api_key
+        self.syslog_environment = settings.syslog_environment
+        self.syslog_project: Optional[ProjectSnapshot] = None
+
+    async def refresh_syslog_project(self) -> None:
+        project = await resolve_project(self.syslog_api_key)
+        if project is None and self.syslog_project is not None:
+            logger.warning("SYSLOG_API_KEY no longer matches a project; dropping syslog messages")
+        self.syslog_project = project
+
+    async def run_syslog_project_refresher(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_syslog_project()
+            except Exception:
+                logger.exception("Refreshing the syslog project failed")
+
+    def _syslog_batch(self, data: bytes) -> Optional[IngestBatch]:
+        if not data.strip():
+            return None
+        message = parse_syslog(data, datetime.now(timezone.utc))
+        return IngestBatch(
+            message.app_name,
+            self.syslog_environment,
+            [message.timestamp],
+            [message.level],
+            [message.message],
+            [message.meta],
+        )
+
+    def handle_syslog_datagram(self, data: bytes) -> None:
+        batch = self._syslog_batch(data)
+        if batch is None:
+            return
+        if self.syslog_project is None or not self.batcher.try_add(self.syslog_project, batch, "syslog_udp"):
+            LISTENER_MESSAGES.inc(listener="syslog_udp", result="dropped")
+            return
+        LISTENER_MESSAGES.inc(listener="syslog_udp", result="accepted")
+
+    async def handle_syslog_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        try:
+            async for data in read_syslog_frames(reader, self.max_frame_bytes):
+                batch = self._syslog_batch(data)
+                if batch is None:
+                    continue
+                if self.syslog_project is None:
+                    LISTENER_MESSAGES.inc(listener="syslog_tcp", result="dropped")
+                    continue
+                await self.batcher.add(self.syslog_project, batch, "syslog_tcp")
+                LISTENER_MESSAGES.inc(listener="syslog_tcp", result="accepted")
+        except (ValueError, asyncio.LimitOverrunError, asyncio.IncompleteReadError, ConnectionError) as exc:
+            logger.warning("Closing syslog connection from %s: %s", peer, exc)
+        finally:
+            writer.close()
+
+    async def handle_framed_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        try:
+            api_key = await read_frame(reader, self.max_frame_bytes)
+            if api_key is None:
+                return
+            api_key = api_key.decode("utf-8", "replace").strip()
+            project = await resolve_project(api_key)
+            if project is None:
+                write_frame(writer, {"ok": False, "error": "Invalid API key"})
+                await writer.drain()
+                return
+            write_frame(writer, {"ok": True, "project_id": project.id})
+            await writer.drain()
+
+            while True:
+                payload = await read_frame(reader, self.max_frame_bytes)
+                if payload is None:
+                    return
+                try:
+                    batch = parse_ingest_batch(payload)
+                except IngestValidationError as exc:
+                    LISTENER_MESSAGES.inc(listener="framed_tcp", result="invalid")
+                    write_frame(writer, {"ok": False, "error": str(exc)})
+                    await writer.drain()
+                    continue
+
+                # Re-resolved per frame (from the cache): picks up project
+                # changes and a rotated key on long-lived connections.
+                project = await resolve_project(api_key)
+                if project is None:
+                    write_frame(writer, {"ok": False, "error": "Invalid API key"})
+                    await writer.drain()
+                    return
+
+                batch.raw = None
+                await self.batcher.add(project, batch, "framed_tcp")
+                LISTENER_MESSAGES.inc(len(batch), listener="framed_tcp", result="accepted")
+                write_frame(writer, {"ok": True, "count": len(batch)})
+                await writer.drain()
+        except FrameTooLarge as exc:
+            write_frame(writer, {"ok": False, "error": str(exc)})
+            logger.warning("Closing framed connection from %s: %s", peer, exc)
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            logger.warning("Framed connection from %s ended mid-frame: %s", peer, exc)
+        finally:
+            writer.close()
+
+
+class _SyslogDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, listener: IngestListener):
+        self.listener = listener
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.listener.handle_syslog_datagram(data)
+
+
+async def _serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        body = render_metrics().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(
+    host: str,
+    syslog_udp_port: int,
+    syslog_tcp_port: int,
+    framed_tcp_port: int,
+    metrics_port: int,
+) -> None:
+    settings = get_settings()
+    if not (syslog_udp_port or syslog_tcp_port or framed_tcp_port):
+        raise SystemExit("No listener port configured")
+
+    batcher = IngestBatcher(
+        batch_size=settings.listener_batch_size,
+        flush_seconds=settings.listener_flush_seconds,
+        max_pending=settings.listener_max_pending_batches,
+        writers=settings.listener_writers,
+        write_attempts=settings.listener_write_attempts,
+    )
+    listener = IngestListener(batcher, settings.listener_max_frame_bytes)
+    loop = asyncio.get_running_loop()
+
+    background: List[asyncio.Task] = []
+    if syslog_udp_port or syslog_tcp_port:
+        if not settings.syslog_api_key:
+            raise SystemExit("SYSLOG_API_KEY is required for the syslog listeners")
+        await listener.refresh_syslog_project()
+        if listener.syslog_project is None:
+            raise SystemExit("SYSLOG_API_KEY does not match any project")
+        background.append(asyncio.create_task(
+            listener.run_syslog_project_refresher(settings.api_key_cache_ttl_seconds)
+        ))
+
+    batcher.start()
+
+    servers: List[asyncio.AbstractServer] = []
+    transports: List[asyncio.BaseTransport] = []
+    if syslog_udp_port:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _SyslogDatagramProtocol(listener), local_addr=(host, syslog_udp_port)
+        )
+        transports.append(transport)
+        logger.info("Syslog UDP listener on %s:%d", host, syslog_udp_port)
+    if syslog_tcp_port:
+        servers.append(await asyncio.start_server(
+            listener.handle_syslog_stream, host, syslog_tcp_port, limit=settings.listener_max_frame_bytes
+        ))
+        logger.info("Syslog TCP listener on %s:%d", host, syslog_tcp_port)
+    if framed_tcp_port:
+        servers.append(await asyncio.start_server(listener.handle_framed_stream, host, framed_tcp_port))
+        logger.info("Framed TCP listener on %s:%d", host, framed_tcp_port)
+    if metrics_port:
+        servers.append(await asyncio.start_server(_serve_metrics, host, metrics_port))
+        logger.info("Metrics on http://%s:%d/metrics", host, metrics_port)
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await stop.wait()
+    logger.info("Stopping ingest listeners")
+
+    for transport in transports:
+        transport.close()
+    for server in servers:
+        server.close()
+    for task in background:
+        task.cancel()
+    # Connections still open keep feeding the batcher until it is closed.
+    await batcher.close()
+    stop_dimension_flusher()
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Receive logs over syslog and framed TCP.")
+    parser.add_argument("--host", default=settings.listener_host)
+    parser.add_argument("--syslog-udp-port", type=int, default=settings.syslog_udp_port)
+    parser.add_argument("--syslog-tcp-port", type=int, default=settings.syslog_tcp_port)
+    parser.add_argument("--framed-tcp-port", type=int, default=settings.framed_tcp_port)
+    parser.add_argument("--metrics-port", type=int, default=settings.listener_metrics_port)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    asyncio.run(serve(
+        args.host,
+        args.syslog_udp_port,
+        args.syslog_tcp_port,
+        args.framed_tcp_port,
+        args.metrics_port,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Ingest worker processes for ``INGEST_MODE=queue``.
+
+The API only validates batches and stores them in ``ingest_jobs``; these
+processes do categorization, meta handling and the bulk writes. Workers
+share nothing but the database, so ingest CPU scales with the number of
+processes rather than being bound by one interpreter's GIL.
+
+    python -m app.workers.ingest_worker --workers 4
+"""
+import argparse
+import logging
+import multiprocessing
+import signal
+
+from app.config import get_settings
+from app.database import new_session
+from app.services.ingest_parser import IngestValidationError, parse_ingest_batch
+from app.services.ingest_pipeline import (
+    after_ingest_commit,
+    ingest_batch,
+    load_ingest_context,
+)
+from app.services.ingest_queue import JOB_FAILED, claim_jobs
+from app.services.log_dimensions import stop_dimension_flusher
+from app.services.meta_policy import MetaTooLarge
+
+logger = logging.getLogger(__name__)
+
+
+def process_pending_jobs(limit: int) -> int:
+    """
+    Claims up to ``limit`` jobs and writes them in a single transaction,
+    each job in its own savepoint so one bad batch does not block the rest.
+    Returns the number of jobs handled.
+    """
+    settings = get_settings()
+    db = new_session()
+    try:
+        jobs = claim_jobs(db, limit)
+        if not jobs:
+            db.rollback()
+            return 0
+
+        projects, categories = load_ingest_context(db, (job.project_id for job in jobs))
+
+        # Dimension counts and alerts only see rows once they are committed.
+        ingested = []
+        for job in jobs:
+            if job.project_id not in projects:
+                logger.warning("Dropping ingest job %s of deleted project %s", job.id, job.project_id)
+                db.delete(job)
+                continue
+            try:
+                batch = parse_ingest_batch(job.payload)
+                job_rows = []
+                with db.begin_nested():
+                    ingest_batch(
+                        db,
+                        projects[job.project_id],
+                        batch,
+                        categories=categories[job.project_id],
+                        commit=False,
+                        ingested=job_rows,
+                    )
+                ingested.extend(job_rows)
+                db.delete(job)
+            except Exception as exc:
+                job.attempts += 1
+                job.last_error = str(exc)[:2000]
+                # Oversized meta under the "reject" policy will never succeed.
+                if isinstance(exc, (MetaTooLarge, IngestValidationError)) or job.attempts >= settings.ingest_job_max_attempts:
+                    job.status = JOB_FAILED
+                logger.warning("Ingest job %s failed (attempt %d): %s", job.id, job.attempts, exc)
+
+        db.commit()
+        after_ingest_commit(db, ingested)
+        return len(jobs)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run_worker(stop_event, worker_id: int) -> None:
+    # The parent handles Ctrl-C and tells workers to stop via ``stop_event``,
+    # so a batch in flight is always finished and committed.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s worker-{worker_id} %(levelname)s %(message)s")
+
+    settings = get_settings()
+    logger.info("Ingest worker started")
+
+    while not stop_event.is_set():
+        try:
+            handled = process_pending_jobs(settings.ingest_worker_batch_jobs)
+        except Exception:
+            logger.exception("Ingest worker iteration failed")
+            handled = 0
+
+        if handled < settings.ingest_worker_batch_jobs:
+            stop_event.wait(settings.ingest_worker_poll_seconds)
+
+    stop_dimension_flusher()
+    logger.info("Ingest worker stopped")
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Run BCube Logger ingest workers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ingest_workers,
+        help="Number of worker processes (default: INGEST_WORKERS)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    # Spawned, not forked: each worker opens its own engine and pool.
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+
+    def _stop(signum, frame) -> None:
+        logger.info("Stopping ingest workers")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    processes = [
+        context.Process(target=run_worker, args=(stop_event, i), name=f"ingest-worker-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Project purger.
+
+Removes the data of projects deleted through the API (status
+``deleting``), one bounded batch per transaction with a pause between
+batches, so purging a large tenant never holds long transactions or
+competes with the ingest of other projects. Progress is kept on the project
+row; a restarted purger simply continues.
+
+    python -m app.workers.project_purger
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from app.config import get_settings
+from app.core.project_cache import invalidate_project
+from app.database import new_session
+from app.services.project_purge import claim_deleting_project, purge_batch
+
+logger = logging.getLogger(__name__)
+
+
+def process_next_batch(batch_size: int) -> bool:
+    """
+    Purges one batch of the project deleted longest ago. Returns False
+    when no project is waiting to be purged.
+    """
+    db = new_session()
+    try:
+        project = claim_deleting_project(db)
+        if project is None:
+            db.rollback()
+            return False
+
+        project_id = project.id
+        finished = purge_batch(db, project, batch_size)
+        purged = project.purged_logs
+        db.commit()
+
+        if finished:
+            # Snapshots cached while the project was deleting must not
+            # outlive it (SQLite, for one, reuses the id).
+            invalidate_project(project_id)
+            logger.info("Project %s deleted (%d logs purged)", project_id, purged)
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run(stop_event: threading.Event, batch_size: int, throttle_seconds: float) -> None:
+    settings = get_settings()
+    logger.info("Project purger started")
+
+    while not stop_event.is_set():
+        try:
+            worked = process_next_batch(batch_size)
+        except Exception:
+            logger.exception("Project purger iteration failed")
+            worked = False
+
+        stop_event.wait(throttle_seconds if worked else settings.project_purge_poll_seconds)
+
+    logger.info("Project purger stopped")
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Purge the data of deleted BCube Logger projects.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.project_purge_batch_size,
+        help="Rows deleted per transaction (default: PROJECT_PURGE_BATCH_SIZE)",
+    )
+    parser.add_argument(
+        "--throttle",
+        type=float,
+        default=settings.project_purge_throttle_seconds,
+        help="Seconds to pause between batches (default: PROJECT_PURGE_THROTTLE_SECONDS)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    stop_event = threading.Event()
+
+    # A batch in flight is always finished and committed.
+    def _stop(signum, frame) -> None:
+        logger.info("Stopping project purger")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    run(stop_event, args.batch_size, args.throttle)
+
+
+if __name__ == "__main__":
+    main()
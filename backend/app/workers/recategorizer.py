@@ -0,0 +1,114 @@
+"""
+Category backfill worker.
+
+Runs the ``recategorize_jobs`` created through ``POST
+/api/v1/categories/recategorize``, one chunk per transaction with a pause
+between chunks, so a backfill over months of logs never holds long
+transactions or saturates the database. Jobs resume from their cursor
+after a restart; several workers may run at once.
+
+    python -m app.workers.recategorizer
+"""
+import argparse
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.config import get_settings
+from app.database import new_session
+from app.services.recategorizer import JOB_DONE, JOB_PENDING, claim_job, fail_job, process_chunk, start_job
+
+logger = logging.getLogger(__name__)
+
+
+def process_next_chunk(chunk_size: int) -> bool:
+    """
+    Processes one chunk of the oldest ready job. Returns False when there
+    was no job to work on.
+    """
+    settings = get_settings()
+    created_before = datetime.now(timezone.utc) - timedelta(seconds=settings.category_cache_ttl_seconds)
+
+    db = new_session()
+    job_id = None
+    try:
+        job = claim_job(db, created_before)
+        if job is None:
+            db.rollback()
+            return False
+
+        job_id = job.id
+        if job.status == JOB_PENDING:
+            start_job(db, job)
+            logger.info("Recategorize job %s started (project %s)", job.id, job.project_id)
+
+        process_chunk(db, job, chunk_size)
+        status, scanned, updated = job.status, job.scanned, job.updated
+        db.commit()
+
+        if status == JOB_DONE:
+            logger.info("Recategorize job %s done: %d logs scanned, %d updated", job_id, scanned, updated)
+        return True
+    except Exception as exc:
+        db.rollback()
+        if job_id is None:
+            raise
+        logger.exception("Recategorize job %s failed", job_id)
+        fail_job(db, job_id, str(exc))
+        return True
+    finally:
+        db.close()
+
+
+def run(stop_event: threading.Event, chunk_size: int, throttle_seconds: float) -> None:
+    settings = get_settings()
+    logger.info("Recategorizer started")
+
+    while not stop_event.is_set():
+        try:
+            worked = process_next_chunk(chunk_size)
+        except Exception:
+            logger.exception("Recategorizer iteration failed")
+            worked = False
+
+        stop_event.wait(throttle_seconds if worked else settings.recategorize_poll_seconds)
+
+    logger.info("Recategorizer stopped")
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Run BCube Logger category backfills.")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.recategorize_chunk_size,
+        help="Logs per transaction (default: RECATEGORIZE_CHUNK_SIZE)",
+    )
+    parser.add_argument(
+        "--throttle",
+        type=float,
+        default=settings.recategorize_throttle_seconds,
+        help="Seconds to pause between chunks (default: RECATEGORIZE_THROTTLE_SECONDS)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    stop_event = threading.Event()
+
+    # A chunk in flight is always finished and committed.
+    def _stop(signum, frame) -> None:
+        logger.info("Stopping recategorizer")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    run(stop_event, args.chunk_size, args.throttle)
+
+
+if __name__ == "__main__":
+    main()
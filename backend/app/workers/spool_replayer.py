@@ -0,0 +1,203 @@
+"""
+Drains the ingest spool (``INGEST_MODE=spool``) into the database.
+
+Records are replayed in order per writer directory, a batch at a time, and
+the spool offset is committed only after the database transaction. A crash
+in between replays that batch again on restart, so delivery is
+at-least-once. While the database is unavailable the replayer backs off
+and the spool keeps growing; nothing is dropped. Records that can never be
+written are moved to ``SPOOL_DIR/dead-letter`` so they do not block the
+records behind them.
+
+    python -m app.workers.spool_replayer
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError, TimeoutError
+
+from app.config import get_settings
+from app.core.spool import (
+    SpoolLock,
+    append_dead_letters,
+    commit_offset,
+    list_segments,
+    lock_writer_directory,
+    read_offset,
+    read_records,
+    remove_writer_directory,
+    writer_directories,
+)
+from app.database import new_session
+from app.services.ingest_pipeline import (
+    after_ingest_commit,
+    ingest_batch,
+    load_ingest_context,
+)
+from app.services.ingest_spool import decode_record
+from app.services.log_dimensions import stop_dimension_flusher
+
+logger = logging.getLogger(__name__)
+
+# Errors that may go away on retry (database down, connection lost, pool
+# exhausted). Any other error of a record is permanent: replaying it again
+# would fail the same way, so it is dead-lettered and replay moves on.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, DisconnectionError, TimeoutError)
+
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def _describe(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"[:2000]
+
+
+def replay_directory(directory: str, writer_alive: bool, limit: int) -> int:
+    """
+    Replays up to ``limit`` records of one writer directory and commits the
+    new offset. Records that fail permanently are moved to the dead-letter
+    file first. Returns the number of records consumed.
+    """
+    start = read_offset(directory)
+    newest = (list_segments(directory) or [0])[-1]
+    payloads, position = read_records(
+        directory,
+        start,
+        limit,
+        is_sealed=lambda seq: seq < newest or not writer_alive,
+    )
+    if position == start:
+        return 0
+
+    dead_letters = []
+    records = []
+    for data in payloads:
+        try:
+            project_id, batch = decode_record(data)
+        except Exception as exc:
+            logger.error("Undecodable spool record in %s: %s", directory, exc)
+            dead_letters.append((data, _describe(exc)))
+            continue
+        records.append((data, project_id, batch))
+
+    db = new_session()
+    try:
+        projects, categories = load_ingest_context(db, (pid for _, pid, _ in records))
+        # Dimension counts and alerts only see rows once they are committed.
+        ingested = []
+        for data, project_id, batch in records:
+            if project_id not in projects:
+                logger.warning("Dropping spooled batch for deleted project %s", project_id)
+                continue
+            try:
+                record_rows = []
+                with db.begin_nested():
+                    ingest_batch(
+                        db,
+                        projects[project_id],
+                        batch,
+                        categories=categories[project_id],
+                        commit=False,
+                        ingested=record_rows,
+                    )
+                ingested.extend(record_rows)
+            except TRANSIENT_ERRORS:
+                raise
+            except Exception as exc:
+                logger.error("Spooled batch for project %s failed: %s", project_id, exc)
+                dead_letters.append((data, _describe(exc)))
+        db.commit()
+        after_ingest_commit(db, ingested)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if dead_letters:
+        path = append_dead_letters(
+            os.path.dirname(directory), os.path.basename(directory), dead_letters
+        )
+        logger.error("Moved %d spool records to %s", len(dead_letters), path)
+
+    commit_offset(directory, position)
+    return len(payloads)
+
+
+def replay_once(spool_dir: str, limit: int) -> int:
+    """
+    One pass over every writer directory. Directories of writers that
+    have exited are removed once fully replayed. A directory that fails
+    does not hold up the others; the error is raised only when no
+    directory made progress.
+    """
+    replayed = 0
+    failure = None
+    for directory in writer_directories(spool_dir):
+        # Winning the writer's lock proves it has exited; held until the
+        # directory is done so a new writer cannot start in it meanwhile.
+        writer_lock = lock_writer_directory(directory)
+        alive = writer_lock is None
+        try:
+            replayed += replay_directory(directory, alive, limit)
+            if not alive and not list_segments(directory):
+                remove_writer_directory(directory)
+        except Exception as exc:
+            logger.exception("Replaying %s failed", directory)
+            failure = exc
+        finally:
+            if writer_lock is not None:
+                writer_lock.close()
+
+    if failure is not None and not replayed:
+        raise failure
+    return replayed
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Replay the BCube Logger ingest spool into the database.")
+    parser.add_argument("--spool-dir", default=settings.spool_dir)
+    parser.add_argument("--batch-records", type=int, default=settings.spool_replay_batch_records)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    lock = SpoolLock(args.spool_dir)
+    if not lock.acquire():
+        raise SystemExit(f"Another replayer is already draining {args.spool_dir}")
+
+    stop_event = threading.Event()
+
+    def _stop(signum, frame) -> None:
+        logger.info("Stopping spool replayer")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    logger.info("Spool replayer started on %s", args.spool_dir)
+    backoff = settings.spool_replay_poll_seconds
+    try:
+        while not stop_event.is_set():
+            try:
+                replayed = replay_once(args.spool_dir, args.batch_records)
+                backoff = settings.spool_replay_poll_seconds
+            except Exception:
+                logger.exception("Spool replay failed; retrying in %.1fs", backoff)
+                stop_event.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                continue
+
+            if not replayed:
+                stop_event.wait(settings.spool_replay_poll_seconds)
+    finally:
+        stop_dimension_flusher()
+        lock.release()
+
+
+if __name__ == "__main__":
+    main()
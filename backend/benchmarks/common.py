@@ -0,0 +1,131 @@
+"""
+Helpers shared by the benchmark modules.
+"""
+import contextlib
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Summary used for every latency series: milliseconds, nearest-rank.
+    """
+    if not samples:
+        return {}
+
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": rank(50),
+        "p90_ms": rank(90),
+        "p99_ms": rank(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def benchmark_env(database_url: str, overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = database_url
+    env.setdefault("APP_ENV", "benchmark")
+    env.setdefault("FRONTEND_URL", "http://localhost:5173")
+    env.update(overrides or {})
+    return env
+
+
+def process_memory(pid: int) -> Dict[str, Optional[int]]:
+    """
+    Resident and peak resident memory of a process in KiB (Linux only).
+    """
+    result: Dict[str, Optional[int]] = {"rss_kib": None, "peak_rss_kib": None}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    result["rss_kib"] = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    result["peak_rss_kib"] = int(line.split()[1])
+    except OSError:
+        pass
+    return result
+
+
+@contextlib.contextmanager
+def running_server(
+    database_url: str,
+    workers: int = 1,
+    startup_timeout: float = 30.0,
+    env: Optional[Dict[str, str]] = None,
+) -> Iterator[Dict[str, object]]:
+    """
+    Starts ``uvicorn app.main:app`` in a subprocess against ``database_url``
+    and yields ``{"base_url": ..., "pid": ...}`` once ``/health`` answers.
+    ``env`` overrides settings of the server, e.g. ``DASHBOARD_CACHE_SIZE``.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=benchmark_env(database_url, env),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                if requests.get(base_url + "/health", timeout=1).ok:
+                    break
+            except requests.RequestException:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Benchmark server failed to start")
+            time.sleep(0.1)
+
+        yield {"base_url": base_url, "pid": process.pid}
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
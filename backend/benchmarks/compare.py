@@ -0,0 +1,60 @@
+"""
+Compare two ``benchmarks.run`` result files.
+
+    python -m benchmarks.compare results/base.json results/head.json
+
+Lists every numeric metric with its relative change; latencies going up and
+throughput going down beyond ``--threshold`` percent are flagged.
+"""
+import argparse
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+# Metric name suffixes where a higher value is better.
+HIGHER_IS_BETTER = ("rows_per_s",)
+SKIPPED = ("params", "revision", "started_at", "python", "database")
+
+
+def flatten(data: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if not prefix and key in SKIPPED:
+                continue
+            yield from flatten(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+
+    with open(args.base) as handle:
+        base: Dict[str, float] = dict(flatten(json.load(handle)))
+    with open(args.head) as handle:
+        head: Dict[str, float] = dict(flatten(json.load(handle)))
+
+    regressions = 0
+    for name in sorted(base.keys() & head.keys()):
+        old, new = base[name], head[name]
+        change = ((new - old) / old * 100) if old else 0.0
+
+        flag = ""
+        if name.endswith(HIGHER_IS_BETTER):
+            if change < -args.threshold:
+                flag = "  REGRESSION"
+        elif name.endswith("_ms") or name.endswith("_s") or name.endswith("_kib"):
+            if change > args.threshold:
+                flag = "  REGRESSION"
+        regressions += bool(flag)
+
+        print(f"{name:60} {old:14.3f} {new:14.3f} {change:+8.1f}%{flag}")
+
+    print(f"\n{regressions} metric(s) regressed by more than {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
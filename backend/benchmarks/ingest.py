@@ -0,0 +1,72 @@
+"""
+Ingest throughput through ``LogClient``, the same path real shippers use.
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from app.utils_log_client import LogClient
+from benchmarks.common import percentiles
+from benchmarks.datagen import DataSpec, generate_records
+
+
+def run_ingest(
+    base_url: str,
+    api_key: str,
+    spec: DataSpec,
+    batches: int = 200,
+    batch_size: int = 100,
+    concurrency: int = 4,
+    encoding: str = "json",
+) -> Dict[str, Any]:
+    """
+    Sends ``batches`` batches of ``batch_size`` logs from ``concurrency``
+    threads and reports rows/s and per-request latency percentiles.
+    """
+    rng = random.Random(spec.seed)
+    payloads = [generate_records(spec, batch_size, rng) for _ in range(batches)]
+
+    clients = [
+        LogClient(
+            base_url=base_url,
+            api_key=api_key,
+            service=spec.services[i % len(spec.services)],
+            environment=spec.environments[i % len(spec.environments)],
+            timeout=60,
+            encoding=encoding,
+        )
+        for i in range(concurrency)
+    ]
+
+    # list.append is atomic, so worker threads can share these lists.
+    latencies: List[float] = []
+    failures: List[int] = []
+
+    def send(index: int) -> None:
+        client = clients[index % concurrency]
+        started = time.perf_counter()
+        try:
+            client.send_logs(payloads[index])
+        except Exception:
+            failures.append(index)
+            return
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(batches)))
+    elapsed = time.perf_counter() - started
+
+    errors = len(failures)
+    rows = (batches - errors) * batch_size
+    return {
+        "batches": batches,
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "encoding": encoding,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "rows_per_s": rows / elapsed if elapsed else 0.0,
+        "request_latency": percentiles(latencies),
+    }
@@ -0,0 +1,79 @@
+"""
+Dashboard and search latency per filter combination.
+
+Dashboard pages are cached per filter set, so the same request repeated is
+measured twice: ``cold`` against a server with the page cache disabled
+(every request runs its queries) and ``warm`` against one with the cache
+on, after a first request has filled it. ETags are not sent, so warm
+requests are cache hits, never 304s.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import requests
+
+from benchmarks.common import percentiles
+
+
+def query_matrix() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    ``(name, path, params)`` for every measured query. Covers the default
+    view, each single filter, a common combination and deep pagination.
+    """
+    now = datetime.now(timezone.utc)
+    last_hour = (now - timedelta(hours=1)).isoformat()
+    last_day = (now - timedelta(days=1)).isoformat()
+
+    dashboard = "/api/v1/logs/dashboard"
+    return [
+        ("dashboard_default", dashboard, {}),
+        ("dashboard_level", dashboard, {"level": "ERROR"}),
+        ("dashboard_service", dashboard, {"service": "billing"}),
+        ("dashboard_category", dashboard, {"category": "AUTH"}),
+        ("dashboard_last_hour", dashboard, {"from": last_hour}),
+        ("dashboard_last_day_error", dashboard, {"from": last_day, "level": "ERROR"}),
+        ("dashboard_level_service", dashboard, {"level": "WARN", "service": "gateway"}),
+        ("dashboard_search", dashboard, {"search": "declined"}),
+        ("dashboard_limit_200", dashboard, {"limit": 200}),
+        ("dashboard_deep_offset", dashboard, {"offset": 5000}),
+        ("search_message", "/api/v1/logs/search", {"q": "token"}),
+    ]
+
+
+def run_queries(base_url: str, token: str, repeats: int = 20, warm: bool = False) -> Dict[str, Any]:
+    """
+    Latency percentiles of every query in ``query_matrix``. With ``warm``,
+    each query is sent once unmeasured first so the measured requests find
+    its page cached.
+    """
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+
+    results: Dict[str, Any] = {}
+    for name, path, params in query_matrix():
+        if warm:
+            session.get(base_url + path, params=params, timeout=120)
+
+        latencies: List[float] = []
+        errors = 0
+        response_bytes = 0
+
+        for _ in range(repeats):
+            started = time.perf_counter()
+            response = session.get(base_url + path, params=params, timeout=120)
+            elapsed = time.perf_counter() - started
+            if response.ok:
+                latencies.append(elapsed)
+                response_bytes = len(response.content)
+            else:
+                errors += 1
+
+        results[name] = {
+            "params": params,
+            "errors": errors,
+            "response_bytes": response_bytes,
+            "latency": percentiles(latencies),
+        }
+
+    return results
@@ -0,0 +1,151 @@
+"""
+End-to-end benchmark: seed synthetic data, start the API, measure ingest
+throughput, query latency percentiles and server memory.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.run --rows 100000 --output results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.run --database-url postgresql+psycopg2://... --rows 20000000
+
+Without ``--database-url`` a fresh SQLite file is used. The schema is
+created with ``create_all``; point it at a dedicated database.
+Compare two runs with ``python -m benchmarks.compare old.json new.json``.
+"""
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import requests
+from sqlalchemy import create_engine
+
+from app.models import Base
+from benchmarks.common import git_revision, process_memory, running_server
+from benchmarks.datagen import DataSpec, seed_rows
+from benchmarks.ingest import run_ingest
+from benchmarks.query import run_queries
+
+BENCH_PASSWORD = "benchmark-password"
+
+
+def create_projects(base_url: str, count: int, run_id: str) -> List[Dict[str, Any]]:
+    projects = []
+    for index in range(count):
+        name = f"bench-{run_id}-{index}"
+        created = requests.post(
+            base_url + "/api/v1/projects",
+            json={
+                "name": name,
+                "username": name,
+                "email": f"{name}@example.com",
+                "password": BENCH_PASSWORD,
+            },
+            timeout=30,
+        )
+        created.raise_for_status()
+
+        login = requests.post(
+            base_url + "/api/v1/projects/login",
+            json={"email": f"{name}@example.com", "password": BENCH_PASSWORD},
+            timeout=30,
+        )
+        login.raise_for_status()
+
+        projects.append({
+            "id": created.json()["id"],
+            "api_key": created.json()["api_key"],
+            "token": login.json()["access_token"],
+        })
+    return projects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bcube Logger benchmark suite")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--projects", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=100_000, help="seeded rows per project")
+    parser.add_argument("--meta-bytes", type=int, default=128)
+    parser.add_argument("--days", type=int, default=30, help="time span of seeded rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ingest-batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--encoding", choices=("json", "msgpack", "protobuf"), default="json",
+                        help="ingest body encoding")
+    parser.add_argument("--query-repeats", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--output", default=None, help="write JSON results here")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        path = os.path.abspath("bench_run.db")
+        if os.path.exists(path):
+            os.remove(path)
+        database_url = f"sqlite:///{path}"
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+
+    spec = DataSpec(
+        projects=args.projects,
+        rows_per_project=args.rows,
+        meta_bytes=args.meta_bytes,
+        days=args.days,
+        seed=args.seed,
+    )
+
+    results: Dict[str, Any] = {
+        "revision": git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "params": vars(args),
+    }
+
+    with running_server(database_url, workers=args.workers) as server:
+        base_url = server["base_url"]
+        projects = create_projects(base_url, args.projects, run_id=str(int(time.time())))
+
+        started = time.perf_counter()
+        seeded = sum(seed_rows(engine, spec, p["id"], args.rows) for p in projects)
+        seed_elapsed = time.perf_counter() - started
+        results["seed"] = {
+            "rows": seeded,
+            "elapsed_s": seed_elapsed,
+            "rows_per_s": seeded / seed_elapsed if seed_elapsed else 0.0,
+        }
+
+        target = projects[0]
+        results["ingest"] = run_ingest(
+            base_url,
+            target["api_key"],
+            spec,
+            batches=args.ingest_batches,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            encoding=args.encoding,
+        )
+        results["queries"] = {
+            "warm": run_queries(base_url, target["token"], repeats=args.query_repeats, warm=True),
+        }
+        results["server_memory"] = process_memory(server["pid"])
+
+    # Cold numbers come from a second server without the dashboard page
+    # cache, so repeated requests cannot be answered from it.
+    with running_server(database_url, workers=args.workers, env={"DASHBOARD_CACHE_SIZE": "0"}) as server:
+        results["queries"]["cold"] = run_queries(server["base_url"], target["token"], repeats=args.query_repeats)
+
+    output = json.dumps(results, indent=2, default=str)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as handle:
+            handle.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Import-time and startup benchmark.
+
+Measures, in fresh interpreter processes:
+
+- ``import_s``: time to import ``app.main`` and build the app (no database
+  access expected)
+- ``startup_s``: time to run the lifespan startup (engine + cache warm-up)
+
+Usage (from the backend directory):
+
+    python -m benchmarks.startup --runs 5
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.startup
+
+Prints a JSON document so results can be compared between commits.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main
+application = app.main.app
+t1 = time.perf_counter()
+
+async def _startup():
+    async with app.main.app.router.lifespan_context(application):
+        pass
+
+asyncio.run(_startup())
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "startup_s": t2 - t1}))
+"""
+
+
+def _run_once(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _summary(values: list) -> dict:
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("APP_ENV", "benchmark")
+    env.setdefault("DATABASE_URL", "sqlite:///./bench_startup.db")
+    env.setdefault("FRONTEND_URL", "http://localhost:5173")
+
+    runs = [_run_once(env) for _ in range(args.runs)]
+
+    print(json.dumps({
+        "benchmark": "startup",
+        "runs": args.runs,
+        "import_s": _summary([r["import_s"] for r in runs]),
+        "startup_s": _summary([r["startup_s"] for r in runs]),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""add project sampling rules, logs.sample_rate and scaled dimension counts
+
+Revision ID: 2c7e9a4f1b85
+Revises: f18c6b2e4d93
+Create Date: 2026-10-19 22:48:15.306921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c7e9a4f1b85'
+down_revision: Union[str, Sequence[str], None] = 'f18c6b2e4d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("projects", sa.Column("sampling_rules", sa.JSON(), nullable=True))
+    op.add_column("logs", sa.Column("sample_rate", sa.Float(), nullable=True))
+    op.add_column(
+        "log_dimensions",
+        sa.Column("scaled_count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+    # Nothing was sampled so far.
+    op.execute("UPDATE log_dimensions SET scaled_count = count")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("log_dimensions", "scaled_count")
+    op.drop_column("logs", "sample_rate")
+    op.drop_column("projects", "sampling_rules")
@@ -0,0 +1,87 @@
+"""create initial schema
+
+Tables used to be created by ``Base.metadata.create_all`` at startup, so
+existing databases already have them; only missing tables are created.
+
+Revision ID: 3b9f1c2d7a4e
+Revises: 04559858101b
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f1c2d7a4e'
+down_revision: Union[str, Sequence[str], None] = '04559858101b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "projects" not in existing:
+        op.create_table(
+            "projects",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("username", sa.String(length=50), nullable=False),
+            sa.Column("name", sa.String(length=255), nullable=False, unique=True),
+            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("phone", sa.String(length=20), nullable=True),
+            sa.Column("api_key", sa.String(length=255), nullable=False, unique=True),
+            sa.Column("password_hash", sa.String(length=255), nullable=False),
+            sa.Column("isAllowed", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "admins" not in existing:
+        op.create_table(
+            "admins",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(length=255), nullable=False, unique=True),
+            sa.Column("password_hash", sa.String(length=255), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "log_categories" not in existing:
+        op.create_table(
+            "log_categories",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("is_system", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "logs" not in existing:
+        op.create_table(
+            "logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=False),
+            sa.Column(
+                "category_id",
+                sa.Integer(),
+                sa.ForeignKey("log_categories.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("level", sa.String(length=10), nullable=False),
+            sa.Column("service", sa.String(length=100), nullable=True),
+            sa.Column("environment", sa.String(length=50), nullable=True),
+            sa.Column("message", sa.String(), nullable=False),
+            sa.Column("meta", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("logs")
+    op.drop_table("log_categories")
+    op.drop_table("admins")
+    op.drop_table("projects")
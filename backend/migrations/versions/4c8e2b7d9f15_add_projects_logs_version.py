@@ -0,0 +1,31 @@
+"""add projects.logs_version for cache watermarks
+
+Revision ID: 4c8e2b7d9f15
+Revises: 9b4d1f6e2a73
+Create Date: 2026-10-20 09:12:41.206583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2b7d9f15'
+down_revision: Union[str, Sequence[str], None] = '9b4d1f6e2a73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "projects",
+        sa.Column("logs_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "logs_version")
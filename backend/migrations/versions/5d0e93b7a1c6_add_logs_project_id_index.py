@@ -0,0 +1,27 @@
+"""add (project_id, id) index on logs
+
+Revision ID: 5d0e93b7a1c6
+Revises: c71a4f9e2b58
+Create Date: 2026-10-19 15:02:11.406327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0e93b7a1c6'
+down_revision: Union[str, Sequence[str], None] = 'c71a4f9e2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_logs_project_id_id", "logs", ["project_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_logs_project_id_id", table_name="logs")
@@ -0,0 +1,59 @@
+"""add category rules and recategorize_jobs
+
+Revision ID: 5e2a8c7f3d19
+Revises: 7d3b5e1a9c46
+Create Date: 2026-10-20 00:37:52.140833
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a8c7f3d19'
+down_revision: Union[str, Sequence[str], None] = '7d3b5e1a9c46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("log_categories", sa.Column("keywords", sa.JSON(), nullable=True))
+    op.add_column("log_categories", sa.Column("levels", sa.JSON(), nullable=True))
+
+    op.create_table(
+        "recategorize_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("status", sa.String(length=10), nullable=False),
+        sa.Column("from_ts", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("to_ts", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("cursor_ts", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("cursor_id", sa.Integer(), nullable=True),
+        sa.Column("total_estimate", sa.BigInteger(), nullable=True),
+        sa.Column("scanned", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_recategorize_jobs_status_id", "recategorize_jobs", ["status", "id"])
+    op.create_index("ix_recategorize_jobs_project_id_id", "recategorize_jobs", ["project_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_recategorize_jobs_project_id_id", table_name="recategorize_jobs")
+    op.drop_index("ix_recategorize_jobs_status_id", table_name="recategorize_jobs")
+    op.drop_table("recategorize_jobs")
+    op.drop_column("log_categories", "levels")
+    op.drop_column("log_categories", "keywords")
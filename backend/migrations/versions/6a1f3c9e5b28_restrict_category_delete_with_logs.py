@@ -0,0 +1,51 @@
+"""restrict deleting log_categories that still have logs
+
+Revision ID: 6a1f3c9e5b28
+Revises: 4c8e2b7d9f15
+Create Date: 2026-10-20 10:03:57.418226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1f3c9e5b28'
+down_revision: Union[str, Sequence[str], None] = '4c8e2b7d9f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_category_fk(ondelete: str) -> None:
+    # SQLite does not enforce foreign keys here (no PRAGMA foreign_keys);
+    # rebuilding ``logs`` for it is not worth it.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys("logs"):
+        if fk["referred_table"] == "log_categories":
+            op.drop_constraint(fk["name"], "logs", type_="foreignkey")
+
+    # NOT VALID, then VALIDATE in a transaction of its own: existing rows
+    # are checked without blocking writes to ``logs`` for the whole scan.
+    op.execute(
+        f"""
+        ALTER TABLE logs ADD CONSTRAINT logs_category_id_fkey
+        FOREIGN KEY (category_id) REFERENCES log_categories (id)
+        ON DELETE {ondelete} NOT VALID
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE logs VALIDATE CONSTRAINT logs_category_id_fkey")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_category_fk("RESTRICT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_category_fk("CASCADE")
@@ -0,0 +1,41 @@
+"""add ingest_batch_ids for idempotent batch ingest
+
+Revision ID: 7d3b5e1a9c46
+Revises: 2c7e9a4f1b85
+Create Date: 2026-10-19 23:41:27.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3b5e1a9c46'
+down_revision: Union[str, Sequence[str], None] = '2c7e9a4f1b85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ingest_batch_ids",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("batch_id", sa.String(length=128), primary_key=True),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_ingest_batch_ids_created_at", "ingest_batch_ids", ["created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingest_batch_ids_created_at", table_name="ingest_batch_ids")
+    op.drop_table("ingest_batch_ids")
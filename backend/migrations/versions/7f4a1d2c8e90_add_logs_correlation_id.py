@@ -0,0 +1,47 @@
+"""add logs.correlation_id with index
+
+Revision ID: 7f4a1d2c8e90
+Revises: e3b8d41c9a27
+Create Date: 2026-10-19 17:02:44.215538
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f4a1d2c8e90'
+down_revision: Union[str, Sequence[str], None] = 'e3b8d41c9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("logs", sa.Column("correlation_id", sa.String(length=128), nullable=True))
+
+    # Backfill from the default correlation keys. Compressed meta is skipped.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            UPDATE logs
+            SET correlation_id = left(coalesce(
+                meta ->> 'trace_id',
+                meta ->> 'traceId',
+                meta ->> 'request_id',
+                meta ->> 'requestId',
+                meta ->> 'correlation_id'
+            ), 128)
+            WHERE meta IS NOT NULL
+            """
+        )
+
+    op.create_index("ix_logs_project_id_correlation_id", "logs", ["project_id", "correlation_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_logs_project_id_correlation_id", table_name="logs")
+    op.drop_column("logs", "correlation_id")
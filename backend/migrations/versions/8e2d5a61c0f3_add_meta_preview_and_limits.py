@@ -0,0 +1,51 @@
+"""add meta preview, size and compressed blob columns
+
+Revision ID: 8e2d5a61c0f3
+Revises: 3b9f1c2d7a4e
+Create Date: 2026-10-19 10:03:17.552901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2d5a61c0f3'
+down_revision: Union[str, Sequence[str], None] = '3b9f1c2d7a4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("logs", sa.Column("meta_size", sa.Integer(), nullable=True))
+    op.add_column("logs", sa.Column("meta_preview", sa.String(length=200), nullable=True))
+    op.add_column("logs", sa.Column("meta_blob", sa.LargeBinary(), nullable=True))
+
+    op.add_column("projects", sa.Column("meta_max_bytes", sa.Integer(), nullable=True))
+    op.add_column("projects", sa.Column("meta_overflow_policy", sa.String(length=10), nullable=True))
+    op.add_column("projects", sa.Column("meta_compress_min_bytes", sa.Integer(), nullable=True))
+
+    # Backfill existing rows so list endpoints can report has_meta / previews.
+    op.execute(
+        """
+        UPDATE logs
+        SET meta_size = length(CAST(meta AS TEXT)),
+            meta_preview = substr(CAST(meta AS TEXT), 1, 200)
+        WHERE meta IS NOT NULL
+          AND CAST(meta AS TEXT) NOT IN ('null', '{}')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "meta_compress_min_bytes")
+    op.drop_column("projects", "meta_overflow_policy")
+    op.drop_column("projects", "meta_max_bytes")
+
+    op.drop_column("logs", "meta_blob")
+    op.drop_column("logs", "meta_preview")
+    op.drop_column("logs", "meta_size")
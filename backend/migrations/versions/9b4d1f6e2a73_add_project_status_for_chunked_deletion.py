@@ -0,0 +1,38 @@
+"""add projects.status for chunked project deletion
+
+Revision ID: 9b4d1f6e2a73
+Revises: 5e2a8c7f3d19
+Create Date: 2026-10-20 01:26:09.581347
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d1f6e2a73'
+down_revision: Union[str, Sequence[str], None] = '5e2a8c7f3d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "projects",
+        sa.Column("status", sa.String(length=10), nullable=False, server_default="active"),
+    )
+    op.add_column("projects", sa.Column("deletion_requested_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "projects",
+        sa.Column("purged_logs", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "purged_logs")
+    op.drop_column("projects", "deletion_requested_at")
+    op.drop_column("projects", "status")
@@ -0,0 +1,73 @@
+"""add log_dimensions table for facet counts
+
+Revision ID: a94c2e7f06d3
+Revises: 5d0e93b7a1c6
+Create Date: 2026-10-19 15:40:52.930114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a94c2e7f06d3'
+down_revision: Union[str, Sequence[str], None] = '5d0e93b7a1c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DIMENSION_COLUMNS = {
+    "service": "service",
+    "environment": "environment",
+    "level": "level",
+    "category": "CAST(category_id AS TEXT)",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "log_dimensions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("dimension", sa.String(length=20), nullable=False),
+        sa.Column("value", sa.String(length=255), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.UniqueConstraint(
+            "project_id", "dimension", "value", "bucket",
+            name="uq_log_dimensions_project_dimension_value_bucket",
+        ),
+    )
+
+    # Backfill hourly counts from existing logs.
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        bucket = "date_trunc('hour', timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+    elif dialect == "sqlite":
+        bucket = "strftime('%Y-%m-%d %H:00:00.000000', timestamp)"
+    else:
+        return
+
+    for dimension, column in DIMENSION_COLUMNS.items():
+        op.execute(
+            f"""
+            INSERT INTO log_dimensions (project_id, bucket, dimension, value, count)
+            SELECT project_id, {bucket}, '{dimension}', {column}, count(*)
+            FROM logs
+            WHERE {column} IS NOT NULL
+            GROUP BY project_id, {bucket}, {column}
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("log_dimensions")
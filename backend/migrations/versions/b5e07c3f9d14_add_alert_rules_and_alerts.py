@@ -0,0 +1,75 @@
+"""add alert_rules and alerts tables
+
+Revision ID: b5e07c3f9d14
+Revises: 7f4a1d2c8e90
+Create Date: 2026-10-19 17:48:29.604173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e07c3f9d14'
+down_revision: Union[str, Sequence[str], None] = '7f4a1d2c8e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "alert_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("kind", sa.String(length=10), nullable=False, server_default="threshold"),
+        sa.Column("level", sa.String(length=10), nullable=True),
+        sa.Column("category", sa.String(length=100), nullable=True),
+        sa.Column("service", sa.String(length=100), nullable=True),
+        sa.Column("pattern", sa.String(length=255), nullable=True),
+        sa.Column("threshold", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("window_seconds", sa.Integer(), nullable=False, server_default="300"),
+        sa.Column("cooldown_seconds", sa.Integer(), nullable=False, server_default="300"),
+        sa.Column("sinks", sa.JSON(), nullable=True),
+        sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("last_triggered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_alert_rules_project_id", "alert_rules", ["project_id"])
+
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "rule_id",
+            sa.Integer(),
+            sa.ForeignKey("alert_rules.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("triggered_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_alerts_project_id_id", "alerts", ["project_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_alerts_project_id_id", table_name="alerts")
+    op.drop_table("alerts")
+    op.drop_index("ix_alert_rules_project_id", table_name="alert_rules")
+    op.drop_table("alert_rules")
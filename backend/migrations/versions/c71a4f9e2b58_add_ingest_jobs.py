@@ -0,0 +1,45 @@
+"""add ingest_jobs table for queued ingest
+
+Revision ID: c71a4f9e2b58
+Revises: 8e2d5a61c0f3
+Create Date: 2026-10-19 14:21:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71a4f9e2b58'
+down_revision: Union[str, Sequence[str], None] = '8e2d5a61c0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ingest_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("log_count", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=10), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_ingest_jobs_status_id", "ingest_jobs", ["status", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingest_jobs_status_id", table_name="ingest_jobs")
+    op.drop_table("ingest_jobs")
@@ -0,0 +1,27 @@
+"""add (project_id, timestamp) index on logs
+
+Revision ID: d26f8a3b5c71
+Revises: b5e07c3f9d14
+Create Date: 2026-10-19 20:11:37.582904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd26f8a3b5c71'
+down_revision: Union[str, Sequence[str], None] = 'b5e07c3f9d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_logs_project_id_timestamp", "logs", ["project_id", "timestamp"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_logs_project_id_timestamp", table_name="logs")
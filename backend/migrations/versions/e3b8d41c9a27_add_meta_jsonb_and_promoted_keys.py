@@ -0,0 +1,57 @@
+"""meta as JSONB with GIN index, promoted meta keys
+
+Revision ID: e3b8d41c9a27
+Revises: a94c2e7f06d3
+Create Date: 2026-10-19 16:25:03.772419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8d41c9a27'
+down_revision: Union[str, Sequence[str], None] = 'a94c2e7f06d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE logs ALTER COLUMN meta TYPE JSONB USING meta::jsonb")
+        # jsonb_path_ops: smaller and faster for @> and @? than the default opclass.
+        op.execute("CREATE INDEX ix_logs_meta_gin ON logs USING gin (meta jsonb_path_ops)")
+
+    op.add_column("projects", sa.Column("promoted_meta_keys", sa.JSON(), nullable=True))
+
+    op.create_table(
+        "log_meta_index",
+        sa.Column(
+            "log_id",
+            sa.Integer(),
+            sa.ForeignKey("logs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("key", sa.String(length=100), primary_key=True),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("value_text", sa.String(length=255), nullable=True),
+        sa.Column("value_num", sa.Float(), nullable=True),
+    )
+    op.create_index("ix_log_meta_index_text", "log_meta_index", ["project_id", "key", "value_text"])
+    op.create_index("ix_log_meta_index_num", "log_meta_index", ["project_id", "key", "value_num"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_log_meta_index_num", table_name="log_meta_index")
+    op.drop_index("ix_log_meta_index_text", table_name="log_meta_index")
+    op.drop_table("log_meta_index")
+
+    op.drop_column("projects", "promoted_meta_keys")
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX ix_logs_meta_gin")
+        op.execute("ALTER TABLE logs ALTER COLUMN meta TYPE JSON USING meta::json")
@@ -0,0 +1,133 @@
+"""store log severity as smallint and dictionary-encode service / environment
+
+Revision ID: f18c6b2e4d93
+Revises: d26f8a3b5c71
+Create Date: 2026-10-19 21:34:08.417362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f18c6b2e4d93'
+down_revision: Union[str, Sequence[str], None] = 'd26f8a3b5c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mirrors app.core.severity at the time of this revision.
+SEVERITIES = {
+    "TRACE": 0,
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARN": 30,
+    "ERROR": 40,
+    "FATAL": 50,
+}
+
+# logs column -> (lookup table, id column, name length)
+DICTIONARIES = {
+    "service": ("log_services", "service_id", 100),
+    "environment": ("log_environments", "environment_id", 50),
+}
+
+
+def _severity_case(column: str) -> str:
+    whens = " ".join(f"WHEN '{name}' THEN {value}" for name, value in SEVERITIES.items())
+    return f"CASE {column} {whens} ELSE {SEVERITIES['INFO']} END"
+
+
+def _level_case(column: str) -> str:
+    whens = " ".join(f"WHEN {value} THEN '{name}'" for name, value in SEVERITIES.items())
+    return f"CASE {column} {whens} ELSE 'INFO' END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column, (table, id_column, length) in DICTIONARIES.items():
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "project_id",
+                sa.Integer(),
+                sa.ForeignKey("projects.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("name", sa.String(length=length), nullable=False),
+            sa.UniqueConstraint("project_id", "name", name=f"uq_{table}_project_id_name"),
+        )
+
+    with op.batch_alter_table("logs") as batch:
+        batch.add_column(sa.Column("severity", sa.SmallInteger(), nullable=True))
+        batch.add_column(sa.Column("service_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("environment_id", sa.Integer(), nullable=True))
+
+    # Backfill: one dictionary row per distinct name, then ids and severities.
+    op.execute(f"UPDATE logs SET severity = {_severity_case('upper(level)')}")
+    for column, (table, id_column, _) in DICTIONARIES.items():
+        op.execute(
+            f"""
+            INSERT INTO {table} (project_id, name)
+            SELECT DISTINCT project_id, {column}
+            FROM logs
+            WHERE {column} IS NOT NULL
+            """
+        )
+        op.execute(
+            f"""
+            UPDATE logs
+            SET {id_column} = (
+                SELECT {table}.id FROM {table}
+                WHERE {table}.project_id = logs.project_id
+                AND {table}.name = logs.{column}
+            )
+            WHERE {column} IS NOT NULL
+            """
+        )
+
+    with op.batch_alter_table("logs") as batch:
+        batch.alter_column("severity", existing_type=sa.SmallInteger(), nullable=False)
+        batch.create_foreign_key(
+            "fk_logs_service_id_log_services", "log_services",
+            ["service_id"], ["id"], ondelete="CASCADE",
+        )
+        batch.create_foreign_key(
+            "fk_logs_environment_id_log_environments", "log_environments",
+            ["environment_id"], ["id"], ondelete="CASCADE",
+        )
+        batch.drop_column("level")
+        batch.drop_column("service")
+        batch.drop_column("environment")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("logs") as batch:
+        batch.add_column(sa.Column("level", sa.String(length=10), nullable=True))
+        batch.add_column(sa.Column("service", sa.String(length=100), nullable=True))
+        batch.add_column(sa.Column("environment", sa.String(length=50), nullable=True))
+
+    op.execute(f"UPDATE logs SET level = {_level_case('severity')}")
+    for column, (table, id_column, _) in DICTIONARIES.items():
+        op.execute(
+            f"""
+            UPDATE logs
+            SET {column} = (SELECT {table}.name FROM {table} WHERE {table}.id = logs.{id_column})
+            WHERE {id_column} IS NOT NULL
+            """
+        )
+
+    with op.batch_alter_table("logs") as batch:
+        batch.alter_column("level", existing_type=sa.String(length=10), nullable=False)
+        batch.drop_constraint("fk_logs_service_id_log_services", type_="foreignkey")
+        batch.drop_constraint("fk_logs_environment_id_log_environments", type_="foreignkey")
+        batch.drop_column("severity")
+        batch.drop_column("service_id")
+        batch.drop_column("environment_id")
+
+    op.drop_table("log_environments")
+    op.drop_table("log_services")
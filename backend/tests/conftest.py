@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# One throwaway SQLite database for the whole run; tests use projects of
+# their own instead of a fresh database each.
+_TMP_DIR = tempfile.mkdtemp(prefix="bcube-tests-")
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP_DIR, 'test.db')}")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:5173")
+os.environ.setdefault("AUTO_CREATE_SCHEMA", "true")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-of-at-least-32-bytes")
+os.environ.setdefault("ALERTS_ENABLED", "false")
+os.environ.setdefault("DIMENSION_FLUSH_SECONDS", "0")
+os.environ.setdefault("SPOOL_DIR", os.path.join(_TMP_DIR, "spool"))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """
+    Overrides settings for one test: ``settings_env(INGEST_MODE="spool")``.
+    """
+    from app.config import get_settings
+
+    def override(**values):
+        for name, value in values.items():
+            monkeypatch.setenv(name, str(value))
+        get_settings.cache_clear()
+
+    yield override
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def admin_token(client):
+    credentials = {"email": "admin@example.com", "password": "secret1"}
+    client.post("/api/v1/admin/create", json=credentials)
+    response = client.post("/api/v1/admin/login", json=credentials)
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+@pytest.fixture
+def update_project(client, admin_token):
+    """
+    Applies admin settings to a project: ``update_project(project_id, promoted_meta_keys=[...])``.
+    """
+    def update(project_id, **changes):
+        current = client.get(f"/api/v1/admin/projects/{project_id}", headers=auth(admin_token)).json()
+        response = client.put(
+            f"/api/v1/admin/projects/{project_id}",
+            json={"isAllowed": current["isAllowed"], **changes},
+            headers=auth(admin_token),
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return update
+
+
+@pytest.fixture
+def project(client):
+    """
+    A new project: ``(project_id, api_key, dashboard_token)``.
+    """
+    name = f"p-{uuid.uuid4().hex[:10]}"
+    response = client.post(
+        "/api/v1/projects",
+        json={"name": name, "username": name, "email": f"{name}@example.com", "password": "secret1"},
+    )
+    assert response.status_code == 201, response.text
+    body = response.json()
+
+    response = client.post(
+        "/api/v1/projects/login",
+        json={"email": f"{name}@example.com", "password": "secret1"},
+    )
+    assert response.status_code == 200, response.text
+    return body["id"], body["api_key"], response.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def ingest(client, api_key, logs, **fields):
+    """
+    Posts one batch (``logs`` as dicts, or messages logged at INFO) and
+    returns the response body.
+    """
+    logs = [log if isinstance(log, dict) else {"level": "info", "message": log} for log in logs]
+    response = client.post("/api/v1/logs", json={"logs": logs, **fields}, headers=auth(api_key))
+    assert response.status_code == 202, response.text
+    return response.json()
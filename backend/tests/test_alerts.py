@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import new_session
+from app.models.alert_rule import AlertRule
+from app.services.alerting import check_absence_rules, drain_dispatcher
+from conftest import auth, ingest
+
+
+@pytest.fixture
+def alerts_on(settings_env):
+    settings_env(ALERTS_ENABLED="true")
+
+
+def create_rule(client, token, **rule):
+    response = client.post(
+        "/api/v1/alerts/rules",
+        json={"sinks": [{"type": "store"}], **rule},
+        headers=auth(token),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def stored_alerts(client, token):
+    drain_dispatcher(timeout=5)
+    response = client.get("/api/v1/alerts", headers=auth(token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def errors(count):
+    return [{"level": "error", "message": "boom"}] * count
+
+
+def test_threshold_rule_fires_once_reached(client, project, alerts_on):
+    _, api_key, token = project
+    rule = create_rule(client, token, name="errors", level="error", threshold=3, window_seconds=60)
+
+    ingest(client, api_key, errors(2) + ["fine"])
+    assert stored_alerts(client, token) == []
+
+    ingest(client, api_key, errors(1))
+    [alert] = stored_alerts(client, token)
+    assert alert["rule_id"] == rule["id"]
+    assert alert["value"] == 3
+
+
+def test_cooldown_suppresses_repeats(client, project, alerts_on):
+    _, api_key, token = project
+    create_rule(client, token, name="quiet", level="error", threshold=1, cooldown_seconds=3600)
+    create_rule(client, token, name="noisy", level="error", threshold=1, cooldown_seconds=0)
+
+    ingest(client, api_key, errors(1))
+    drain_dispatcher(timeout=5)
+    ingest(client, api_key, errors(1))
+
+    fired = [alert["value"] for alert in stored_alerts(client, token)]
+    assert len(fired) == 3  # "quiet" once, "noisy" for both batches
+
+
+def test_rule_filters(client, project, alerts_on):
+    _, api_key, token = project
+    create_rule(client, token, name="billing timeouts", service="billing", pattern="timeout", threshold=1)
+
+    ingest(client, api_key, ["timeout talking to bank"], service="gateway")
+    ingest(client, api_key, ["charged"], service="billing")
+    assert stored_alerts(client, token) == []
+
+    ingest(client, api_key, ["Timeout talking to bank"], service="billing")
+    assert len(stored_alerts(client, token)) == 1
+
+
+def test_absence_rule_fires_without_matching_logs(client, project, alerts_on):
+    _, api_key, token = project
+    rule = create_rule(client, token, name="billing silent", kind="absence", service="billing", window_seconds=60)
+
+    db = new_session()
+    try:
+        # Old enough to have seen a full window.
+        db.query(AlertRule).filter(AlertRule.id == rule["id"]).update(
+            {"created_at": datetime.now(timezone.utc) - timedelta(hours=1)}
+        )
+        db.commit()
+
+        assert check_absence_rules(db) >= 1
+        assert [alert["rule_id"] for alert in stored_alerts(client, token)] == [rule["id"]]
+
+        ingest(client, api_key, ["invoice sent"], service="billing")
+        db.query(AlertRule).filter(AlertRule.id == rule["id"]).update({"last_triggered_at": None})
+        db.commit()
+        check_absence_rules(db)
+        assert len(stored_alerts(client, token)) == 1
+    finally:
+        db.close()
+
+
+def test_invalid_sink_is_rejected(client, project):
+    _, _, token = project
+    response = client.post(
+        "/api/v1/alerts/rules",
+        json={"name": "bad", "sinks": [{"type": "webhook"}]},
+        headers=auth(token),
+    )
+    assert response.status_code == 422
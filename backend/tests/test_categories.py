@@ -0,0 +1,44 @@
+from app.models.log_entry import LogEntry
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_category_foreign_key_never_cascades():
+    (fk,) = LogEntry.__table__.c.category_id.foreign_keys
+    assert fk.ondelete == "RESTRICT"
+
+
+def test_category_with_logs_cannot_be_deleted(client, project):
+    _, api_key, token = project
+    response = client.post(
+        "/api/v1/categories",
+        json={"name": "PAYMENTS", "keywords": ["payment"]},
+        headers=_auth(token),
+    )
+    assert response.status_code == 201, response.text
+    category_id = response.json()["id"]
+
+    response = client.post(
+        "/api/v1/logs",
+        json={"logs": [{"level": "info", "message": "payment received"}]},
+        headers=_auth(api_key),
+    )
+    assert response.status_code == 202, response.text
+
+    response = client.delete(f"/api/v1/categories/{category_id}", headers=_auth(token))
+    assert response.status_code == 409
+
+    response = client.get("/api/v1/logs/search", params={"q": "payment received"}, headers=_auth(token))
+    assert response.json()["total"] == 1
+
+
+def test_unused_category_is_deleted(client, project):
+    _, _, token = project
+    response = client.post("/api/v1/categories", json={"name": "UNUSED"}, headers=_auth(token))
+    category_id = response.json()["id"]
+
+    response = client.delete(f"/api/v1/categories/{category_id}", headers=_auth(token))
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/categories/{category_id}", headers=_auth(token)).status_code == 404
@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.config import get_settings
+from app.core.jwt_utils import create_access_token
+from app.core.project_cache import token_cache
+from app.database import get_engine
+from conftest import auth
+
+
+@contextmanager
+def project_queries():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if "FROM projects" in statement:
+            statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def login(client, project_id):
+    email = client.get(f"/api/v1/projects/{project_id}").json()["email"]
+    response = client.post("/api/v1/projects/login", json={"email": email, "password": "secret1"})
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+def categories(client, token):
+    return client.get("/api/v1/logs/categories", headers=auth(token)).status_code
+
+
+@pytest.fixture
+def embedded_claims(settings_env):
+    settings_env(JWT_EMBED_PROJECT_CLAIMS="true")
+
+
+def test_verified_tokens_are_cached(client, project):
+    _, _, token = project
+
+    with project_queries() as statements:
+        for _ in range(3):
+            assert categories(client, token) == 200
+    assert len(statements) == 1
+    assert token_cache().get(token) is not None
+
+
+def test_project_updates_drop_cached_tokens(client, project, update_project):
+    project_id, _, token = project
+    assert categories(client, token) == 200
+
+    update_project(project_id, meta_max_bytes=1000)
+    assert token_cache().get(token) is None
+
+    with project_queries() as statements:
+        assert categories(client, token) == 200
+    assert len(statements) == 1
+
+
+def test_invalid_and_expired_tokens_are_rejected(client, project):
+    project_id, _, _ = project
+    settings = get_settings()
+    expired = create_access_token(
+        {"project_id": project_id},
+        settings.jwt_secret_key,
+        settings.jwt_algorithm,
+        expires_minutes=-1,
+    )
+
+    assert categories(client, "x.y.z") == 401
+    assert categories(client, expired) == 401
+    assert token_cache().get(expired) is None
+
+
+def test_embedded_claims_skip_the_project_lookup(client, project, embedded_claims):
+    project_id, _, _ = project
+    token = login(client, project_id)
+
+    with project_queries() as statements:
+        assert categories(client, token) == 200
+    assert statements == []
+
+
+def test_embedded_claims_are_distrusted_after_a_change(client, project, embedded_claims, update_project):
+    project_id, _, _ = project
+    token = login(client, project_id)
+    update_project(project_id, promoted_meta_keys=["user_id"])
+
+    with project_queries() as statements:
+        assert categories(client, token) == 200
+    assert len(statements) == 1
+
+
+def test_embedded_claims_expire(client, project, embedded_claims, settings_env):
+    project_id, _, _ = project
+    token = login(client, project_id)
+    settings_env(JWT_EMBEDDED_CLAIMS_MAX_AGE_SECONDS=-1)
+
+    with project_queries() as statements:
+        assert categories(client, token) == 200
+    assert len(statements) == 1
@@ -0,0 +1,31 @@
+from conftest import auth, ingest
+
+
+def test_etag_revalidation(client, project, settings_env):
+    settings_env(DASHBOARD_CACHE_FRESH_SECONDS=0)
+    _, api_key, token = project
+    ingest(client, api_key, ["one"])
+
+    first = client.get("/api/v1/logs/dashboard", headers=auth(token))
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    unchanged = client.get("/api/v1/logs/dashboard", headers={**auth(token), "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+
+    ingest(client, api_key, ["two"])
+    changed = client.get("/api/v1/logs/dashboard", headers={**auth(token), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [item["message"] for item in changed.json()["items"]] == ["two", "one"]
+
+
+def test_equivalent_filters_share_a_page(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [{"level": "error", "message": "boom"}])
+
+    lower = client.get("/api/v1/logs/dashboard", params={"level": "error"}, headers=auth(token))
+    upper = client.get("/api/v1/logs/dashboard", params={"level": "ERROR"}, headers=auth(token))
+    assert lower.headers["ETag"] == upper.headers["ETag"]
+    assert [item["message"] for item in upper.json()["items"]] == ["boom"]
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import auth, ingest
+
+
+@pytest.fixture(autouse=True)
+def planner_env(settings_env):
+    # Pages come from the planner, not the recent buffer; no text search
+    # is sliced.
+    settings_env(RECENT_LOGS_SIZE=0, SEARCH_PARALLELISM=1, DASHBOARD_CACHE_FRESH_SECONDS=0)
+
+
+def dashboard(client, token, **params):
+    response = client.get("/api/v1/logs/dashboard", params=params, headers=auth(token))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return response.headers["X-Query-Plan"], [item["message"] for item in body["items"]], body
+
+
+def ingest_hours(client, api_key, count, level="info"):
+    # One log per hour, newest first: m0 is an hour old.
+    now = datetime.now(timezone.utc)
+    ingest(client, api_key, [
+        {
+            "level": level,
+            "message": f"m{i}",
+            "timestamp": (now - timedelta(hours=i + 1)).isoformat(),
+            "meta": {"n": i},
+        }
+        for i in range(count)
+    ])
+
+
+def test_small_projects_are_queried_directly(client, project):
+    _, api_key, token = project
+    ingest_hours(client, api_key, 3)
+
+    plan, messages, body = dashboard(client, token)
+    assert plan == "direct"
+    assert messages == ["m0", "m1", "m2"]
+    assert (body["total"], body["total_estimated"]) == (3, False)
+
+
+def test_time_ranges_bound_the_query(client, project, settings_env):
+    settings_env(DASHBOARD_DIRECT_MAX_ROWS=2)
+    _, api_key, token = project
+    ingest_hours(client, api_key, 5)
+
+    since = (datetime.now(timezone.utc) - timedelta(hours=2, minutes=30)).isoformat()
+    plan, messages, body = dashboard(client, token, **{"from": since})
+    assert plan == "range"
+    assert messages == ["m0", "m1"]
+    assert body["total"] == 2
+
+
+def test_large_projects_get_a_window(client, project, settings_env):
+    settings_env(DASHBOARD_DIRECT_MAX_ROWS=2)
+    _, api_key, token = project
+    ingest_hours(client, api_key, 5)
+
+    plan, messages, body = dashboard(client, token, limit=2)
+    assert plan == "window:bucket;probes=1"
+    assert messages == ["m0", "m1"]
+    assert (body["total"], body["total_estimated"]) == (5, True)
+
+    plan, messages, _ = dashboard(client, token, limit=2, offset=3)
+    assert plan.startswith("window:")
+    assert messages == ["m3", "m4"]
+
+
+def test_window_narrows_to_the_filtered_series(client, project, settings_env):
+    settings_env(DASHBOARD_DIRECT_MAX_ROWS=2)
+    _, api_key, token = project
+    ingest_hours(client, api_key, 4)
+    ingest(client, api_key, [{
+        "level": "error",
+        "message": "old error",
+        "timestamp": (datetime.now(timezone.utc) - timedelta(days=3)).isoformat(),
+    }])
+
+    plan, messages, body = dashboard(client, token, level="error", limit=1)
+    assert plan == "window:bucket;probes=1"
+    assert messages == ["old error"]
+    assert body["total"] == 1
+
+
+def test_meta_filters_are_evaluated_first(client, project, settings_env):
+    settings_env(DASHBOARD_DIRECT_MAX_ROWS=2)
+    _, api_key, token = project
+    ingest_hours(client, api_key, 5)
+
+    plan, messages, body = dashboard(client, token, **{"meta.n": "3"})
+    assert plan == "filter_first"
+    assert messages == ["m3"]
+    assert (body["total"], body["total_estimated"]) == (1, False)
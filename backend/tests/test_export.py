@@ -0,0 +1,75 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from conftest import auth, ingest
+
+
+@pytest.fixture
+def exported(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [
+        {"timestamp": "2026-01-01T10:00:00Z", "level": "info", "message": "first", "meta": {"a": 1}},
+        {"timestamp": "2026-01-01T12:00:00Z", "level": "error", "message": "third"},
+        {"timestamp": "2026-01-01T11:00:00Z", "level": "warn", "message": "second"},
+    ], service="api")
+
+    def export(**params):
+        response = client.get("/api/v1/logs/export", params=params, headers=auth(token))
+        assert response.status_code == 200, response.text
+        return response
+
+    return export
+
+
+def test_ndjson_streams_oldest_first(exported):
+    response = exported()
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="logs_' in response.headers["content-disposition"]
+
+    rows = [json.loads(line) for line in response.content.splitlines()]
+    assert [row["message"] for row in rows] == ["first", "second", "third"]
+    assert rows[0]["meta"] == {"a": 1}
+    assert rows[0]["service"] == "api"
+
+
+def test_export_applies_dashboard_filters(exported):
+    def messages(**params):
+        return [json.loads(line)["message"] for line in exported(**params).content.splitlines()]
+
+    assert messages(level="WARN") == ["second"]
+    assert messages(**{"level>": "WARN"}) == ["second", "third"]
+    assert messages(search="sec") == ["second"]
+    assert messages(**{"from": "2026-01-01T11:30:00Z"}) == ["third"]
+
+
+def test_csv_with_gzip(exported):
+    response = exported(format="csv", compression="gzip")
+    assert response.headers["content-type"] == "application/gzip"
+
+    reader = csv.DictReader(io.StringIO(gzip.decompress(response.content).decode()))
+    rows = list(reader)
+    assert [row["message"] for row in rows] == ["first", "second", "third"]
+    assert json.loads(rows[0]["meta"]) == {"a": 1}
+
+
+def test_parquet_needs_pyarrow(client, project, exported):
+    _, _, token = project
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        response = client.get("/api/v1/logs/export", params={"format": "parquet"}, headers=auth(token))
+        assert response.status_code == 400
+        return
+
+    table = pq.read_table(io.BytesIO(exported(format="parquet").content))
+    assert table.column("message").to_pylist() == ["first", "second", "third"]
+
+
+def test_unknown_format(client, project):
+    _, _, token = project
+    response = client.get("/api/v1/logs/export", params={"format": "xml"}, headers=auth(token))
+    assert response.status_code == 422
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.services import log_dimensions
+from conftest import auth, ingest
+
+
+def facets(client, token, **params):
+    response = client.get("/api/v1/logs/facets", params=params, headers=auth(token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def counts(items):
+    return {item["value"]: item["count"] for item in items}
+
+
+@pytest.fixture
+def buffered_counts(settings_env):
+    settings_env(DIMENSION_FLUSH_SECONDS=3600)
+    yield
+    log_dimensions.stop_dimension_flusher()
+
+
+def test_facets_count_dimension_values(client, project):
+    _, api_key, token = project
+    ingest(
+        client,
+        api_key,
+        [{"level": "info", "message": "a"}, {"level": "error", "message": "b"}],
+        service="auth",
+        environment="prod",
+    )
+    ingest(client, api_key, ["c"], service="billing")
+
+    result = facets(client, token)
+
+    assert counts(result["services"]) == {"auth": 2, "billing": 1}
+    assert counts(result["environments"]) == {"prod": 2}
+    assert counts(result["levels"]) == {"INFO": 2, "ERROR": 1}
+    assert result["services"][0]["value"] == "auth"
+    assert facets(client, token, **{"from": "2000-01-01T00:00:00Z", "to": "2000-01-02T00:00:00Z"})["services"] == []
+
+
+def test_counts_are_written_after_the_ingest_transaction(client, project, buffered_counts):
+    _, api_key, token = project
+    ingest(client, api_key, ["queued"], service="api")
+
+    assert facets(client, token)["services"] == []
+
+    log_dimensions.flush_dimensions()
+    assert counts(facets(client, token)["services"]) == {"api": 1}
+
+
+def test_failed_flush_keeps_the_counts(client, project, buffered_counts, monkeypatch):
+    _, api_key, token = project
+    ingest(client, api_key, ["retried"], service="api")
+
+    def database_down(*args, **kwargs):
+        raise OperationalError("INSERT INTO log_dimensions ...", {}, Exception("connection refused"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(log_dimensions, "_add_counts", database_down)
+        log_dimensions.flush_dimensions()
+    assert facets(client, token)["services"] == []
+
+    log_dimensions.flush_dimensions()
+    assert counts(facets(client, token)["services"]) == {"api": 1}
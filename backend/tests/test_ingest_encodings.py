@@ -0,0 +1,141 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.ingest_encodings import (
+    JSON,
+    MSGPACK,
+    PROTOBUF,
+    encode_ingest_body,
+    encode_protobuf,
+    encoding_for,
+    parse_ingest_body,
+)
+
+PAYLOAD = {
+    "service": "api",
+    "environment": "prod",
+    "batch_id": "encoded-1",
+    "logs": [
+        {
+            "level": "warning",
+            "message": "disk almost full",
+            "timestamp": datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            "meta": {"disk": "/var", "used": 0.93, "tags": ["a", "b"]},
+        },
+        {"level": "info", "message": "no timestamp"},
+    ],
+}
+
+
+@pytest.fixture(params=[JSON, MSGPACK, PROTOBUF])
+def encoding(request):
+    if request.param == MSGPACK:
+        pytest.importorskip("msgpack")
+    elif request.param == PROTOBUF:
+        pytest.importorskip("google.protobuf")
+    return request.param
+
+
+def _post(client, api_key, body, content_type):
+    return client.post(
+        "/api/v1/logs",
+        content=body,
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": content_type},
+    )
+
+
+@pytest.mark.parametrize("meta", [{"payload": b"\x00\xff"}, {"nested": {b"key": 1}}])
+def test_msgpack_meta_must_be_json_compatible(client, project, meta):
+    msgpack = pytest.importorskip("msgpack")
+    _, api_key, _ = project
+    body = msgpack.packb({"logs": [{"level": "info", "message": "binary meta", "meta": meta}]})
+
+    response = _post(client, api_key, body, "application/msgpack")
+
+    assert response.status_code == 422, response.text
+    assert response.json()["detail"][0]["loc"] == ["body", "logs", 0, "meta"]
+
+
+def test_msgpack_non_string_map_key(client, project):
+    msgpack = pytest.importorskip("msgpack")
+    _, api_key, _ = project
+    body = msgpack.packb({"logs": [{"level": "info", "message": "int key", "meta": {1: "a"}}]})
+
+    assert _post(client, api_key, body, "application/msgpack").status_code == 422
+
+
+@pytest.mark.parametrize("field", ["level", "message"])
+def test_protobuf_empty_required_field(client, project, field):
+    pytest.importorskip("google.protobuf")
+    _, api_key, _ = project
+    log = {"level": "info", "message": "hello", field: ""}
+    body = encode_protobuf({"logs": [{"level": "info", "message": "fine"}, log]})
+
+    response = _post(client, api_key, body, "application/x-protobuf")
+
+    assert response.status_code == 422, response.text
+    assert response.json()["detail"] == [{
+        "type": "missing",
+        "loc": ["body", "logs", 1, field],
+        "msg": "Field required",
+        "input": None,
+    }]
+
+
+def test_protobuf_valid_body(client, project):
+    pytest.importorskip("google.protobuf")
+    _, api_key, _ = project
+    body = encode_protobuf({"logs": [{"level": "info", "message": "hello", "meta": {"a": 1}}]})
+
+    response = _post(client, api_key, body, "application/x-protobuf")
+
+    assert response.status_code == 202, response.text
+    assert response.json()["count"] == 1
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack; charset=binary", MSGPACK),
+    ("Application/Vnd.Google.Protobuf", PROTOBUF),
+    ("application/json", JSON),
+    ("text/plain", JSON),
+    (None, JSON),
+])
+def test_encoding_for(content_type, expected):
+    assert encoding_for(content_type) == expected
+
+
+def test_encodings_decode_to_the_same_batch(encoding):
+    expected = parse_ingest_body(*encode_ingest_body(PAYLOAD, JSON)).as_dict()
+    body, content_type = encode_ingest_body(PAYLOAD, encoding)
+    assert parse_ingest_body(body, content_type).as_dict() == expected
+
+
+def test_encoded_bodies_are_ingested(client, project, encoding):
+    _, api_key, token = project
+    body, content_type = encode_ingest_body(PAYLOAD, encoding)
+
+    response = _post(client, api_key, body, content_type)
+    assert response.status_code == 202, response.text
+    assert response.json()["count"] == 2
+
+    items = client.get(
+        "/api/v1/logs/dashboard",
+        params={"service": "api"},
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()["items"]
+    warning = next(item for item in items if item["level"] == "WARN")
+    assert datetime.fromisoformat(warning["timestamp"]) == PAYLOAD["logs"][0]["timestamp"]
+    detail = client.get(f"/api/v1/logs/{warning['id']}", headers={"Authorization": f"Bearer {token}"}).json()
+    assert detail["meta"] == PAYLOAD["logs"][0]["meta"]
+    assert detail["environment"] == "prod"
+
+
+@pytest.mark.parametrize("content_type", ["application/msgpack", "application/x-protobuf"])
+def test_undecodable_bodies_are_a_422(client, project, content_type):
+    pytest.importorskip("msgpack" if "msgpack" in content_type else "google.protobuf")
+    _, api_key, _ = project
+
+    response = _post(client, api_key, b"\xc1\xff not a body", content_type)
+    assert response.status_code == 422, response.text
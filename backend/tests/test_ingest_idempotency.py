@@ -0,0 +1,105 @@
+from app.api import logs as logs_api
+from app.core.project_cache import get_project_by_api_key
+from app.database import new_session
+from app.models.log_entry import LogEntry
+from app.services.ingest_idempotency import batch_id_cache
+from app.services.ingest_parser import batch_from_dict
+from app.services.ingest_pipeline import ingest_batch
+from conftest import auth, ingest
+
+
+def stored_count(project_id):
+    db = new_session()
+    try:
+        return db.query(LogEntry).filter(LogEntry.project_id == project_id).count()
+    finally:
+        db.close()
+
+
+def test_retried_batches_are_written_once(client, project):
+    project_id, api_key, _ = project
+
+    first = ingest(client, api_key, ["one", "two"], batch_id="retry-1")
+    assert first["count"] == 2
+    assert "duplicate" not in first
+
+    again = ingest(client, api_key, ["one", "two"], batch_id="retry-1")
+    assert again["duplicate"] is True
+    assert again["count"] == 2
+    assert stored_count(project_id) == 2
+
+
+def test_batch_id_header(client, project):
+    project_id, api_key, _ = project
+
+    for _ in range(2):
+        response = client.post(
+            "/api/v1/logs",
+            json={"logs": [{"level": "info", "message": "header"}]},
+            headers={**auth(api_key), "X-Batch-Id": "header-1"},
+        )
+        assert response.status_code == 202, response.text
+    assert response.json()["duplicate"] is True
+    assert stored_count(project_id) == 1
+
+
+def test_batch_ids_are_per_project(client, project):
+    _, api_key, _ = project
+    ingest(client, api_key, ["mine"], batch_id="shared-id")
+
+    response = client.post(
+        "/api/v1/projects",
+        json={"name": "idem-other", "username": "idem-other", "email": "idem-other@example.com", "password": "secret1"},
+    )
+    assert response.status_code == 201, response.text
+    body = ingest(client, response.json()["api_key"], ["theirs"], batch_id="shared-id")
+    assert "duplicate" not in body
+
+
+def test_losing_a_race_answers_from_the_winner(client, project, monkeypatch):
+    project_id, api_key, _ = project
+
+    # The other attempt commits between this attempt's check and its insert.
+    db = new_session()
+    try:
+        winner = batch_from_dict({"logs": [{"level": "info", "message": "winner"}]})
+        ingest_batch(db, get_project_by_api_key(db, api_key), winner, batch_id="race-1")
+    finally:
+        db.close()
+    batch_id_cache().clear()
+
+    checks = []
+    real_seen_batch = logs_api.seen_batch
+
+    def seen_batch(db, project_id, batch_id):
+        checks.append(batch_id)
+        return None if len(checks) == 1 else real_seen_batch(db, project_id, batch_id)
+
+    monkeypatch.setattr(logs_api, "seen_batch", seen_batch)
+
+    body = ingest(client, api_key, ["loser"], batch_id="race-1")
+    assert body["duplicate"] is True
+    assert body["count"] == 1
+    assert checks == ["race-1", "race-1"]
+    assert stored_count(project_id) == 1
+
+
+def test_expired_batch_ids_can_be_reused(client, project, settings_env):
+    project_id, api_key, _ = project
+    ingest(client, api_key, ["first"], batch_id="expiring")
+
+    batch_id_cache().clear()
+    settings_env(INGEST_BATCH_ID_WINDOW_SECONDS=-1)
+    body = ingest(client, api_key, ["second"], batch_id="expiring")
+    assert "duplicate" not in body
+    assert stored_count(project_id) == 2
+
+
+def test_queued_duplicates_return_the_job(client, project, settings_env):
+    settings_env(INGEST_MODE="queue")
+    _, api_key, _ = project
+
+    first = ingest(client, api_key, ["queued"], batch_id="queued-1")
+    again = ingest(client, api_key, ["queued"], batch_id="queued-1")
+    assert again["duplicate"] is True
+    assert again["job_id"] == first["job_id"]
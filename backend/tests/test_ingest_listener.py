@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+
+from app.core.metrics import LISTENER_MESSAGES
+from app.core.project_cache import get_project_by_api_key
+from app.database import new_session
+from app.models.log_entry import LogEntry
+from app.services.ingest_parser import IngestBatch
+from app.workers import ingest_listener
+from app.workers.ingest_listener import IngestBatcher, is_transient
+
+
+def dropped(listener):
+    sample = f'bcube_listener_messages_total{{listener="{listener}",result="write_failed"}} '
+    for line in LISTENER_MESSAGES.samples():
+        if line.startswith(sample):
+            return float(line[len(sample):])
+    return 0.0
+
+
+def logs(*messages):
+    count = len(messages)
+    return IngestBatch("svc", None, [None] * count, ["info"] * count, list(messages), [None] * count)
+
+
+def snapshot(api_key):
+    db = new_session()
+    try:
+        return get_project_by_api_key(db, api_key)
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def batcher():
+    batcher = IngestBatcher(batch_size=10, flush_seconds=60, max_pending=4, writers=1, write_attempts=3)
+    # No backoff between attempts.
+    batcher._stopping.wait = lambda timeout: False
+    return batcher
+
+
+@pytest.fixture
+def failing_writes(monkeypatch):
+    """
+    Makes the listener's writes fail with the given errors, in order.
+    """
+    calls = []
+
+    def fail_with(*errors):
+        def broken_ingest(db, project, batch, rejected=None):
+            calls.append(len(batch))
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+
+        monkeypatch.setattr(ingest_listener, "ingest_batch", broken_ingest)
+        return calls
+
+    return fail_with
+
+
+def operational_error():
+    return OperationalError("INSERT", {}, Exception("database is locked"))
+
+
+def test_transient_errors():
+    assert is_transient(operational_error())
+    assert is_transient(DBAPIError("SELECT 1", {}, Exception("gone"), connection_invalidated=True))
+    assert not is_transient(DBAPIError("SELECT 1", {}, Exception("bad")))
+    assert not is_transient(IntegrityError("INSERT", {}, Exception("duplicate")))
+    assert not is_transient(ValueError("boom"))
+
+
+def test_transient_errors_are_retried(client, project, batcher, failing_writes):
+    _, api_key, _ = project
+    calls = failing_writes(operational_error(), operational_error())
+    before = dropped("framed_tcp")
+
+    batcher._merge(snapshot(api_key), logs("a", "b"), "framed_tcp")
+    [pending] = batcher._pending.values()
+    assert batcher._write(pending) is True
+    assert calls == [2, 2, 2]
+    assert dropped("framed_tcp") == before
+
+
+def test_batches_are_dropped_after_the_last_attempt(client, project, batcher, failing_writes):
+    _, api_key, _ = project
+    calls = failing_writes(*[operational_error()] * 5)
+    before = dropped("syslog_tcp")
+
+    batcher._merge(snapshot(api_key), logs("a", "b"), "syslog_tcp")
+    [pending] = batcher._pending.values()
+    assert batcher._write(pending) is False
+    assert len(calls) == 3
+    assert dropped("syslog_tcp") == before + 2
+
+
+def test_other_errors_drop_the_batch_at_once(client, project, batcher, failing_writes):
+    _, api_key, _ = project
+    calls = failing_writes(ValueError("boom"))
+    before = {name: dropped(name) for name in ("syslog_udp", "framed_tcp")}
+
+    project_snapshot = snapshot(api_key)
+    batcher._merge(project_snapshot, logs("udp"), "syslog_udp")
+    batcher._merge(project_snapshot, logs("f1", "f2"), "framed_tcp")
+    [pending] = batcher._pending.values()
+    assert batcher._write(pending) is False
+    assert calls == [3]
+    assert dropped("syslog_udp") == before["syslog_udp"] + 1
+    assert dropped("framed_tcp") == before["framed_tcp"] + 2
+
+
+def test_close_writes_pending_logs(client, project):
+    project_id, api_key, _ = project
+    project_snapshot = snapshot(api_key)
+
+    async def run():
+        batcher = IngestBatcher(batch_size=2, flush_seconds=60, max_pending=4, writers=1)
+        batcher.start()
+        await batcher.add(project_snapshot, logs("one", "two"), "framed_tcp")
+        assert batcher.try_add(project_snapshot, logs("three"), "syslog_udp")
+        await batcher.close()
+
+    asyncio.run(run())
+
+    db = new_session()
+    try:
+        messages = [m for (m,) in db.query(LogEntry.message).filter(LogEntry.project_id == project_id)]
+    finally:
+        db.close()
+    assert sorted(messages) == ["one", "three", "two"]
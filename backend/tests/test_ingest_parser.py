@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.ingest import LogIngestRequest
+from app.services.ingest_parser import IngestValidationError, batch_from_dict, parse_ingest_batch
+from conftest import auth, ingest
+
+BODIES = [
+    {"logs": [{"level": "info", "message": "ok"}]},
+    {"service": "api", "environment": "prod", "logs": [{"level": "x", "message": "m", "meta": {"a": 1}}]},
+    {"logs": [{"level": "info", "message": "m", "timestamp": "2026-01-01T10:00:00+02:00"}]},
+    {"logs": [{"level": "info", "message": "m", "timestamp": 1700000000}]},
+    {"logs": [{"level": "info", "message": "m"}], "batch_id": "b" * 128},
+    {"logs": []},
+    {"logs": [{"level": 1}]},
+    {"logs": [{"level": "info"}]},
+    {"logs": [1]},
+    {"logs": "nope"},
+    {"service": 3, "logs": [{"level": "info", "message": "m"}]},
+    {"logs": [{"level": "info", "message": "m", "meta": [1]}]},
+    {"logs": [{"level": "info", "message": "m", "timestamp": "nope"}]},
+    {"logs": [{"level": "info", "message": "m"}], "batch_id": "b" * 129},
+    {},
+]
+
+
+def pydantic_errors(body):
+    try:
+        LogIngestRequest.model_validate_json(orjson.dumps(body))
+    except ValidationError as exc:
+        return [(error["type"], error["loc"]) for error in exc.errors()]
+    return []
+
+
+def parser_errors(body):
+    try:
+        parse_ingest_batch(orjson.dumps(body))
+    except IngestValidationError as exc:
+        return [(error["type"], tuple(error["loc"][1:])) for error in exc.errors]
+    return []
+
+
+@pytest.mark.parametrize("body", BODIES)
+def test_parser_agrees_with_the_schema(body):
+    assert sorted(parser_errors(body)) == sorted(pydantic_errors(body))
+
+
+def test_timestamps_match_the_schema():
+    for value in ("2026-01-01T10:00:00+02:00", "2026-01-01T10:00:00Z", 1700000000, "2026-01-01"):
+        body = {"logs": [{"level": "info", "message": "m", "timestamp": value}]}
+        expected = LogIngestRequest.model_validate(body).logs[0].timestamp
+        assert parse_ingest_batch(orjson.dumps(body)).timestamps == [expected]
+
+
+def test_batch_round_trips_without_raw_body():
+    batch = batch_from_dict({
+        "service": "api",
+        "logs": [{"level": "info", "message": "m", "meta": {"a": 1}}],
+        "batch_id": "b-1",
+    })
+    again = parse_ingest_batch(batch.to_json())
+    assert again.as_dict() == batch.as_dict()
+
+
+def test_invalid_json_is_a_422(client, project):
+    _, api_key, _ = project
+    response = client.post(
+        "/api/v1/logs",
+        content=b"{bad",
+        headers={**auth(api_key), "Content-Type": "application/json"},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
+def test_validation_errors_use_the_pydantic_format(client, project):
+    _, api_key, _ = project
+    response = client.post(
+        "/api/v1/logs",
+        json={"logs": [{"level": 1}]},
+        headers=auth(api_key),
+    )
+    assert response.status_code == 422
+    assert [(error["type"], error["loc"]) for error in response.json()["detail"]] == [
+        ("string_type", ["body", "logs", 0, "level"]),
+        ("missing", ["body", "logs", 0, "message"]),
+    ]
+
+    response = client.post("/api/v1/logs", json=[1], headers=auth(api_key))
+    assert response.status_code == 422
+    assert [(error["type"], error["loc"]) for error in response.json()["detail"]] == [
+        ("model_attributes_type", ["body"]),
+    ]
+
+
+def test_levels_and_timestamps_are_normalized(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [
+        {"level": "warning", "message": "offset", "timestamp": "2026-01-01T10:00:00+02:00"},
+        {"level": "ERROR", "message": "epoch", "timestamp": 1700000000},
+    ])
+
+    items = client.get("/api/v1/logs/dashboard", headers=auth(token)).json()["items"]
+    by_message = {item["message"]: item for item in items}
+    assert by_message["offset"]["level"] == "WARN"
+    assert datetime.fromisoformat(by_message["offset"]["timestamp"]) == datetime(2026, 1, 1, 8, tzinfo=timezone.utc)
+    assert datetime.fromisoformat(by_message["epoch"]["timestamp"]) == datetime.fromtimestamp(1700000000, timezone.utc)
+
+
+def test_schema_is_documented(client):
+    spec = client.get("/openapi.json").json()
+    body = spec["paths"]["/api/v1/logs"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert body["properties"]["logs"]["items"]["required"] == ["level", "message"]
@@ -0,0 +1,87 @@
+import pytest
+
+from app.database import new_session
+from app.models.ingest_job import IngestJob
+from app.models.log_entry import LogEntry
+from app.services import ingest_pipeline
+from app.services.ingest_queue import JOB_FAILED, JOB_PENDING
+from app.workers import ingest_worker
+from conftest import ingest
+
+
+@pytest.fixture
+def queue_mode(settings_env):
+    settings_env(INGEST_MODE="queue", INGEST_JOB_MAX_ATTEMPTS=2)
+
+
+def stored_messages(project_id):
+    db = new_session()
+    try:
+        return [
+            message
+            for (message,) in db.query(LogEntry.message)
+            .filter(LogEntry.project_id == project_id)
+            .order_by(LogEntry.id)
+        ]
+    finally:
+        db.close()
+
+
+def job_state(job_id):
+    db = new_session()
+    try:
+        job = db.get(IngestJob, job_id)
+        return None if job is None else (job.status, job.attempts)
+    finally:
+        db.close()
+
+
+def test_worker_writes_queued_jobs(client, project, queue_mode):
+    project_id, api_key, _ = project
+
+    body = ingest(client, api_key, ["one", "two"])
+    assert body["count"] == 2
+    assert stored_messages(project_id) == []
+
+    assert ingest_worker.process_pending_jobs(10) >= 1
+
+    assert stored_messages(project_id) == ["one", "two"]
+    assert job_state(body["job_id"]) is None
+
+
+def test_failed_job_is_retried_then_marked_failed(client, project, queue_mode, monkeypatch):
+    project_id, api_key, _ = project
+    job_id = ingest(client, api_key, ["flaky"])["job_id"]
+
+    def broken_ingest(*args, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(ingest_worker, "ingest_batch", broken_ingest)
+    ingest_worker.process_pending_jobs(10)
+    assert job_state(job_id) == (JOB_PENDING, 1)
+
+    ingest_worker.process_pending_jobs(10)
+    assert job_state(job_id) == (JOB_FAILED, 2)
+
+    # Failed jobs are no longer claimed.
+    monkeypatch.undo()
+    ingest_worker.process_pending_jobs(10)
+    assert job_state(job_id) == (JOB_FAILED, 2)
+    assert stored_messages(project_id) == []
+
+
+def test_alerts_see_committed_rows_only(client, project, queue_mode, settings_env, monkeypatch):
+    project_id, api_key, _ = project
+    settings_env(ALERTS_ENABLED="true")
+    ingest(client, api_key, ["alerting"])
+
+    visible = []
+
+    def record_alerts(db, alerted_project_id, logs, categories):
+        if alerted_project_id == project_id:
+            visible.append(stored_messages(project_id))
+
+    monkeypatch.setattr(ingest_pipeline, "evaluate_alerts", record_alerts)
+    ingest_worker.process_pending_jobs(10)
+
+    assert visible == [["alerting"]]
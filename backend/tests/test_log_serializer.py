@@ -0,0 +1,53 @@
+import zlib
+
+import orjson
+import pytest
+
+from app.services.log_serializer import LIST_FIELDS, parse_fields, row_to_item, rows_to_items
+from conftest import auth, ingest
+
+
+def test_parse_fields_keeps_id_first_and_dedupes():
+    assert parse_fields("message, id,message") == ("id", "message")
+    assert parse_fields(None, LIST_FIELDS) == LIST_FIELDS
+
+
+def test_parse_fields_rejects_unknown():
+    with pytest.raises(ValueError, match="Unknown fields: password"):
+        parse_fields("id,password")
+
+
+def test_compressed_meta_is_inflated():
+    blob = zlib.compress(orjson.dumps({"big": "x" * 10}))
+    # ``meta`` selected: the compressed blob trails the row.
+    assert row_to_item(("id", "meta"), (1, None, blob)) == {"id": 1, "meta": {"big": "x" * 10}}
+    assert rows_to_items(("id", "has_meta"), [(1, 0), (2, 1)]) == [
+        {"id": 1, "has_meta": False},
+        {"id": 2, "has_meta": True},
+    ]
+
+
+def test_lists_carry_preview_and_detail_carries_meta(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [{"level": "error", "message": "boom", "meta": {"user_id": 7}}], service="auth")
+
+    body = client.get("/api/v1/logs/dashboard", headers=auth(token)).json()
+    (item,) = body["items"]
+    assert set(item) == set(LIST_FIELDS)
+    assert item["has_meta"] is True
+    assert item["meta_preview"] == '{"user_id":7}'
+    assert (item["level"], item["service"]) == ("ERROR", "auth")
+
+    detail = client.get(f"/api/v1/logs/{item['id']}", headers=auth(token)).json()
+    assert detail["meta"] == {"user_id": 7}
+
+
+def test_sparse_fieldsets(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, ["sparse"])
+
+    body = client.get("/api/v1/logs/dashboard", params={"fields": "message"}, headers=auth(token)).json()
+    assert list(body["items"][0]) == ["id", "message"]
+
+    response = client.get("/api/v1/logs/dashboard", params={"fields": "nope"}, headers=auth(token))
+    assert response.status_code == 400
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+from app.services.category_seeder import SYSTEM_CATEGORIES
+from conftest import BACKEND_DIR, ingest
+
+
+def test_import_needs_no_settings():
+    env = {"PATH": os.environ.get("PATH", "")}
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_health(client):
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_import_opens_no_database_connection():
+    code = (
+        "import app.main, app.database, sys; "
+        "sys.exit(1 if app.database.get_engine.cache_info().currsize else 0)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env={"PATH": os.environ.get("PATH", "")},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_warm_caches_loads_projects_and_categories(client, project):
+    from app.core.project_cache import api_key_cache
+    from app.main import warm_caches
+    from app.services.category_cache import category_cache
+
+    project_id, api_key, _ = project
+    # Seeds the system categories.
+    ingest(client, api_key, ["hello"])
+    api_key_cache().clear()
+    category_cache().clear()
+
+    warm_caches()
+
+    assert api_key_cache().get(api_key).id == project_id
+    assert {category.name for category in category_cache().get(project_id)} >= set(SYSTEM_CATEGORIES)
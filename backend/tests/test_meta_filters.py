@@ -0,0 +1,66 @@
+from conftest import auth, ingest
+
+
+def messages(client, token, query):
+    response = client.get(f"/api/v1/logs/dashboard?{query}", headers=auth(token))
+    assert response.status_code == 200, response.text
+    return sorted(item["message"] for item in response.json()["items"])
+
+
+def ingest_numbered(client, api_key):
+    ingest(client, api_key, [
+        {
+            "level": "info",
+            "message": f"m{i}",
+            "meta": {"user_id": i % 3, "status": 200 + 100 * i, "req": {"id": f"r{i}"}},
+        }
+        for i in range(5)
+    ])
+
+
+def test_meta_filters(client, project):
+    _, api_key, token = project
+    ingest_numbered(client, api_key)
+
+    assert messages(client, token, "meta.user_id=1") == ["m1", "m4"]
+    assert messages(client, token, "meta.user_id!=1") == ["m0", "m2", "m3"]
+    assert messages(client, token, "meta.status>=500") == ["m3", "m4"]
+    assert messages(client, token, "meta.status>500") == ["m4"]
+    assert messages(client, token, "meta.status%3C300") == ["m0"]
+    assert messages(client, token, "meta.req.id=r2") == ["m2"]
+    # Combined with each other and with the named filters.
+    assert messages(client, token, "meta.user_id=1&meta.status%3C=400") == ["m1"]
+    assert messages(client, token, "meta.user_id=1&search=m4") == ["m4"]
+
+
+def test_invalid_meta_filter(client, project):
+    _, _, token = project
+    response = client.get("/api/v1/logs/dashboard?meta.$$=1", headers=auth(token))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid meta filter: meta.$$=1"
+
+
+def test_promoted_keys_match_new_logs(client, project, update_project):
+    project_id, api_key, token = project
+    ingest_numbered(client, api_key)
+    update_project(project_id, promoted_meta_keys=["req.id", "status"])
+
+    ingest(client, api_key, [{"level": "info", "message": "p1", "meta": {"status": 503, "req": {"id": "rx"}}}])
+
+    assert messages(client, token, "meta.req.id=rx") == ["p1"]
+    # Only logs ingested after the key was promoted are indexed.
+    assert messages(client, token, "meta.status>=503") == ["p1"]
+    # Keys that are not promoted are still matched on the stored meta.
+    assert messages(client, token, "meta.user_id=1") == ["m1", "m4"]
+
+
+def test_promoted_keys_match_compressed_meta(client, project, update_project):
+    project_id, api_key, token = project
+    update_project(project_id, promoted_meta_keys=["request_id"], meta_compress_min_bytes=10)
+
+    ingest(client, api_key, [
+        {"level": "info", "message": "wanted", "meta": {"request_id": "abc", "pad": "x" * 50}},
+        {"level": "info", "message": "other", "meta": {"request_id": "def", "pad": "x" * 50}},
+    ])
+
+    assert messages(client, token, "meta.request_id=abc") == ["wanted"]
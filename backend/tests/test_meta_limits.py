@@ -0,0 +1,63 @@
+from conftest import auth, ingest
+
+BIG_META = {f"k{i}": "x" * 100 for i in range(20)}
+
+
+def dashboard(client, token, **params):
+    response = client.get("/api/v1/logs/dashboard", params=params, headers=auth(token))
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+def detail(client, token, log_id):
+    response = client.get(f"/api/v1/logs/{log_id}", headers=auth(token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_oversized_meta_is_truncated_by_default(client, project, update_project):
+    project_id, api_key, token = project
+    update_project(project_id, meta_max_bytes=500)
+
+    ingest(client, api_key, [{"level": "info", "message": "big", "meta": BIG_META}])
+
+    [item] = dashboard(client, token)
+    meta = detail(client, token, item["id"])["meta"]
+    assert meta["_truncated"] is True
+    assert meta["_original_size"] > 500
+    assert len(meta) < len(BIG_META)
+
+
+def test_reject_policy_reports_oversized_logs(client, project, update_project):
+    project_id, api_key, token = project
+    update_project(project_id, meta_max_bytes=500, meta_overflow_policy="reject")
+
+    body = ingest(
+        client,
+        api_key,
+        ["fits", {"level": "info", "message": "big", "meta": BIG_META}],
+    )
+    assert body["count"] == 1
+    assert [(item["index"], item["reason"]) for item in body["rejected"]] == [(1, "meta_too_large")]
+
+    response = client.post(
+        "/api/v1/logs",
+        json={"logs": [{"level": "info", "message": "big", "meta": BIG_META}]},
+        headers=auth(api_key),
+    )
+    assert response.status_code == 413
+    assert [item["reason"] for item in response.json()["detail"]] == ["meta_too_large"]
+
+
+def test_compressed_meta_round_trips(client, project, update_project):
+    project_id, api_key, token = project
+    update_project(project_id, meta_compress_min_bytes=20)
+    meta = {"request": "abc-123", "payload": "y" * 50}
+
+    ingest(client, api_key, [{"level": "info", "message": "compressed", "meta": meta}])
+
+    [item] = dashboard(client, token)
+    assert item["has_meta"] is True
+    assert detail(client, token, item["id"])["meta"] == meta
+    # Compressed meta is searched through its preview.
+    assert [item["message"] for item in dashboard(client, token, search="abc-123")] == ["compressed"]
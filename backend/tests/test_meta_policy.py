@@ -0,0 +1,43 @@
+import zlib
+
+import orjson
+import pytest
+
+from app.services.meta_policy import (
+    MetaPolicy,
+    MetaTooLarge,
+    decompress_meta,
+    prepare_meta,
+)
+
+
+def test_small_meta_is_stored_as_is():
+    columns = prepare_meta({"a": 1}, MetaPolicy(max_bytes=100))
+    assert columns == {"meta": {"a": 1}, "meta_size": 7, "meta_preview": '{"a":1}', "meta_blob": None}
+
+
+def test_truncated_meta_records_the_stored_size():
+    meta = {"keep": "x", "drop": "y" * 200}
+    columns = prepare_meta(meta, MetaPolicy(max_bytes=80))
+
+    stored = columns["meta"]
+    assert stored["_truncated"] is True
+    assert stored["_original_size"] == len(orjson.dumps(meta))
+    assert "drop" not in stored and stored["keep"] == "x"
+    assert columns["meta_size"] == len(orjson.dumps(stored)) <= 80
+
+
+def test_reject_policy():
+    with pytest.raises(MetaTooLarge):
+        prepare_meta({"a": "x" * 100}, MetaPolicy(max_bytes=10, overflow="reject"))
+
+
+def test_compressed_meta_keeps_size_and_preview():
+    meta = {"a": "x" * 300}
+    columns = prepare_meta(meta, MetaPolicy(max_bytes=1000, compress_min_bytes=100))
+
+    assert columns["meta"] is None
+    assert decompress_meta(columns["meta_blob"]) == meta
+    assert zlib.decompress(columns["meta_blob"]) == orjson.dumps(meta)
+    assert columns["meta_size"] == len(orjson.dumps(meta))
+    assert len(columns["meta_preview"]) == 200
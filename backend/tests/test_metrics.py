@@ -0,0 +1,56 @@
+import re
+
+from app.core.metrics import Registry, counter, histogram
+from conftest import ingest
+
+
+def metric_value(text, sample):
+    match = re.search(rf"^{re.escape(sample)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.register(histogram("test_latency_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0)))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+
+    text = registry.render()
+
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{route="/a"} 3' in text
+
+
+def test_counter_escapes_label_values():
+    registry = Registry()
+    events = registry.register(counter("test_events_total", "Test events.", ("name",)))
+    events.inc(name='a"b')
+    events.inc(2, name='a"b')
+
+    assert 'test_events_total{name="a\\"b"} 3' in registry.render()
+
+
+def test_metrics_endpoint_reports_ingest(client, project):
+    _, api_key, _ = project
+    before = client.get("/metrics").text
+
+    ingest(client, api_key, ["one", "two", "three"])
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert metric_value(text, "bcube_ingest_rows_total") - metric_value(before, "bcube_ingest_rows_total") == 3
+    assert 'bcube_ingest_stage_duration_seconds_count{stage="bulk_insert_logs"}' in text
+    assert 'bcube_http_request_duration_seconds_count{method="POST",route="/api/v1/logs",status="202"}' in text
+    assert 'bcube_db_query_duration_seconds_count{route="/api/v1/logs"}' in text
+
+
+def test_metrics_can_be_disabled(client, settings_env):
+    settings_env(METRICS_ENABLED="false")
+
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,79 @@
+from app.database import new_session
+from app.models.log_category import LogCategory
+from app.models.log_dimension import LogDimension
+from app.models.log_entry import LogEntry
+from app.models.log_meta_index import LogMetaIndex
+from app.models.project import Project
+from app.workers.project_purger import process_next_batch
+from conftest import auth, ingest
+
+
+def row_counts(project_id):
+    db = new_session()
+    try:
+        log_ids = db.query(LogEntry.id).filter(LogEntry.project_id == project_id)
+        return {
+            "logs": log_ids.count(),
+            "meta_index": db.query(LogMetaIndex).filter(LogMetaIndex.log_id.in_(log_ids)).count(),
+            "dimensions": db.query(LogDimension).filter(LogDimension.project_id == project_id).count(),
+            "categories": db.query(LogCategory).filter(LogCategory.project_id == project_id).count(),
+            "project": db.query(Project).filter(Project.id == project_id).count(),
+        }
+    finally:
+        db.close()
+
+
+def ingest_logs(client, api_key, count):
+    ingest(client, api_key, [
+        {"level": "info", "message": f"m{i}", "meta": {"trace_id": f"t{i}"}}
+        for i in range(count)
+    ])
+
+
+def purge_all():
+    while process_next_batch(1000):
+        pass
+
+
+def test_deleting_projects_are_refused_at_once(client, project, admin_token):
+    project_id, api_key, token = project
+    ingest_logs(client, api_key, 2)
+
+    response = client.delete(f"/api/v1/admin/projects/{project_id}", headers=auth(admin_token))
+    assert response.status_code == 202, response.text
+    assert response.json()["status"] == "deleting"
+    assert response.json()["remaining_logs_estimate"] == 2
+
+    response = client.post("/api/v1/logs", json={"logs": [{"level": "info", "message": "late"}]}, headers=auth(api_key))
+    assert response.status_code == 410
+    assert client.get("/api/v1/logs/dashboard", headers=auth(token)).status_code == 410
+
+
+def test_logs_are_purged_in_batches(client, project, admin_token):
+    project_id, api_key, _ = project
+    # Projects deleted by earlier tests would be purged first.
+    purge_all()
+    ingest_logs(client, api_key, 7)
+    assert row_counts(project_id)["logs"] == 7
+
+    response = client.delete(f"/api/v1/admin/projects/{project_id}", headers=auth(admin_token))
+    assert response.status_code == 202, response.text
+
+    remaining = []
+    while process_next_batch(3):
+        counts = row_counts(project_id)
+        remaining.append(counts["logs"])
+        if counts["project"]:
+            status = client.get(f"/api/v1/admin/projects/{project_id}/deletion", headers=auth(admin_token)).json()
+            assert status["purged_logs"] == 7 - counts["logs"]
+
+    assert remaining[:3] == [4, 1, 0]
+    assert row_counts(project_id) == {
+        "logs": 0,
+        "meta_index": 0,
+        "dimensions": 0,
+        "categories": 0,
+        "project": 0,
+    }
+    response = client.get(f"/api/v1/admin/projects/{project_id}/deletion", headers=auth(admin_token))
+    assert response.status_code == 404
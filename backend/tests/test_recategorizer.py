@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import new_session
+from app.models.log_entry import LogEntry
+from app.models.recategorize_job import RecategorizeJob
+from app.services.recategorizer import JOB_DONE, claim_job, process_chunk, start_job
+from app.workers.recategorizer import process_next_chunk
+from conftest import auth, ingest
+
+
+@pytest.fixture(autouse=True)
+def no_claim_delay(settings_env):
+    # Jobs are claimed once every process's category cache has expired.
+    settings_env(CATEGORY_CACHE_TTL_SECONDS=0)
+
+
+def ingest_payments(client, api_key, count):
+    # Shared timestamps put chunk boundaries inside runs of equal timestamps.
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    ingest(client, api_key, [
+        {
+            "level": "info",
+            "message": f"payment {i}" if i % 2 else f"other {i}",
+            "timestamp": (start + timedelta(seconds=i // 3)).isoformat(),
+        }
+        for i in range(count)
+    ])
+
+
+def add_category(client, token):
+    response = client.post(
+        "/api/v1/categories",
+        json={"name": "PAYMENTS", "keywords": ["payment"]},
+        headers=auth(token),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def start_recategorize(client, token):
+    response = client.post("/api/v1/categories/recategorize", json={}, headers=auth(token))
+    assert response.status_code == 202, response.text
+    return response.json()["id"]
+
+
+def job_state(client, token, job_id):
+    response = client.get(f"/api/v1/categories/recategorize/{job_id}", headers=auth(token))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def categories_by_message(project_id):
+    db = new_session()
+    try:
+        rows = db.query(LogEntry.message, LogEntry.category_id).filter(LogEntry.project_id == project_id)
+        return dict(rows)
+    finally:
+        db.close()
+
+
+def run_jobs(chunk_size):
+    chunks = 0
+    while process_next_chunk(chunk_size):
+        chunks += 1
+    return chunks
+
+
+def test_job_walks_every_log_once(client, project):
+    project_id, api_key, token = project
+    ingest_payments(client, api_key, 11)
+    category_id = add_category(client, token)
+    job_id = start_recategorize(client, token)
+
+    assert run_jobs(chunk_size=4) >= 3
+
+    job = job_state(client, token, job_id)
+    assert job["status"] == JOB_DONE
+    assert (job["scanned"], job["updated"], job["progress"]) == (11, 5, 1.0)
+    categories = categories_by_message(project_id)
+    assert sorted(m for m, c in categories.items() if c == category_id) == [f"payment {i}" for i in (1, 3, 5, 7, 9)]
+
+    facets = client.get("/api/v1/logs/facets", headers=auth(token)).json()
+    assert {"PAYMENTS": 5}.items() <= {f["value"]: f["count"] for f in facets["categories"]}.items()
+
+
+def test_job_resumes_after_the_last_committed_chunk(client, project):
+    project_id, api_key, token = project
+    ingest_payments(client, api_key, 9)
+    category_id = add_category(client, token)
+    job_id = start_recategorize(client, token)
+
+    assert process_next_chunk(4)
+    committed = job_state(client, token, job_id)
+    assert committed["scanned"] == 4
+
+    # A worker that dies mid-chunk: its updates and cursor are rolled back.
+    db = new_session()
+    try:
+        job = claim_job(db, datetime.now(timezone.utc))
+        assert job.id == job_id
+        process_chunk(db, job, 4)
+        assert job.scanned == 8
+        db.rollback()
+    finally:
+        db.close()
+    assert job_state(client, token, job_id)["cursor_ts"] == committed["cursor_ts"]
+
+    run_jobs(chunk_size=4)
+
+    job = job_state(client, token, job_id)
+    assert job["status"] == JOB_DONE
+    assert (job["scanned"], job["updated"]) == (9, 4)
+    assert sum(1 for c in categories_by_message(project_id).values() if c == category_id) == 4
+
+
+def test_cursor_skips_only_logs_already_scanned(client, project):
+    project_id, api_key, token = project
+    ingest_payments(client, api_key, 6)
+    add_category(client, token)
+    job_id = start_recategorize(client, token)
+
+    db = new_session()
+    try:
+        job = claim_job(db, datetime.now(timezone.utc))
+        assert job.id == job_id
+        start_job(db, job)
+        # The chunk ends in the middle of the three logs sharing a timestamp.
+        process_chunk(db, job, 2)
+        db.commit()
+        cursor = (job.cursor_ts, job.cursor_id)
+        rest = (
+            db.query(LogEntry.id)
+            .filter(LogEntry.project_id == project_id, LogEntry.id > cursor[1])
+            .count()
+        )
+    finally:
+        db.close()
+
+    assert rest == 4
+    run_jobs(chunk_size=2)
+    db = new_session()
+    try:
+        assert db.get(RecategorizeJob, job_id).scanned == 6
+    finally:
+        db.close()
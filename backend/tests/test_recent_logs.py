@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func
+
+from app.database import new_session
+from app.models.log_entry import LogEntry
+from app.services.dashboard_cache import bump_logs_version, dashboard_cache
+from app.services.recent_logs import recent_logs_buffers
+from app.services.recategorizer import claim_job, create_job, process_chunk, start_job
+
+
+@pytest.fixture(autouse=True)
+def no_page_cache(settings_env):
+    # Every request checks the watermark instead of reusing a fresh page.
+    settings_env(DASHBOARD_CACHE_FRESH_SECONDS=0)
+
+
+def _ingest(client, api_key, messages):
+    response = client.post(
+        "/api/v1/logs",
+        json={"logs": [{"level": "info", "message": message} for message in messages]},
+        headers={"Authorization": f"Bearer {api_key}"},
+    )
+    assert response.status_code == 202, response.text
+
+
+def _dashboard(client, token, **params):
+    response = client.get(
+        "/api/v1/logs/dashboard",
+        params=params,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200, response.text
+    return response.headers["X-Query-Plan"], response.json()
+
+
+def test_recategorization_by_another_process_rebuilds_buffer(client, project):
+    project_id, api_key, token = project
+    _ingest(client, api_key, ["card payment declined", "user signed in"])
+    _dashboard(client, token)
+
+    response = client.post(
+        "/api/v1/categories",
+        json={"name": "PAYMENTS", "keywords": ["payment"]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 201, response.text
+    category_id = response.json()["id"]
+
+    # What the recategorizer worker does, outside this API process.
+    db = new_session()
+    try:
+        create_job(db, project_id)
+        job = claim_job(db, datetime.now(timezone.utc) + timedelta(hours=1))
+        start_job(db, job)
+        process_chunk(db, job, 100)
+        db.commit()
+    finally:
+        db.close()
+
+    plan, body = _dashboard(client, token)
+    assert plan == "recent"
+    categories = {item["message"]: item["category_id"] for item in body["items"]}
+    assert categories["card payment declined"] == category_id
+
+    plan, body = _dashboard(client, token, category="PAYMENTS")
+    assert plan == "recent"
+    assert [item["message"] for item in body["items"]] == ["card payment declined"]
+
+
+def test_delete_by_another_process_rebuilds_buffer(client, project):
+    project_id, api_key, token = project
+    # The older log, so the newest id does not move.
+    _ingest(client, api_key, ["deleted elsewhere", "kept"])
+    plan, body = _dashboard(client, token)
+    assert body["total"] == 2
+
+    db = new_session()
+    try:
+        db.query(LogEntry).filter(
+            LogEntry.project_id == project_id,
+            LogEntry.message == "deleted elsewhere",
+        ).delete(synchronize_session=False)
+        bump_logs_version(db, project_id)
+        db.commit()
+    finally:
+        db.close()
+
+    plan, body = _dashboard(client, token)
+    assert plan == "recent"
+    assert [item["message"] for item in body["items"]] == ["kept"]
+
+
+def _insert_copy(db, template, log_id, message, timestamp):
+    db.add(LogEntry(
+        id=log_id,
+        project_id=template.project_id,
+        category_id=template.category_id,
+        timestamp=timestamp,
+        severity=template.severity,
+        message=message,
+    ))
+    db.commit()
+
+
+def test_late_commit_with_lower_id_shows_up_after_rebuild(client, project):
+    project_id, api_key, token = project
+    _ingest(client, api_key, ["first"])
+    now = datetime.now(timezone.utc)
+
+    db = new_session()
+    try:
+        template = db.query(LogEntry).filter(LogEntry.project_id == project_id).one()
+        newest_id = db.query(func.max(LogEntry.id)).scalar()
+        _insert_copy(db, template, newest_id + 2, "newer", now + timedelta(seconds=2))
+        _, body = _dashboard(client, token)
+        assert [item["message"] for item in body["items"]] == ["newer", "first"]
+
+        # A transaction that took its id before "newer" but commits after it.
+        _insert_copy(db, template, newest_id + 1, "late", now + timedelta(seconds=1))
+    finally:
+        db.close()
+
+    # Once the buffer (and the cached page) are old enough, the log appears.
+    recent_logs_buffers().get(project_id).built_at -= 3600
+    dashboard_cache().clear()
+    plan, body = _dashboard(client, token)
+    assert plan == "recent"
+    assert [item["message"] for item in body["items"]] == ["newer", "late", "first"]
+
+
+def test_new_logs_and_filters_are_served_from_memory(client, project):
+    _, api_key, token = project
+    _ingest(client, api_key, ["first"])
+    plan, _ = _dashboard(client, token)
+    assert plan == "recent"
+
+    response = client.post(
+        "/api/v1/logs",
+        json={"service": "api", "logs": [{"level": "error", "message": "second"}]},
+        headers={"Authorization": f"Bearer {api_key}"},
+    )
+    assert response.status_code == 202, response.text
+
+    plan, body = _dashboard(client, token)
+    assert plan == "recent"
+    assert [item["message"] for item in body["items"]] == ["second", "first"]
+    assert (body["total"], body["total_estimated"]) == (2, False)
+
+    for params in ({"level": "ERROR"}, {"service": "api"}):
+        plan, body = _dashboard(client, token, **params)
+        assert plan == "recent"
+        assert [item["message"] for item in body["items"]] == ["second"]
+
+
+def test_pages_beyond_the_buffer_use_the_planner(client, project, settings_env):
+    settings_env(RECENT_LOGS_SIZE=3)
+    _, api_key, token = project
+    _ingest(client, api_key, [f"m{i}" for i in range(5)])
+
+    plan, body = _dashboard(client, token, limit=2)
+    assert plan == "recent"
+    assert len(body["items"]) == 2
+    assert (body["total"], body["total_estimated"]) == (5, True)
+
+    plan, body = _dashboard(client, token, limit=2, offset=2)
+    assert plan == "direct"
+    assert len(body["items"]) == 2
+
+    plan, _ = _dashboard(client, token, search="m1")
+    assert plan != "recent"
@@ -0,0 +1,78 @@
+import pytest
+
+from app.services.ingest_parser import batch_from_dict
+from app.services.sampling import SamplingRule, sample_batch
+from conftest import auth, ingest
+
+KEYS = ("trace_id",)
+
+
+def batch(logs, **fields):
+    return batch_from_dict({"logs": logs, **fields})
+
+
+def kept_messages(logs, rules):
+    sampled, _, _ = sample_batch(batch(logs), rules, KEYS)
+    return sampled.messages
+
+
+@pytest.mark.parametrize("mode, tolerance", [("hash", 0.01), ("random", 0.02)])
+def test_kept_fraction_converges_to_the_rate(mode, tolerance):
+    # The same message over and over, without correlation ids.
+    logs = [{"level": "info", "message": "heartbeat"} for _ in range(20000)]
+    sampled, rates, kept = sample_batch(batch(logs), [SamplingRule(rate=0.1, mode=mode)], KEYS)
+
+    assert rates == {"INFO": 0.1}
+    assert len(kept) == len(sampled)
+    assert abs(len(sampled) / len(logs) - 0.1) < tolerance
+
+
+def test_correlated_logs_are_kept_together():
+    logs = [
+        {"level": "info", "message": f"step {i}", "meta": {"trace_id": f"t{i % 100}"}}
+        for i in range(1000)
+    ]
+    sampled, _, _ = sample_batch(batch(logs), [SamplingRule(rate=0.3)], KEYS)
+
+    traces = {}
+    for meta in sampled.metas:
+        traces[meta["trace_id"]] = traces.get(meta["trace_id"], 0) + 1
+    assert traces
+    assert set(traces.values()) == {10}
+
+
+def test_hash_sampling_is_repeatable():
+    logs = [{"level": "debug", "message": "poll"} for _ in range(200)]
+    rules = [SamplingRule(rate=0.5, max_level="DEBUG")]
+    first = sample_batch(batch(logs), rules, KEYS)[2]
+    assert first == sample_batch(batch(logs), rules, KEYS)[2]
+    assert 0 < len(first) < len(logs)
+
+
+def test_rules_match_service_and_level():
+    logs = [
+        {"level": "debug", "message": "d"},
+        {"level": "warn", "message": "w"},
+        {"level": "error", "message": "e"},
+    ]
+    drop_all = [SamplingRule(rate=0.0, max_level="ERROR")]
+    assert kept_messages(logs, drop_all) == ["e"]
+    assert kept_messages(logs, [SamplingRule(rate=0.0, max_level="DEBUG")]) == ["w", "e"]
+
+    other_service = [SamplingRule(rate=0.0, service="other", max_level="WARN")]
+    assert sample_batch(batch(logs, service="api"), other_service, KEYS)[2] is None
+
+
+def test_sampled_logs_record_their_rate(client, project, update_project):
+    project_id, api_key, token = project
+    update_project(project_id, sampling_rules=[{"rate": 0.5, "max_level": "DEBUG"}])
+
+    body = ingest(client, api_key, [{"level": "debug", "message": "poll"} for _ in range(200)] + ["kept"])
+    assert 1 < body["count"] < 201
+
+    items = client.get("/api/v1/logs/dashboard", params={"limit": 2}, headers=auth(token)).json()["items"]
+    rates = {
+        item["message"]: client.get(f"/api/v1/logs/{item['id']}", headers=auth(token)).json()["sample_rate"]
+        for item in items
+    }
+    assert rates == {"kept": None, "poll": 0.5}
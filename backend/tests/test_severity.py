@@ -0,0 +1,85 @@
+import pytest
+
+from app.core.severity import SeverityRange, parse_level_filter
+from app.database import new_session
+from app.services.log_dictionary import dictionary_cache, name_id
+from conftest import auth, ingest
+
+LEVELS = ["trace", "debug", "info", "warning", "ERROR", "critical", "notice", "bogus"]
+
+
+def levels(client, token, query):
+    response = client.get(f"/api/v1/logs/dashboard?{query}", headers=auth(token))
+    assert response.status_code == 200, response.text
+    return sorted(item["level"] for item in response.json()["items"])
+
+
+@pytest.mark.parametrize("params, expected", [
+    ([("level", "WARN")], SeverityRange(30, 30)),
+    ([("level>", "WARN")], SeverityRange(30, None)),
+    ([("level>WARN", "")], SeverityRange(31, None)),
+    ([("level<", "info")], SeverityRange(None, 20)),
+    ([("level<INFO", "")], SeverityRange(None, 19)),
+    ([("level>", "INFO"), ("level<", "WARN")], SeverityRange(20, 30)),
+    ([("level", "")], None),
+    ([("service", "api")], None),
+])
+def test_parse_level_filter(params, expected):
+    assert parse_level_filter(params) == expected
+
+
+@pytest.mark.parametrize("params", [[("level", "nope")], [("level>>", "WARN")]])
+def test_parse_level_filter_rejects_bad_filters(params):
+    with pytest.raises(ValueError):
+        parse_level_filter(params)
+
+
+def test_level_ranges(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [{"level": level, "message": level} for level in LEVELS])
+
+    assert levels(client, token, "") == ["DEBUG", "ERROR", "FATAL", "INFO", "INFO", "INFO", "TRACE", "WARN"]
+    assert levels(client, token, "level%3E=WARN") == ["ERROR", "FATAL", "WARN"]
+    assert levels(client, token, "level%3EWARN") == ["ERROR", "FATAL"]
+    assert levels(client, token, "level%3CINFO") == ["DEBUG", "TRACE"]
+    assert levels(client, token, "level=error") == ["ERROR"]
+    assert levels(client, token, "level%3E=INFO&level%3C=WARN") == ["INFO", "INFO", "INFO", "WARN"]
+
+    response = client.get("/api/v1/logs/dashboard?level=nope", headers=auth(token))
+    assert response.status_code == 400
+
+
+def test_services_and_environments_round_trip(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, ["checkout"], service="api", environment="prod")
+    ingest(client, api_key, ["slow query"], service="db")
+
+    items = client.get("/api/v1/logs/dashboard", headers=auth(token)).json()["items"]
+    assert sorted((item["message"], item["service"], item["environment"]) for item in items) == [
+        ("checkout", "api", "prod"),
+        ("slow query", "db", None),
+    ]
+
+    def messages(query):
+        response = client.get(f"/api/v1/logs/dashboard?{query}", headers=auth(token))
+        return [item["message"] for item in response.json()["items"]]
+
+    assert messages("service=db") == ["slow query"]
+    assert messages("service=unknown") == []
+    assert client.get("/api/v1/logs/search?q=prod", headers=auth(token)).json()["total"] == 1
+
+
+def test_dictionary_ids_are_cached_after_commit(project):
+    project_id, _, _ = project
+    db = new_session()
+    try:
+        name_id(db, "service", project_id, "rolled-back")
+        db.rollback()
+        assert dictionary_cache().get(("service", project_id, "rolled-back")) is None
+
+        kept = name_id(db, "service", project_id, "kept")
+        assert dictionary_cache().get(("service", project_id, "kept")) is None
+        db.commit()
+        assert dictionary_cache().get(("service", project_id, "kept")) == kept
+    finally:
+        db.close()
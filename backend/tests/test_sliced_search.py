@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.dashboard_planner import time_slices
+from conftest import auth, ingest
+
+HOUR = timedelta(hours=1)
+NOW = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def sliced_env(settings_env):
+    settings_env(
+        DASHBOARD_DIRECT_MAX_ROWS=2,
+        SEARCH_PARALLELISM=2,
+        SEARCH_SLICES=4,
+        RECENT_LOGS_SIZE=0,
+        DASHBOARD_CACHE_FRESH_SECONDS=0,
+    )
+
+
+def ingest_hours(client, api_key, count):
+    # One log per hour, newest first: "event 0" is an hour old.
+    now = datetime.now(timezone.utc)
+    ingest(client, api_key, [
+        {
+            "level": "info",
+            "message": f"event {i} {'even' if i % 2 == 0 else 'odd'}",
+            "timestamp": (now - timedelta(hours=i + 1)).isoformat(),
+        }
+        for i in range(count)
+    ])
+
+
+def get(client, token, path, **params):
+    response = client.get(path, params=params, headers=auth(token))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return response.headers["X-Query-Plan"], [item["message"] for item in body["items"]], body
+
+
+def test_time_slices_cover_every_hour():
+    counts = [(NOW - HOUR * i, count) for i, count in enumerate([5, 1, 1, 3, 2, 4])]
+    slices = time_slices(counts, 3)
+
+    assert len(slices) == 3
+    assert slices[0][1] is None and slices[-1][0] is None
+    assert sum(logs for _, _, logs in slices) == 16
+    # Adjacent slices share their bound.
+    for newer, older in zip(slices, slices[1:]):
+        assert newer[0] == older[1]
+
+
+def test_time_slices_of_a_single_hour():
+    assert time_slices([(NOW, 7)], 4) == [(None, None, 7)]
+
+
+def test_dashboard_search_stops_at_a_full_page(client, project):
+    _, api_key, token = project
+    ingest_hours(client, api_key, 8)
+
+    plan, messages, body = get(client, token, "/api/v1/logs/dashboard", search="event", limit=2)
+    assert plan.startswith("sliced:4;")
+    assert int(plan.split("scanned=")[1]) < 4
+    assert messages == ["event 0 even", "event 1 odd"]
+    assert body["total_estimated"] is True
+    assert body["total"] >= 2
+
+
+def test_dashboard_search_reads_every_slice_for_rare_matches(client, project):
+    _, api_key, token = project
+    ingest_hours(client, api_key, 8)
+
+    plan, messages, body = get(client, token, "/api/v1/logs/dashboard", search="odd", limit=10)
+    assert plan == "sliced:4;scanned=4"
+    assert messages == [f"event {i} odd" for i in (1, 3, 5, 7)]
+    assert (body["total"], body["total_estimated"]) == (4, False)
+
+    _, messages, _ = get(client, token, "/api/v1/logs/dashboard", search="odd", limit=2, offset=2)
+    assert messages == ["event 5 odd", "event 7 odd"]
+
+
+def test_search_endpoint_is_sliced(client, project):
+    _, api_key, token = project
+    ingest_hours(client, api_key, 8)
+
+    plan, messages, body = get(client, token, "/api/v1/logs/search", q="odd", limit=10)
+    assert plan == "sliced:4;scanned=4"
+    assert messages == [f"event {i} odd" for i in (1, 3, 5, 7)]
+    assert body["total"] == 4
+
+
+def test_small_ranges_are_not_sliced(client, project, settings_env):
+    settings_env(DASHBOARD_DIRECT_MAX_ROWS=100)
+    _, api_key, token = project
+    ingest_hours(client, api_key, 8)
+
+    plan, messages, _ = get(client, token, "/api/v1/logs/dashboard", search="odd", limit=10)
+    assert plan == "direct"
+    assert len(messages) == 4
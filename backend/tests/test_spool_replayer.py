@@ -0,0 +1,130 @@
+import json
+import os
+
+import pytest
+from sqlalchemy.exc import DataError, OperationalError
+
+from app.core.spool import DEAD_LETTER_DIR, SpoolWriter, list_segments, writer_directories, writer_directory
+from app.services.ingest_parser import parse_ingest_batch
+from app.services.ingest_spool import close_spool_writer, encode_record
+from app.workers import spool_replayer
+
+
+@pytest.fixture
+def spool_dir(tmp_path, settings_env):
+    path = str(tmp_path / "spool")
+    settings_env(INGEST_MODE="spool", SPOOL_DIR=path)
+    close_spool_writer()
+    yield path
+    close_spool_writer()
+
+
+@pytest.fixture
+def postgres_column_limits(monkeypatch):
+    """
+    SQLite does not enforce ``String(100)``; fail like PostgreSQL does.
+    """
+    ingest_batch = spool_replayer.ingest_batch
+
+    def strict_ingest_batch(db, project, batch, **kwargs):
+        if batch.service is not None and len(batch.service) > 100:
+            raise DataError("INSERT INTO log_services ...", {}, Exception("value too long"))
+        return ingest_batch(db, project, batch, **kwargs)
+
+    monkeypatch.setattr(spool_replayer, "ingest_batch", strict_ingest_batch)
+
+
+def _spool(client, api_key, service, message):
+    response = client.post(
+        "/api/v1/logs",
+        json={"service": service, "logs": [{"level": "info", "message": message}]},
+        headers={"Authorization": f"Bearer {api_key}"},
+    )
+    assert response.status_code == 202, response.text
+
+
+def _search_total(client, token, term):
+    response = client.get(
+        "/api/v1/logs/search",
+        params={"q": term},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["total"]
+
+
+def test_failing_record_is_dead_lettered(client, project, spool_dir, postgres_column_limits):
+    _, api_key, token = project
+    _spool(client, api_key, "s" * 150, "before-the-gap")
+    _spool(client, api_key, "api", "after-the-gap")
+
+    assert spool_replayer.replay_once(spool_dir, 100) == 2
+    assert spool_replayer.replay_once(spool_dir, 100) == 0
+
+    assert _search_total(client, token, "after-the-gap") == 1
+    assert _search_total(client, token, "before-the-gap") == 0
+
+    dead_letter_dir = os.path.join(spool_dir, DEAD_LETTER_DIR)
+    (name,) = os.listdir(dead_letter_dir)
+    with open(os.path.join(dead_letter_dir, name)) as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 1
+    assert entries[0]["error"].startswith("DataError")
+    assert "before-the-gap" in entries[0]["record"]
+
+
+def test_transient_error_keeps_the_record(client, project, spool_dir, monkeypatch):
+    _, api_key, token = project
+    _spool(client, api_key, "api", "retried-later")
+
+    def database_down(*args, **kwargs):
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(spool_replayer, "ingest_batch", database_down)
+        with pytest.raises(OperationalError):
+            spool_replayer.replay_once(spool_dir, 100)
+
+    assert spool_replayer.replay_once(spool_dir, 100) == 1
+    assert _search_total(client, token, "retried-later") == 1
+    assert not os.path.exists(os.path.join(spool_dir, DEAD_LETTER_DIR))
+
+
+def test_live_writer_segment_survives_replay(client, project, spool_dir):
+    _, api_key, token = project
+    _spool(client, api_key, "api", "first-record")
+    (directory,) = writer_directories(spool_dir)
+    segments = list_segments(directory)
+
+    assert spool_replayer.replay_once(spool_dir, 100) == 1
+
+    # The writer still holds its lock: its segment is kept for more appends.
+    assert list_segments(directory) == segments
+    _spool(client, api_key, "api", "second-record")
+    assert list_segments(directory) == segments
+    assert spool_replayer.replay_once(spool_dir, 100) == 1
+    assert _search_total(client, token, "second-record") == 1
+
+
+def test_exited_writer_directory_is_drained_and_removed(client, project, spool_dir):
+    _, api_key, token = project
+    _spool(client, api_key, "api", "last-words")
+    (directory,) = writer_directories(spool_dir)
+    close_spool_writer()
+
+    assert spool_replayer.replay_once(spool_dir, 100) == 1
+    assert not os.path.exists(directory)
+    assert _search_total(client, token, "last-words") == 1
+
+
+def test_directory_of_reused_pid_is_replayed(client, project, spool_dir):
+    project_id, _, token = project
+    # Named after a pid that is alive (init), but no writer holds its lock.
+    writer = SpoolWriter(writer_directory(spool_dir, pid=1))
+    batch = parse_ingest_batch(b'{"logs": [{"level": "info", "message": "orphaned"}]}')
+    writer.append(encode_record(project_id, batch))
+    writer.close()
+
+    assert spool_replayer.replay_once(spool_dir, 100) == 1
+    assert list(writer_directories(spool_dir)) == []
+    assert _search_total(client, token, "orphaned") == 1
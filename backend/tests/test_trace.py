@@ -0,0 +1,57 @@
+from conftest import auth, ingest
+
+
+def trace(client, token, correlation_id, **params):
+    return client.get(f"/api/v1/logs/trace/{correlation_id}", params=params, headers=auth(token))
+
+
+def test_trace_timeline_across_services(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [
+        {"level": "info", "message": "in", "timestamp": "2026-01-01T00:00:00Z", "meta": {"trace_id": "t-1"}},
+        {"level": "info", "message": "unrelated", "meta": {"trace_id": "t-2"}},
+    ], service="gateway")
+    ingest(client, api_key, [
+        {"level": "error", "message": "fail", "timestamp": "2026-01-01T00:00:00.250Z", "meta": {"traceId": "t-1"}},
+    ], service="billing")
+
+    response = trace(client, token, "t-1")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert body["truncated"] is False
+    assert body["services"] == ["gateway", "billing"]
+    assert body["duration_ms"] == 250
+    assert [item["message"] for item in body["items"]] == ["in", "fail"]
+    assert {item["correlation_id"] for item in body["items"]} == {"t-1"}
+
+
+def test_trace_ids_from_nested_and_numeric_meta(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [
+        {"level": "info", "message": "numeric", "meta": {"request_id": 7}},
+        {"level": "info", "message": "keys in configured order", "meta": {"request_id": "r", "trace_id": "t"}},
+    ])
+
+    assert [item["message"] for item in trace(client, token, "7").json()["items"]] == ["numeric"]
+    assert trace(client, token, "t").json()["count"] == 1
+    assert trace(client, token, "r").status_code == 404
+
+
+def test_trace_limit_and_fields(client, project):
+    _, api_key, token = project
+    ingest(client, api_key, [
+        {"level": "info", "message": f"step {i}", "meta": {"trace_id": "long"}} for i in range(3)
+    ])
+
+    body = trace(client, token, "long", limit=2, fields="message").json()
+
+    assert body["truncated"] is True
+    assert [item["message"] for item in body["items"]] == ["step 0", "step 1"]
+    assert set(body["items"][0]) == {"id", "message"}
+
+
+def test_unknown_trace_is_404(client, project):
+    _, _, token = project
+    assert trace(client, token, "missing").status_code == 404
@@ -11,16 +11,19 @@ const LogDetailModal = ({ log, categories, onClose }) => {
 
   const getLevelBadgeClass = (level) => {
     switch (level?.toUpperCase()) {
+      case 'FATAL':
       case 'ERROR': return 'badge-error';
       case 'WARN': return 'badge-warning';
       case 'INFO': return 'badge-info';
-      case 'DEBUG': return 'badge-neutral';
+      case 'DEBUG':
+      case 'TRACE': return 'badge-neutral';
       default: return 'badge-ghost';
     }
   };
 
   const getLevelIcon = (level) => {
     switch (level?.toUpperCase()) {
+      case 'FATAL':
       case 'ERROR': return <AlertCircle className="w-5 h-5" />;
       case 'WARN': return <AlertCircle className="w-5 h-5 text-warning" />;
       case 'INFO': return <Info className="w-5 h-5" />;
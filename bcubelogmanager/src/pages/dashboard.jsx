@@ -49,6 +49,7 @@ const LogDashboard = () => {
   const [page, setPage] = useState(1);
   const [total, setTotal] = useState(0);
   const [categories, setCategories] = useState([]);
+  const [facets, setFacets] = useState({ services: [], environments: [] });
   const [selectedLog, setSelectedLog] = useState(null);
   const [showDetailModal, setShowDetailModal] = useState(false);
   const [showDeleteModal, setShowDeleteModal] = useState(false);
@@ -114,7 +115,7 @@ const LogDashboard = () => {
 
         setStats({
           total: response.total || 0,
-          error: levelCounts.ERROR || 0,
+          error: (levelCounts.ERROR || 0) + (levelCounts.FATAL || 0),
           warning: levelCounts.WARN || 0,
           info: levelCounts.INFO || 0,
           debug: levelCounts.DEBUG || 0,
@@ -140,6 +141,17 @@ const LogDashboard = () => {
     }
   }, []);
 
+  const fetchFacets = useCallback(async () => {
+    try {
+      const response = await apiFetch("/api/v1/logs/facets");
+      if (response && response.services) {
+        setFacets(response);
+      }
+    } catch (err) {
+      console.error("Failed to fetch facets:", err);
+    }
+  }, []);
+
   const handleSearch = useCallback(async () => {
     if (!filters.search) return;
 
@@ -181,6 +193,23 @@ const LogDashboard = () => {
     }
   };
 
+  const handleViewLog = async (log) => {
+    setSelectedLog(log);
+    setShowDetailModal(true);
+
+    // List rows only carry a meta preview; the full meta is loaded on demand.
+    if (!log.has_meta) return;
+
+    try {
+      const response = await apiFetch(`/api/v1/logs/${log.id}`);
+      if (response && response.id === log.id) {
+        setSelectedLog(response);
+      }
+    } catch (err) {
+      toast.error(err.message || "Failed to load log details");
+    }
+  };
+
   const handleBulkDelete = async (timezoneOffset) => {
     try {
       const response = await apiFetch("/api/v1/logs/bulk/by-timezone", {
@@ -207,6 +236,7 @@ const LogDashboard = () => {
   const clearFilters = () => {
     setFilters({
       level: "",
+      service: "",
       search: "",
       from: "",
       to: "",
@@ -239,10 +269,15 @@ const LogDashboard = () => {
     fetchCategories();
   }, [fetchLogs, fetchCategories]);
 
+  useEffect(() => {
+    fetchFacets();
+  }, [fetchFacets]);
+
   const totalPages = Math.ceil(total / LIMIT);
 
   const getLevelBadgeClass = (level) => {
     switch (level?.toUpperCase()) {
+      case "FATAL":
       case "ERROR":
         return "badge-error";
       case "WARN":
@@ -250,6 +285,7 @@ const LogDashboard = () => {
       case "INFO":
         return "badge-info";
       case "DEBUG":
+      case "TRACE":
         return "badge-neutral";
       default:
         return "badge-ghost";
@@ -258,6 +294,7 @@ const LogDashboard = () => {
 
   const getLevelIcon = (level) => {
     switch (level?.toUpperCase()) {
+      case "FATAL":
       case "ERROR":
         return <AlertCircle className="w-4 h-4" />;
       case "WARN":
@@ -444,10 +481,34 @@ const LogDashboard = () => {
                       }
                     >
                       <option value="">All Levels</option>
+                      <option value="FATAL">Fatal</option>
                       <option value="ERROR">Error</option>
                       <option value="WARN">Warning</option>
                       <option value="INFO">Info</option>
                       <option value="DEBUG">Debug</option>
+                      <option value="TRACE">Trace</option>
+                    </select>
+                  </div>
+                  <div className="form-control">
+                    <label className="label">
+                      <span className="label-text">Service</span>
+                    </label>
+                    <select
+                      className="select select-bordered select-sm"
+                      value={filters.service || ""}
+                      onChange={(e) =>
+                        setFilters((prev) => ({
+                          ...prev,
+                          service: e.target.value,
+                        }))
+                      }
+                    >
+                      <option value="">All Services</option>
+                      {facets.services.map((facet) => (
+                        <option key={facet.value} value={facet.value}>
+                          {facet.value} ({facet.count})
+                        </option>
+                      ))}
                     </select>
                   </div>
                   <div className="form-control">
@@ -606,10 +667,7 @@ const LogDashboard = () => {
                             <td>
                               <div className="flex gap-1">
                                 <button
-                                  onClick={() => {
-                                    setSelectedLog(log);
-                                    setShowDetailModal(true);
-                                  }}
+                                  onClick={() => handleViewLog(log)}
                                   className="btn btn-ghost btn-xs"
                                   title="View Details"
                                 >